@@ -0,0 +1,56 @@
+"""
+Micro-benchmark de clean_html().
+
+Mide textos por segundo de los tres caminos: descripciones con HTML (pasan
+por BeautifulSoup), texto plano (se salta el parser) y descripciones
+repetidas (salen de la cache).
+
+Uso:
+    python benchmarks/clean_html_bench.py --texts 300 --repeat 3
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from scraper.utils.text import clean_html, extract_text, normalize_text
+
+DESCRIPTION = "<p>Alimento <b>balanceado</b> para perros adultos.</p>" * 40
+
+
+def uncached(texto: str) -> str | None:
+    return normalize_text(extract_text(texto))
+
+
+def bench(fn: Callable[[str], object], inputs: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for texto in inputs:
+            fn(texto)
+    return len(inputs) * repeat / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    html_inputs = [f"{DESCRIPTION}<span>{i}</span>" for i in range(args.texts)]
+    plain_inputs = [
+        f"Alimento balanceado para perros {i}. " * 40 for i in range(args.texts)
+    ]
+
+    cold = bench(uncached, html_inputs, args.repeat)
+    plain = bench(uncached, plain_inputs, args.repeat)
+    clean_html(DESCRIPTION)
+    memo = bench(clean_html, [DESCRIPTION] * args.texts, args.repeat)
+
+    print(f"{args.texts} textos x {args.repeat} repeticiones")
+    print(f"Con HTML:     {cold:12,.0f} textos/s")
+    print(f"Texto plano:  {plain:12,.0f} textos/s")
+    print(f"Desde cache:  {memo:12,.0f} textos/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark de la conversión del listado a SCRAPED_PRODUCT_SCHEMA.
+
+Compara el camino por producto (RawProduct -> ScrapedProduct -> model_dump
+-> tabla de Arrow), el mismo camino validando la página completa con
+get_products_data() y build_listing_table(), que valida la página igual
+pero arma las columnas directamente desde los RawProduct, sin crear un
+ScrapedProduct por fila. Reporta filas por segundo de cada uno.
+
+Uso:
+    python benchmarks/columnar_bench.py --rows 50000 --repeat 5
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+import pyarrow as pa
+
+from scraper.scrapers.sagafalabella.columnar import build_listing_table
+from scraper.scrapers.sagafalabella.parser import (
+    get_product_data,
+    get_products_data,
+)
+from scraper.scrapers.sagafalabella.schemas import SCRAPED_PRODUCT_SCHEMA
+
+DATE_COLUMNS = ["fecha_extraccion_inicio", "fecha_extraccion_final"]
+
+
+def synthetic_products(rows: int) -> list[dict[str, Any]]:
+    """Productos con la forma del JSON del listado."""
+    return [
+        {
+            "displayName": f"Alimento para perro adulto {i % 20 + 1} kg",
+            "skuId": str(100000 + i),
+            "productId": str(900000 + i),
+            "brand": f"Marca {i % 50}",
+            "sellerName": "Falabella" if i % 3 else None,
+            "url": f"https://www.falabella.com.pe/falabella-pe/product/{i}",
+            "prices": [
+                {"type": "normalPrice", "crossed": True, "price": ["120.00"]},
+                {"type": "internetPrice", "crossed": False, "price": ["99.90"]},
+                {"type": "cmrPrice", "crossed": False, "price": ["89.90"]},
+            ],
+        }
+        for i in range(rows)
+    ]
+
+
+def per_object(products: list[dict[str, Any]]) -> pa.Table:
+    return pa.Table.from_pylist(
+        [
+            get_product_data("perro", p, "Alimentos").model_dump()
+            for p in products
+        ],
+        schema=SCRAPED_PRODUCT_SCHEMA,
+    )
+
+
+def per_page(products: list[dict[str, Any]]) -> pa.Table:
+    return pa.Table.from_pylist(
+        [
+            p.model_dump()
+            for p in get_products_data("perro", products, "Alimentos")
+        ],
+        schema=SCRAPED_PRODUCT_SCHEMA,
+    )
+
+
+def columnar(products: list[dict[str, Any]]) -> pa.Table:
+    return build_listing_table("perro", products, "Alimentos")
+
+
+def bench(
+    fn: Callable[[list[dict[str, Any]]], pa.Table],
+    products: list[dict[str, Any]],
+    repeat: int,
+) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(products)
+    return len(products) * repeat / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    products = synthetic_products(args.rows)
+    assert (
+        per_object(products)
+        .drop_columns(DATE_COLUMNS)
+        .equals(columnar(products).drop_columns(DATE_COLUMNS))
+    )
+
+    slow = bench(per_object, products, args.repeat)
+    page = bench(per_page, products, args.repeat)
+    fast = bench(columnar, products, args.repeat)
+
+    print(f"{args.rows} filas x {args.repeat} repeticiones")
+    print(f"Por producto (pydantic): {slow:12,.0f} filas/s")
+    print(f"Por página (TypeAdapter):{page:12,.0f} filas/s")
+    print(f"Columnar:                {fast:12,.0f} filas/s")
+    print(f"Aceleración: x{fast / slow:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark del cliente HTTP: requests.get "desnudo" vs HttpClient con pool.
+
+Levanta un servidor local (HTTP/1.1 con keep-alive) que simula la API de
+listado y mide requests/segundo de ambos caminos, en serie y con threads.
+
+Uso:
+    python benchmarks/http_client_bench.py --requests 2000 --workers 8
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import requests
+
+from core.schemas import HttpClientConfig
+from scraper.utils.http import HttpClient
+
+# Payload del tamaño aproximado de una página de listado (48 productos)
+PAYLOAD = json.dumps(
+    {
+        "data": {
+            "results": [
+                {"skuId": str(i), "productId": str(i), "displayName": "x" * 80}
+                for i in range(48)
+            ]
+        }
+    }
+).encode("utf-8")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Evita la espera de Nagle + delayed ACK entre headers y body
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def run(fetch: Callable[[str], object], url: str, n: int, workers: int) -> float:
+    start = time.perf_counter()
+    if workers == 1:
+        for _ in range(n):
+            fetch(url)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(fetch, [url] * n))
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/listing"
+
+    # Sin rate limiter: se mide solo el efecto del pool de conexiones
+    client = HttpClient(
+        HttpClientConfig(pool_size=args.workers, rate_limit=False)
+    )
+
+    def bare(u: str) -> object:
+        return requests.get(u, timeout=10).json()
+
+    def pooled(u: str) -> object:
+        return client.get(u).json()
+
+    for workers in (1, args.workers):
+        before = run(bare, url, args.requests, workers)
+        after = run(pooled, url, args.requests, workers)
+        print(
+            f"workers={workers:<3} requests.get: {before:8.0f} req/s | "
+            f"HttpClient: {after:8.0f} req/s | x{after / before:.2f}"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
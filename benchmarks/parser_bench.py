@@ -0,0 +1,88 @@
+"""
+Micro-benchmark de la extracción de detalle de producto.
+
+Compara el parseo completo con BeautifulSoup contra la búsqueda dirigida de
+__NEXT_DATA__ y breadcrumbs. Usa las páginas .html guardadas en --pages; si
+no se indica, genera una página sintética del tamaño de una página real.
+
+Uso:
+    python benchmarks/parser_bench.py --pages tmp/product_pages --repeat 20
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+from scraper.scrapers.sagafalabella.parser import (
+    parse_product_detail,
+    parse_product_detail_soup,
+)
+
+
+def synthetic_page() -> str:
+    """Página de ~600 KB con la estructura de una ficha de producto."""
+    product_data = {
+        "props": {
+            "pageProps": {
+                "productData": {
+                    "longDescription": "&lt;p&gt;Alimento balanceado&lt;/p&gt;"
+                    * 50,
+                    "variants": [{"id": i, "x": "y" * 200} for i in range(300)],
+                }
+            }
+        }
+    }
+    filler = "".join(
+        f'<div class="card-{i}"><span>Item {i}</span><a href="/p/{i}">ver</a>'
+        f"<img src='/img/{i}.jpg' alt='producto {i}'/></div>"
+        for i in range(4000)
+    )
+    return (
+        "<html><head><title>Producto</title></head><body>"
+        '<nav><ol class="Breadcrumbs-module_breadcrumb__b47ha">'
+        '<li><a href="/">Home</a></li><li><a href="/m">Mascotas</a></li>'
+        '<li><a href="/h">Higiene</a></li><li><a href="/c">Cepillos</a></li>'
+        f"</ol></nav>{filler}"
+        f'<script id="__NEXT_DATA__" type="application/json">'
+        f"{json.dumps(product_data)}</script></body></html>"
+    )
+
+
+def bench(fn: Callable[[str], object], pages: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            fn(page)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [p.read_text("utf-8") for p in sorted(args.pages.glob("*.html"))]
+    else:
+        pages = [synthetic_page()]
+
+    for page in pages:
+        assert parse_product_detail("bench", page) == parse_product_detail_soup(
+            page
+        )
+
+    full = bench(parse_product_detail_soup, pages, args.repeat)
+    fast = bench(lambda p: parse_product_detail("bench", p), pages, args.repeat)
+
+    size_kb = sum(len(p) for p in pages) / len(pages) / 1024
+    print(f"{len(pages)} páginas, {size_kb:.0f} KB promedio")
+    print(f"BeautifulSoup completo: {full * 1000:8.2f} ms/página")
+    print(f"Búsqueda dirigida:      {fast * 1000:8.2f} ms/página")
+    print(f"Aceleración: x{full / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ from pathlib import Path
 
 from core.settings import settings
 
+# Los procesos worker lo desactivan: cada uno abriría su propio archivo
+_file_logging = True
+
 
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
@@ -31,6 +34,9 @@ def get_logger(name: str) -> logging.Logger:
     if "pytest" in sys.modules or os.getenv("PYTEST_CURRENT_TEST"):
         return logger
 
+    if not _file_logging:
+        return logger
+
     try:
         script_name = Path(sys.argv[0]).stem or "interactive"
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -45,3 +51,22 @@ def get_logger(name: str) -> logging.Logger:
         pass
 
     return logger
+
+
+def disable_file_logging() -> None:
+    """
+    Initializer para pools de procesos: en el worker los loggers solo
+    escriben a consola. Los workers reimportan los módulos y sin esto cada
+    uno abriría un archivo de log nuevo en LOG_DIR.
+    """
+    global _file_logging
+    _file_logging = False
+
+    # Loggers ya creados en el proceso (ej. heredados del forkserver)
+    for logger in logging.Logger.manager.loggerDict.values():
+        if not isinstance(logger, logging.Logger):
+            continue
+        for handler in list(logger.handlers):
+            if isinstance(handler, logging.FileHandler):
+                logger.removeHandler(handler)
+                handler.close()
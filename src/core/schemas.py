@@ -19,3 +19,30 @@ class HDFSConfig:
     host: str
     port: int
     user: str
+
+
+@dataclass
+class HttpClientConfig:
+    """Esquema de configuracion para el cliente HTTP compartido"""
+
+    timeout: float = 10
+    pool_size: int = 16
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    backoff_max: float = 30
+    retry_after_max: float = 300  # tope de la espera pedida por Retry-After
+    per_host_limit: int = 100  # requests en vuelo por host (cliente async)
+    rate_limit: bool = False  # usar el rate limiter adaptativo por host
+
+
+@dataclass
+class RateLimiterConfig:
+    """Esquema de configuracion para el rate limiter adaptativo (AIMD)"""
+
+    initial_rate: float = 10  # req/s
+    min_rate: float = 0.5
+    max_rate: float = 100
+    increase_step: float = 1  # req/s ganados por segundo sin congestión
+    decrease_factor: float = 0.5
+    latency_factor: float = 2  # p95 / mejor p95 que se considera congestión
+    latency_window: int = 50  # latencias usadas para calcular el p95
@@ -21,6 +21,54 @@ class Settings(BaseSettings):
     DB_NAME: str = "test_biomont"
     DB_USER: str = "postgres"
     DB_PASSWORD: str = "root"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_LOAD_WORKERS: int = 4
+    # Retención de particiones en días (opt-in; 0 las conserva todas)
+    DB_PARTITION_RETENTION_DAYS: int = 0
+
+    # Data Lake (datasets particionados)
+    DATASET_MAX_ROWS_PER_FILE: int = 1_000_000
+    DATASET_MAX_ROWS_PER_GROUP: int = 100_000
+
+    # HTTP
+    HTTP_TIMEOUT: float = 10
+    HTTP_POOL_SIZE: int = 16
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_BACKOFF_FACTOR: float = 0.5
+    HTTP_BACKOFF_MAX: float = 30
+    # Tope de la espera pedida por Retry-After (no se acota con BACKOFF_MAX)
+    HTTP_RETRY_AFTER_MAX: float = 300
+    HTTP_PER_HOST_LIMIT: int = 100
+
+    # Cache HTTP persistente (detalle de productos)
+    HTTP_CACHE_PATH: Path = TMP_DIR / "http_cache.sqlite"
+    HTTP_CACHE_TTL: float = 12 * 60 * 60  # segundos sin revalidar
+    HTTP_CACHE_MAX_MB: int = 1024
+
+    # Detalle de productos desde la API JSON antes del HTML (opt-in:
+    # DETAIL_API_ENABLED=true; las claves del JSON aún no se validaron
+    # contra respuestas reales grabadas)
+    DETAIL_API_ENABLED: bool = False
+
+    # Rate limiter adaptativo por host (opt-in: RATE_LIMIT_ENABLED=true)
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_INITIAL: float = 10
+    RATE_LIMIT_MIN: float = 0.5
+    RATE_LIMIT_MAX: float = 100
+    RATE_LIMIT_INCREASE_STEP: float = 1
+    RATE_LIMIT_DECREASE_FACTOR: float = 0.5
+    RATE_LIMIT_LATENCY_FACTOR: float = 2
+    RATE_LIMIT_LATENCY_WINDOW: int = 50
+
+    # Scraper
+    SCRAPER_MAX_WORKERS: int = 8
+    ENRICH_MAX_WORKERS: int = 8
+    ENRICH_PARSE_WORKERS: int = 4
+    ENRICH_PARSE_QUEUE_SIZE: int = 64
+    CHECKPOINT_FLUSH_EVERY: int = 50
 
     @property
     def DATABASE_URL(self) -> str:
@@ -1,7 +1,12 @@
-from .jobs.get_extra_details_product import update_product_data
-from .jobs.scraper import scrape
+from .jobs.get_extra_details_product import (
+    update_product_data,
+    update_product_data_async,
+)
+from .jobs.scraper import scrape, scrape_async
 
 __all__ = [
     "scrape",
+    "scrape_async",
     "update_product_data",
+    "update_product_data_async",
 ]
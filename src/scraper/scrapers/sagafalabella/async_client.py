@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from scraper.utils.async_http import AsyncHttpClient
+from scraper.utils.http_cache import HttpCache, get_http_cache
+
+from .client import get_total_pages
+from .constants import BASE_URL, PRODUCT_URL
+from .schemas import ApiProductResponse, ListingPage
+
+# Errores que tratamos como "sin datos", igual que el cliente síncrono
+FETCH_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ValueError)
+
+
+async def fetch_listing_page(
+    client: AsyncHttpClient, page: int, category_id: str, category_name: str
+) -> Optional[ListingPage]:
+    """
+    Versión asíncrona de client.fetch_listing_page.
+    Retorna None si hay un error de red.
+    """
+    url: str = BASE_URL.format(
+        page=page,
+        category_id=category_id,
+        category_name=category_name,
+    )
+    try:
+        response = await client.get(url)
+        if response.status_code != 200:
+            return None
+
+        data: Dict[str, Any] = response.json().get("data", {})
+        results: List[Dict[str, Any]] = data.get("results", [])
+        return {"results": results, "total_pages": get_total_pages(data)}
+    except FETCH_ERRORS:
+        return None
+
+
+async def fetch_api_product_data(
+    client: AsyncHttpClient, product_id: str
+) -> Optional[ApiProductResponse]:
+    """
+    Versión asíncrona de client.fetch_api_product_data.
+    """
+    url: str = PRODUCT_URL.format(product_id)
+    try:
+        response = await client.get(url)
+        if response.status_code != 200:
+            return None
+
+        data: Dict[str, Any] = response.json().get("data") or {}
+        return {"data": data, "size": len(response.text.encode("utf-8"))}
+    except FETCH_ERRORS + (AttributeError,):
+        return None
+
+
+async def fetch_api_product_extra_details(
+    client: AsyncHttpClient, product_id: str
+) -> Optional[str]:
+    """
+    Versión asíncrona de client.fetch_api_product_extra_details.
+    """
+    product = await fetch_api_product_data(client, product_id)
+    if product is None:
+        return None
+
+    description: Optional[str] = product["data"].get("description")
+    return description
+
+
+async def fetch_html_product_extra_details(
+    client: AsyncHttpClient,
+    product_url: str,
+    cache: Optional[HttpCache] = None,
+) -> Optional[str]:
+    """
+    Versión asíncrona de client.fetch_html_product_extra_details.
+    """
+    cache = cache or get_http_cache()
+    try:
+        entry = cache.lookup(product_url) if cache else None
+        if cache and entry and cache.is_fresh(entry):
+            return cache.use_fresh(entry)
+
+        response = await client.get(
+            product_url, headers=HttpCache.conditional_headers(entry)
+        )
+        if cache:
+            return cache.handle_response(
+                product_url,
+                entry,
+                response.status_code,
+                response.text,
+                response.headers,
+            )
+
+        if response.status_code != 200:
+            return None
+        return response.text
+    except FETCH_ERRORS:
+        return None
@@ -1,16 +1,44 @@
+import math
 from typing import Any, Dict, List, Optional
 
 import requests
 
+from scraper.utils.http import HttpClient, get_http_client
+from scraper.utils.http_cache import HttpCache, get_http_cache
+
 from .constants import BASE_URL, PRODUCT_URL
+from .schemas import ApiProductResponse, ListingPage
 
 
-def fetch_products_page(
-    page: int, category_id: str, category_name: str
-) -> Optional[List[Dict[str, Any]]]:
+def get_total_pages(data: Dict[str, Any]) -> Optional[int]:
     """
-    Obtiene la lista de productos de una página y categoría específica.
-    Retorna None si hay un error de red o List[dict] si es exitoso.
+    Calcula el total de páginas a partir del bloque `pagination` del listado.
+    Retorna None si la metadata no existe o no es válida.
+    """
+    pagination: Dict[str, Any] = data.get("pagination") or {}
+
+    try:
+        count = int(pagination["count"])
+        per_page = int(pagination["perPage"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if count < 0 or per_page <= 0:
+        return None
+
+    return math.ceil(count / per_page)
+
+
+def fetch_listing_page(
+    page: int,
+    category_id: str,
+    category_name: str,
+    client: Optional[HttpClient] = None,
+) -> Optional[ListingPage]:
+    """
+    Obtiene una página del listado junto con el total de páginas informado
+    por la API. Retorna None si hay un error de red.
+    Si no se indica `client` se usa el cliente HTTP compartido del proceso.
     """
     url: str = BASE_URL.format(
         page=page,
@@ -18,43 +46,94 @@ def fetch_products_page(
         category_name=category_name,
     )
     try:
-        response = requests.get(url, timeout=10)
+        response = (client or get_http_client()).get(url)
         if response.status_code != 200:
             return None
 
         # Usamos .get() encadenado con seguridad
         data: Dict[str, Any] = response.json().get("data", {})
         results: List[Dict[str, Any]] = data.get("results", [])
-        return results
+        return {"results": results, "total_pages": get_total_pages(data)}
     except (requests.RequestException, ValueError):
         return None
 
 
-def fetch_api_product_extra_details(product_id: str) -> Optional[str]:
+def fetch_products_page(
+    page: int,
+    category_id: str,
+    category_name: str,
+    client: Optional[HttpClient] = None,
+) -> Optional[List[Dict[str, Any]]]:
     """
-    Intenta obtener la descripción vía API.
+    Obtiene la lista de productos de una página y categoría específica.
+    Retorna None si hay un error de red o List[dict] si es exitoso.
+    """
+    listing = fetch_listing_page(page, category_id, category_name, client)
+    return listing["results"] if listing is not None else None
+
+
+def fetch_api_product_data(
+    product_id: str, client: Optional[HttpClient] = None
+) -> Optional[ApiProductResponse]:
+    """
+    Obtiene el bloque `data` de la API JSON de producto y el tamaño de la
+    respuesta. Retorna None si hay un error de red o la respuesta no es válida.
     """
     url: str = PRODUCT_URL.format(product_id)
     try:
-        response = requests.get(url, timeout=10)
+        response = (client or get_http_client()).get(url)
         if response.status_code != 200:
             return None
 
-        # Casting explícito a str ya que esperamos la descripción
-        description: Optional[str] = (
-            response.json().get("data", {}).get("description")
-        )
-        return description
-    except (requests.RequestException, ValueError):
+        data: Dict[str, Any] = response.json().get("data") or {}
+        return {"data": data, "size": len(response.content)}
+    except (requests.RequestException, ValueError, AttributeError):
+        return None
+
+
+def fetch_api_product_extra_details(
+    product_id: str, client: Optional[HttpClient] = None
+) -> Optional[str]:
+    """
+    Intenta obtener la descripción vía API.
+    """
+    product = fetch_api_product_data(product_id, client)
+    if product is None:
         return None
 
+    # Casting explícito a str ya que esperamos la descripción
+    description: Optional[str] = product["data"].get("description")
+    return description
 
-def fetch_html_product_extra_details(product_url: str) -> Optional[str]:
+
+def fetch_html_product_extra_details(
+    product_url: str,
+    client: Optional[HttpClient] = None,
+    cache: Optional[HttpCache] = None,
+) -> Optional[str]:
     """
     Se hace un request a la url de un producto para obtener su HTML completo.
+    Si hay una cache HTTP (la indicada o la del proceso), se sirve desde ella
+    mientras esté vigente y se revalida con un GET condicional al vencer.
     """
+    cache = cache or get_http_cache()
     try:
-        response = requests.get(product_url, timeout=10)
+        entry = cache.lookup(product_url) if cache else None
+        if cache and entry and cache.is_fresh(entry):
+            return cache.use_fresh(entry)
+
+        response = (client or get_http_client()).get(
+            product_url, headers=HttpCache.conditional_headers(entry)
+        )
+        if cache:
+            return cache.handle_response(
+                product_url,
+                entry,
+                response.status_code,
+                response.text,
+                response.headers,
+            )
+
         if response.status_code != 200:
             return None
         return response.text
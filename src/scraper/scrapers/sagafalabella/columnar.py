@@ -0,0 +1,109 @@
+from typing import Any, Iterable, Optional
+
+import pandas as pd
+import pendulum
+import pyarrow as pa
+
+from scraper.scrapers.sagafalabella.parser import (
+    RAW_PRODUCTS_ADAPTER,
+    get_prices,
+)
+from scraper.scrapers.sagafalabella.schemas import (
+    SCRAPED_PRODUCT_SCHEMA,
+    RawProduct,
+)
+from scraper.utils.text import get_weight_columns
+
+
+def get_price_columns(
+    products: list[RawProduct],
+) -> tuple[list[float | None], list[float | None], list[float | None]]:
+    """Resuelve las tres columnas de precio con get_prices()."""
+    normal: list[float | None] = []
+    public: list[float | None] = []
+    cmr: list[float | None] = []
+
+    for product in products:
+        normal_price, discounted_price, precio_cmr = get_prices(product)
+        normal.append(normal_price)
+        public.append(discounted_price)
+        cmr.append(precio_cmr)
+
+    return normal, public, cmr
+
+
+def get_weight_columns_for(
+    names: list[str], category_name: str
+) -> tuple[list[str | None], list[float | None]]:
+    """
+    Peso normalizado y en gramos de cada nombre, extraídos en una pasada.
+    El peso solo se extrae para la categoría Alimentos.
+    """
+    if category_name != "Alimentos" or not names:
+        return [None] * len(names), [None] * len(names)
+
+    weights = get_weight_columns(pd.Series(names, dtype=object))
+    grams = weights["peso_gramos"]
+    return (
+        weights["peso_considerado"].tolist(),
+        grams.astype(object).where(grams.notna(), None).tolist(),
+    )
+
+
+def build_listing_table(
+    animal: str,
+    products: list[dict[str, Any]],
+    category_name: str,
+    extraction_date: Optional[str] = None,
+) -> pa.Table:
+    """
+    Convierte una página (o varias) de productos crudos del listado en una
+    tabla con SCRAPED_PRODUCT_SCHEMA, columna por columna y sin crear un
+    ScrapedProduct por producto.
+
+    La página se valida con el mismo RAW_PRODUCTS_ADAPTER que
+    get_products_data(), así que los valores (y los errores de validación)
+    son los mismos que produce get_product_data(), salvo las fechas de
+    extracción: se usa una sola marca de tiempo para todas las filas
+    (`extraction_date`, por defecto la hora actual de Lima).
+    """
+    n = len(products)
+    extraction_date = (
+        extraction_date or pendulum.now("America/Lima").to_iso8601_string()
+    )
+
+    raw_products = RAW_PRODUCTS_ADAPTER.validate_python(products)
+    names = [p.displayName for p in raw_products]
+    normal, public, cmr = get_price_columns(raw_products)
+    peso, peso_gramos = get_weight_columns_for(names, category_name)
+    nulls: list[None] = [None] * n
+
+    columns: dict[str, Iterable[Any]] = {
+        "categoria_animal": [animal] * n,
+        "categoria_producto": nulls,
+        "sub_categoria_producto": nulls,
+        "marca": [p.brand for p in raw_products],
+        "nombre": names,
+        "vendido_por": [p.sellerName for p in raw_products],
+        "titulo_promocion": nulls,
+        "descripcion_promocion": nulls,
+        "descripcion_producto": nulls,
+        "peso_considerado": peso,
+        "peso_gramos": peso_gramos,
+        "precio_sin_descuento": normal,
+        "precio_publico": public,
+        "precio_cmr": cmr,
+        "fecha_extraccion_inicio": [extraction_date] * n,
+        "fecha_extraccion_final": [extraction_date] * n,
+        "product_id": [p.productId for p in raw_products],
+        "sku": [p.skuId for p in raw_products],
+        "url": [p.url for p in raw_products],
+    }
+
+    return pa.table(
+        [
+            pa.array(columns[field.name], type=field.type)
+            for field in SCRAPED_PRODUCT_SCHEMA
+        ],
+        schema=SCRAPED_PRODUCT_SCHEMA,
+    )
@@ -116,3 +116,12 @@ BASE_URL = (
 
 # API publica de productos de saga utilizado solo para obtener la descripcion
 PRODUCT_URL = "https://www.falabella.com.pe/s/browse/v3/product/pe?productId={}"
+
+# Tabla de Postgres con los snapshots enriquecidos
+SQL_TABLE_NAME = "webscrapping_sagafalabella2"
+
+# Tabla histórica (una fila por versión de cada SKU) del modo CDC
+SQL_HISTORY_TABLE_NAME = "webscrapping_sagafalabella2_historial"
+
+# Columnas de partición (carpetas Hive) del dataset histórico en el Data Lake
+DATASET_PARTITION_COLUMNS = ["fecha_extraccion", "categoria_animal"]
@@ -0,0 +1,21 @@
+import pandas as pd
+
+# Zona horaria en la que se define el día de extracción
+EXTRACTION_TIMEZONE = "America/Lima"
+
+# fecha_extraccion en SQL, para migrar tablas cargadas antes de tenerla
+EXTRACTION_DATE_SQL = (
+    "CAST(CAST(fecha_extraccion_inicio AS timestamptz) "
+    f"AT TIME ZONE '{EXTRACTION_TIMEZONE}' AS date)"
+)
+
+
+def add_extraction_date(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega fecha_extraccion (DATE en hora de Lima) derivada de
+    fecha_extraccion_inicio; junto con sku identifica la fila del día.
+    """
+    inicio = pd.to_datetime(data["fecha_extraccion_inicio"], utc=True)
+    return data.assign(
+        fecha_extraccion=inicio.dt.tz_convert(EXTRACTION_TIMEZONE).dt.date
+    )
@@ -1,12 +1,61 @@
+import argparse
+import asyncio
+import multiprocessing
 import sys
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from queue import Full, Queue
+from typing import Any, Callable, Iterable, Optional
 
 import pandas as pd
 
-from core.logging import get_logger
-from scraper.scrapers.sagafalabella.parser import get_product_detail
+from core.logging import disable_file_logging, get_logger
+from core.settings import settings
+from scraper.scrapers.sagafalabella.constants import (
+    DATASET_PARTITION_COLUMNS,
+    SQL_TABLE_NAME,
+)
+from scraper.scrapers.sagafalabella.dates import add_extraction_date
+from scraper.scrapers.sagafalabella.parser import (
+    FetchedDetail,
+    ProductDetail,
+    complete_product_detail,
+    detail_stats,
+    fetch_product_detail,
+    get_product_detail,
+    get_product_detail_async,
+    parse_product_detail,
+)
+from scraper.utils.async_http import AsyncHttpClient
+from scraper.utils.checkpoint import JsonlCheckpoint
+from scraper.utils.fingerprint import fingerprint_rows
+from scraper.utils.http_cache import HttpCache, set_http_cache
+from scraper.utils.rate_limit import get_rate_limiter
 
 logger = get_logger(__name__)
 
+DETAIL_COLUMNS = [
+    "categoria_producto",
+    "sub_categoria_producto",
+    "descripcion_producto",
+]
+
+# Campos del listado que identifican una versión del producto
+FINGERPRINT_COLUMNS = [
+    "nombre",
+    "marca",
+    "vendido_por",
+    "precio_sin_descuento",
+    "precio_publico",
+    "precio_cmr",
+]
+
 
 def merge_animal_name(series: pd.Series) -> str:
     orden: list[str] = ["perro", "gato"]
@@ -16,48 +65,487 @@ def merge_animal_name(series: pd.Series) -> str:
     return "-".join(result)
 
 
-def get_category_and_description(row: pd.Series) -> pd.Series:
+def get_category_and_description(
+    sku: str, url: str, product_id: str | None
+) -> ProductDetail:
     try:
-        sku: str = row["sku"]
-        url: str = row["url"]
+        logger.info(f"Extrayendo detalle del producto con sku: {sku}")
+        return get_product_detail(sku, url, product_id)
+    except Exception as e:
+        logger.error(f"Error extrayendo detalle del producto (SKU {sku}): {e}")
+        return None, None, None
 
-        cat: str | None
-        desc: str | None
 
+def fetch_category_and_description(
+    sku: str, url: str, product_id: str | None
+) -> FetchedDetail:
+    """Etapa de descarga del pipeline con pool de procesos."""
+    try:
         logger.info(f"Extrayendo detalle del producto con sku: {sku}")
-        cat, sub_cat, desc = get_product_detail(sku, url)
+        return fetch_product_detail(sku, url, product_id)
+    except Exception as e:
+        logger.error(f"Error extrayendo detalle del producto (SKU {sku}): {e}")
+        return FetchedDetail((None, None, None))
+
 
-        return pd.Series([cat, sub_cat, desc])
+def complete_category_and_description(
+    sku: str, fetched: FetchedDetail, parsed: Future[ProductDetail] | None
+) -> ProductDetail:
+    """Combina lo descargado con el HTML parseado en el pool de procesos."""
+    try:
+        html_detail = parsed.result() if parsed else None
+        return complete_product_detail(sku, fetched, html_detail)
     except Exception as e:
-        logger.error(
-            f"Error extrayendo detalle del producto (SKU {row.get('sku')}): {e}"
+        logger.error(f"Error extrayendo detalle del producto (SKU {sku}): {e}")
+        return None, None, None
+
+
+def enrich_with_parse_pool(
+    inputs: list[tuple[str, str, str | None]],
+    fetch_workers: int,
+    parse_workers: int,
+    queue_size: int,
+    on_detail: Callable[[int, ProductDetail], None],
+) -> dict[int, ProductDetail]:
+    """
+    Pipeline de dos etapas: `fetch_workers` threads descargan (API y HTML) y
+    `parse_workers` procesos parsean el HTML, fuera del GIL.
+
+    Entre ambas etapas hay una cola acotada a `queue_size` descargas y a lo
+    sumo `queue_size` HTML en parseo; si el parseo se atrasa, los threads de
+    descarga se bloquean en vez de acumular páginas en memoria.
+    """
+    fetched_queue: Queue[tuple[int, FetchedDetail]] = Queue(maxsize=queue_size)
+    stop = threading.Event()
+    results: dict[int, ProductDetail] = {}
+
+    def fetch(i: int) -> None:
+        sku, url, product_id = inputs[i]
+        item = (i, fetch_category_and_description(sku, url, product_id))
+        while not stop.is_set():
+            try:
+                fetched_queue.put(item, timeout=0.5)
+                return
+            except Full:
+                continue
+
+    parsing: dict[Future[ProductDetail], tuple[int, FetchedDetail]] = {}
+
+    def finish(
+        i: int, fetched: FetchedDetail, parsed: Future[ProductDetail] | None
+    ) -> None:
+        detail = complete_category_and_description(
+            inputs[i][0], fetched, parsed
         )
-        return pd.Series([None, None, None])
+        results[i] = detail
+        on_detail(i, detail)
 
+    def collect(futures: Iterable[Future[ProductDetail]]) -> None:
+        for future in futures:
+            i, fetched = parsing.pop(future)
+            finish(i, fetched, future)
 
-# Main function
-def update_product_data(data: pd.DataFrame) -> pd.DataFrame:
-    # Combinar categoria_animal (perro-gato) por SKU presente en ambas categorias
-    # de animal
+    fetch_executor = ThreadPoolExecutor(max_workers=fetch_workers)
+    # Con threads vivos fork() puede heredar locks tomados; forkserver parte
+    # de un proceso limpio. Los workers loguean solo a consola
+    parse_executor = ProcessPoolExecutor(
+        max_workers=parse_workers,
+        mp_context=multiprocessing.get_context("forkserver"),
+        initializer=disable_file_logging,
+    )
+    try:
+        for i in range(len(inputs)):
+            fetch_executor.submit(fetch, i)
+
+        for _ in range(len(inputs)):
+            i, fetched = fetched_queue.get()
+            if fetched.html is None:
+                # La API bastó o no hubo HTML: no hay nada que parsear
+                finish(i, fetched, None)
+                continue
+
+            if len(parsing) >= queue_size:
+                done, _ = wait(parsing, return_when=FIRST_COMPLETED)
+                collect(done)
+
+            future = parse_executor.submit(
+                parse_product_detail, inputs[i][0], fetched.html
+            )
+            parsing[future] = (i, fetched)
+
+        collect(wait(parsing).done)
+    finally:
+        stop.set()
+        fetch_executor.shutdown(wait=True, cancel_futures=True)
+        parse_executor.shutdown(wait=True, cancel_futures=True)
+
+    return results
+
+
+async def get_category_and_description_async(
+    client: AsyncHttpClient, sku: str, url: str, product_id: str | None
+) -> ProductDetail:
+    logger.info(f"Extrayendo detalle del producto con sku: {sku}")
+    return await get_product_detail_async(client, sku, url, product_id)
+
+
+def merge_animal_categories(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Combina categoria_animal (perro-gato) de los SKU presentes en ambas
+    categorías de animal y deja una fila por SKU.
+    """
     new_merged_name = data.groupby("sku")["categoria_animal"].apply(  # type: ignore[reportUnknownMemberType]
         merge_animal_name
     )
 
     data["categoria_animal"] = data["sku"].map(new_merged_name)
-    updated_data = data.drop_duplicates(subset="sku").reset_index(drop=True)
+    return data.drop_duplicates(subset="sku").reset_index(drop=True)
+
+
+def get_detail_inputs(
+    data: pd.DataFrame,
+) -> tuple[list[str], list[str], list[str | None]]:
+    """Columnas de entrada del enriquecimiento como listas."""
+    product_ids: list[str | None] = (
+        data["product_id"].tolist()
+        if "product_id" in data
+        else [None] * len(data)
+    )
+    return data["sku"].tolist(), data["url"].tolist(), product_ids
+
+
+def assign_details(
+    data: pd.DataFrame, details: list[ProductDetail]
+) -> pd.DataFrame:
+    """
+    Asigna los detalles (en el mismo orden que las filas) como tres columnas
+    en un solo paso.
+    """
+    columns: list[list[str | None]] = [[], [], []]
+    for detail in details:
+        for column, value in zip(columns, detail):
+            column.append(value)
+
+    return data.assign(**dict(zip(DETAIL_COLUMNS, columns)))
+
+
+def listing_fingerprints(data: pd.DataFrame) -> pd.Series:
+    """
+    Hash por fila de los campos del listado que, si cambian, justifican
+    volver a pedir el detalle del producto.
+    """
+    return fingerprint_rows(data, FINGERPRINT_COLUMNS)
+
+
+def get_reusable_details(
+    data: pd.DataFrame, previous: Optional[pd.DataFrame]
+) -> dict[str, ProductDetail]:
+    """
+    Detalles del snapshot anterior para los SKU cuyo listado no cambió.
+    Los SKU nuevos, los que cambiaron y los que quedaron sin detalle se
+    vuelven a pedir.
+    """
+    if previous is None or previous.empty:
+        return {}
+
+    previous = previous.drop_duplicates(subset="sku", keep="last")
+    previous_fingerprints = dict(
+        zip(previous["sku"], listing_fingerprints(previous))
+    )
+    unchanged = [
+        sku
+        for sku, fingerprint in zip(data["sku"], listing_fingerprints(data))
+        if previous_fingerprints.get(sku) == fingerprint
+    ]
+
+    previous = previous.set_index("sku").reindex(columns=DETAIL_COLUMNS)
+    previous = previous.astype(object).where(previous.notna(), None)
+    reusable: dict[str, ProductDetail] = {}
+
+    for sku in unchanged:
+        category, sub_category, description = previous.loc[sku]
+        if category is None and description is None:
+            continue
+        reusable[sku] = (category, sub_category, description)
+
+    return reusable
+
+
+def is_missing_detail(detail: Iterable[Any]) -> bool:
+    """Detalle sin ningún dato: el pedido falló (ej. por throttling)."""
+    return all(value is None for value in detail)
+
+
+def load_done_details(
+    checkpoint: Optional[JsonlCheckpoint],
+) -> dict[str, ProductDetail]:
+    """
+    Detalles ya obtenidos en una ejecución anterior interrumpida. Los
+    vacíos (checkpoints viejos guardaban también los fallidos) se ignoran
+    para volver a pedirlos.
+    """
+    if checkpoint is None:
+        return {}
+
+    done = {
+        sku: (value[0], value[1], value[2])
+        for sku, value in checkpoint.load().items()
+        if not is_missing_detail(value)
+    }
+    if done:
+        logger.info(
+            f"Reanudando desde checkpoint: {len(done)} SKUs ya enriquecidos"
+        )
+    return done
+
+
+def get_done_details(
+    data: pd.DataFrame,
+    checkpoint: Optional[JsonlCheckpoint],
+    previous: Optional[pd.DataFrame],
+) -> dict[str, ProductDetail]:
+    """
+    SKU que no hace falta pedir: los que no cambiaron desde el snapshot
+    anterior y los ya guardados en el checkpoint.
+    """
+    reusable = get_reusable_details(data, previous)
+    if previous is not None:
+        logger.info(
+            f"Enriquecimiento incremental: {len(reusable)} de {len(data)} "
+            "SKUs omitidos (sin cambios desde el snapshot anterior)"
+        )
+
+    return {**reusable, **load_done_details(checkpoint)}
+
+
+# Main function
+def update_product_data(
+    data: pd.DataFrame,
+    max_workers: int = 1,
+    checkpoint: Optional[JsonlCheckpoint] = None,
+    parse_workers: int = 0,
+    queue_size: int = settings.ENRICH_PARSE_QUEUE_SIZE,
+    previous: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Deja una fila por SKU y le agrega categoría, subcategoría y descripción.
+    Con max_workers > 1 los detalles se piden en paralelo; el orden de las
+    filas y el resultado son los mismos que en serie.
+
+    Con parse_workers > 0 el HTML se parsea en un pool de procesos aparte de
+    los threads de descarga (ver enrich_with_parse_pool()).
+
+    Si se indica un checkpoint, los SKU que ya figuran en él no se vuelven a
+    pedir y cada detalle nuevo se va guardando en él.
+
+    Si se indica el snapshot enriquecido anterior (`previous`), los SKU cuyo
+    listado no cambió reutilizan su detalle (ver get_reusable_details()).
+    """
+    # Combinar categoria_animal (perro-gato) por SKU presente en ambas categorias
+    # de animal
+    updated_data = merge_animal_categories(data)
 
     # Extraer categoria y descripcion del producto
-    updated_data[
-        ["categoria_producto", "sub_categoria_producto", "descripcion_producto"]
-    ] = updated_data.apply(get_category_and_description, axis=1)
+    skus, urls, product_ids = get_detail_inputs(updated_data)
+    done = get_done_details(updated_data, checkpoint, previous)
+    pending = [i for i, sku in enumerate(skus) if sku not in done]
+
+    def save(i: int, detail: ProductDetail) -> None:
+        # Los fallidos no se guardan, así se reintentan al reanudar
+        if checkpoint and not is_missing_detail(detail):
+            checkpoint.add(skus[i], list(detail))
+
+    def enrich(i: int) -> ProductDetail:
+        detail = get_category_and_description(skus[i], urls[i], product_ids[i])
+        save(i, detail)
+        return detail
+
+    try:
+        if parse_workers > 0:
+            results = enrich_with_parse_pool(
+                [(skus[i], urls[i], product_ids[i]) for i in pending],
+                fetch_workers=max_workers,
+                parse_workers=parse_workers,
+                queue_size=queue_size,
+                on_detail=lambda j, detail: save(pending[j], detail),
+            )
+            fetched = {pending[j]: detail for j, detail in results.items()}
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            try:
+                fetched = dict(zip(pending, executor.map(enrich, pending)))
+            finally:
+                # Ante una interrupción no seguimos con lo que quedaba en
+                # cola
+                executor.shutdown(wait=True, cancel_futures=True)
+    finally:
+        # Guardamos lo ya obtenido, incluso si hubo una interrupción
+        if checkpoint:
+            checkpoint.flush()
+
+    details = [
+        fetched[i] if i in fetched else done[sku] for i, sku in enumerate(skus)
+    ]
+    return assign_details(updated_data, details)
 
-    return updated_data
 
+async def update_product_data_async(
+    data: pd.DataFrame,
+    client: Optional[AsyncHttpClient] = None,
+    checkpoint: Optional[JsonlCheckpoint] = None,
+    previous: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Versión asíncrona de update_product_data(): todos los detalles se piden
+    desde un único event loop, limitados por el semáforo por host del cliente.
+    """
+    if client is None:
+        async with AsyncHttpClient() as new_client:
+            return await update_product_data_async(
+                data, new_client, checkpoint, previous
+            )
 
-def main():
-    from core.settings import settings
+    updated_data = merge_animal_categories(data)
+
+    skus, urls, product_ids = get_detail_inputs(updated_data)
+    done = get_done_details(updated_data, checkpoint, previous)
+    pending = [i for i, sku in enumerate(skus) if sku not in done]
+
+    async def enrich(i: int) -> ProductDetail:
+        detail = await get_category_and_description_async(
+            client, skus[i], urls[i], product_ids[i]
+        )
+        if checkpoint and not is_missing_detail(detail):
+            checkpoint.add(skus[i], list(detail))
+        return detail
+
+    try:
+        results = await asyncio.gather(*(enrich(i) for i in pending))
+    finally:
+        if checkpoint:
+            checkpoint.flush()
+
+    fetched = dict(zip(pending, results))
+    details = [
+        fetched[i] if i in fetched else done[sku] for i, sku in enumerate(skus)
+    ]
+    return assign_details(updated_data, details)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Extrae el detalle de los productos de Saga Falabella"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.ENRICH_MAX_WORKERS,
+        help="Productos a enriquecer en paralelo (1 = en serie)",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=settings.ENRICH_PARSE_WORKERS,
+        help="Procesos que parsean el HTML (0 = en los threads de descarga)",
+    )
+    parser.add_argument(
+        "--use-async",
+        action="store_true",
+        help="Usa el cliente asíncrono (aiohttp) en lugar del síncrono",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Descarga todos los HTML sin usar la cache HTTP persistente",
+    )
+    parser.add_argument(
+        "--previous",
+        choices=["parquet", "postgres", "none"],
+        default="parquet",
+        help=(
+            "Snapshot enriquecido anterior para pedir solo los SKU nuevos o "
+            "modificados (none = enriquecer todo)"
+        ),
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignora el checkpoint de una ejecución interrumpida",
+    )
+    return parser.parse_args(argv)
+
+
+def select_unchanged_rows(
+    previous: pd.DataFrame, current: set[tuple[Any, int]]
+) -> pd.DataFrame:
+    """
+    Filas de `previous` cuyo (sku, fingerprint) aparece en `current`: las
+    únicas que get_reusable_details() puede reutilizar.
+    """
+    keys = zip(previous["sku"], listing_fingerprints(previous))
+    return previous[[key in current for key in keys]]
+
+
+def load_previous_snapshot(
+    source: str, data: pd.DataFrame
+) -> Optional[pd.DataFrame]:
+    """
+    Lee el último snapshot enriquecido: el parquet de la ejecución anterior
+    o la última fila de cada SKU en la tabla de Postgres. Solo conserva las
+    filas de SKU de `data` cuyo listado no cambió; en Postgres se filtra
+    bloque a bloque, así que nunca se tiene la tabla completa en memoria.
+    """
+    from services.datalake import DataLakeManager
+    from services.postgres import PostgresManager, default_postgres_config
+
+    columns = ["sku", *FINGERPRINT_COLUMNS, *DETAIL_COLUMNS]
+    current = set(zip(data["sku"], listing_fingerprints(data)))
+
+    try:
+        if source == "parquet":
+            path = settings.TMP_DIR / "saga_falabella_updated.parquet"
+            if not path.exists():
+                return None
+            previous = DataLakeManager(connection_type="local").read_data(
+                path, fmt="parquet"
+            )
+            if not isinstance(previous, pd.DataFrame):
+                return None
+            return select_unchanged_rows(
+                previous.reindex(columns=columns), current
+            )
+
+        if source == "postgres":
+            db = PostgresManager(default_postgres_config())
+            frames = [
+                select_unchanged_rows(chunk, current)
+                for chunk in db.iter_dataframes(
+                    f"SELECT DISTINCT ON (sku) {', '.join(columns)} "
+                    f"FROM {SQL_TABLE_NAME} "
+                    "ORDER BY sku, fecha_extraccion_inicio DESC"
+                )
+            ]
+            if not frames:
+                return pd.DataFrame(columns=columns)
+            return pd.concat(frames, ignore_index=True)
+
+    except Exception as e:
+        logger.warning(
+            f"No se pudo leer el snapshot anterior ({source}); "
+            f"se enriquecen todos los SKUs: {e}"
+        )
+
+    return None
+
+
+def main(argv: list[str] | None = None):
     from services.datalake import DataLakeManager
 
+    args = parse_args(argv)
+
+    cache = None if args.no_cache else HttpCache.from_settings()
+    set_http_cache(cache)
+
     try:
         logger.info("=== INICIANDO UPDATE DE PRODUCTOS SAGA FALABELLA ===")
 
@@ -70,7 +558,36 @@ def main():
             logger.error("No se pudo leer el archivo de datos")
             return
 
-        updated_data = update_product_data(data)
+        # El checkpoint solo sirve para el mismo archivo de entrada
+        checkpoint = JsonlCheckpoint(
+            settings.TMP_DIR / "saga_falabella_updated.checkpoint.jsonl",
+            source=f"{parquet_path}:{parquet_path.stat().st_mtime_ns}",
+            flush_every=settings.CHECKPOINT_FLUSH_EVERY,
+        )
+        if args.restart:
+            checkpoint.remove()
+
+        previous = load_previous_snapshot(args.previous, data)
+
+        if args.use_async:
+            updated_data = asyncio.run(
+                update_product_data_async(
+                    data, checkpoint=checkpoint, previous=previous
+                )
+            )
+        else:
+            updated_data = update_product_data(
+                data,
+                max_workers=args.workers,
+                checkpoint=checkpoint,
+                parse_workers=args.parse_workers,
+                previous=previous,
+            )
+
+        detail_stats.log_summary()
+        get_rate_limiter().log_summary()
+        if cache:
+            cache.log_summary()
 
         # Guardando el dataframe en un parquet
         tmp_file = settings.TMP_DIR / "saga_falabella_updated.parquet"
@@ -80,10 +597,21 @@ def main():
             "Archivo temporal de saga_falabella_updated.parquet actualizado"
         )
 
+        # Historial acumulado: una carpeta por día de extracción y animal
+        datalake.write_dataset(
+            settings.TMP_DIR / "saga_falabella_dataset",
+            add_extraction_date(updated_data),
+            DATASET_PARTITION_COLUMNS,
+        )
+        checkpoint.remove()
+
         logger.info("=== PROCESO FINALIZADO ===")
 
     except KeyboardInterrupt:
-        logger.warning("Scrapeo interrumpido por el usuario")
+        logger.warning(
+            "Scrapeo interrumpido por el usuario; el progreso quedó en el "
+            "checkpoint y se retomará en la próxima ejecución"
+        )
         sys.exit(0)
 
     except Exception:
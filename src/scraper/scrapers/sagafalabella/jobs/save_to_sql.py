@@ -1,15 +1,190 @@
+import argparse
+from dataclasses import dataclass
+
 import pandas as pd
+from sqlalchemy import Date
 
 from core.logging import get_logger
-from core.schemas import PostgresConfig
 from core.settings import settings
+from scraper.scrapers.sagafalabella.constants import (
+    SQL_HISTORY_TABLE_NAME,
+    SQL_TABLE_NAME,
+)
+from scraper.scrapers.sagafalabella.dates import (
+    EXTRACTION_DATE_SQL,
+    add_extraction_date,
+)
+from scraper.utils.fingerprint import fingerprint_rows
 from services.datalake import DataLakeManager
-from services.postgres import PostgresManager
+from services.postgres import (
+    PostgresManager,
+    default_postgres_config,
+    qualified_name,
+)
 
 logger = get_logger(__name__)
 
+# Columnas que cambian en cada ejecución y no cuentan como cambio
+UNTRACKED_COLUMNS = ["fecha_extraccion_inicio", "fecha_extraccion_final"]
+
+# Clave del modo upsert: un snapshot por SKU y día
+UPSERT_KEY = ["sku", "fecha_extraccion"]
+
+# Modo partitioned: columnas indexadas (historial por SKU y por categoría)
+PARTITION_INDEX_COLUMNS = ["sku", "categoria_animal"]
+
+
+@dataclass
+class SnapshotDiff:
+    """Diferencias entre el snapshot actual y las versiones vigentes."""
+
+    inserted: pd.DataFrame  # SKU nuevos
+    changed: pd.DataFrame  # SKU cuyo contenido cambió (versión nueva)
+    removed: list[str]  # SKU que ya no aparecen
+
+
+def diff_snapshots(
+    current: pd.DataFrame, previous: pd.DataFrame
+) -> SnapshotDiff:
+    """
+    Compara por sku el snapshot actual con el anterior, usando todas las
+    columnas del snapshot actual salvo las fechas de extracción.
+    """
+    current = current.drop_duplicates(subset="sku", keep="last")
+    tracked = [
+        c for c in current.columns if c not in UNTRACKED_COLUMNS and c != "sku"
+    ]
+
+    previous_fingerprints = dict(
+        zip(previous["sku"], fingerprint_rows(previous, tracked))
+    )
+    current_fingerprints = fingerprint_rows(current, tracked)
+
+    is_new = ~current["sku"].isin(previous_fingerprints)
+    is_changed = ~is_new & (
+        current["sku"].map(previous_fingerprints) != current_fingerprints
+    )
+    removed = sorted(set(previous_fingerprints) - set(current["sku"]))
+
+    return SnapshotDiff(
+        inserted=current[is_new],
+        changed=current[is_changed],
+        removed=removed,
+    )
+
+
+def get_snapshot_time(data: pd.DataFrame) -> pd.Timestamp:
+    """Momento del snapshot: el inicio de extracción más temprano."""
+    return pd.to_datetime(data["fecha_extraccion_inicio"], utc=True).min()
+
+
+def save_history(
+    db: PostgresManager,
+    data: pd.DataFrame,
+    table_name: str = SQL_HISTORY_TABLE_NAME,
+    schema: str | None = "public",
+) -> SnapshotDiff:
+    """
+    Modo CDC: escribe solo los SKU nuevos, modificados o eliminados respecto
+    de las versiones vigentes de la tabla histórica.
+
+    Cada fila de la tabla es una versión de un SKU válida en
+    [valido_desde, valido_hasta); la vigente tiene valido_hasta NULL. Los
+    precios de un día D se reconstruyen con
+    `valido_desde <= D AND (valido_hasta IS NULL OR valido_hasta > D)`.
+    """
+    snapshot_time = get_snapshot_time(data)
+
+    if db.table_exists(table_name, schema=schema):
+        previous = db.read_dataframe(
+            f"SELECT * FROM {qualified_name(table_name, schema)} "
+            "WHERE valido_hasta IS NULL"
+        )
+    else:
+        previous = pd.DataFrame(columns=["sku"])
+
+    diff = diff_snapshots(data, previous)
+
+    new_versions = pd.concat([diff.inserted, diff.changed])
+    new_versions = new_versions.assign(
+        valido_desde=snapshot_time,
+        # Tipado como timestamp para que la columna se cree con ese tipo
+        valido_hasta=pd.Series(
+            pd.NaT, index=new_versions.index, dtype="datetime64[ns, UTC]"
+        ),
+    )
+    db.save_history_changes(
+        new_versions,
+        table_name,
+        key="sku",
+        closed_keys=[*diff.changed["sku"], *diff.removed],
+        valid_to=snapshot_time.to_pydatetime(),
+        schema=schema,
+    )
+
+    logger.info(
+        f"CDC: {len(diff.inserted)} nuevos, {len(diff.changed)} modificados, "
+        f"{len(diff.removed)} eliminados de {len(data)} SKUs"
+    )
+    return diff
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Guarda los productos de Saga Falabella en Postgres"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["snapshot", "upsert", "cdc", "partitioned"],
+        default="snapshot",
+        help=(
+            "snapshot agrega el catálogo completo; upsert lo inserta o "
+            "actualiza por sku y fecha (re-ejecutable sin duplicar); cdc solo "
+            "escribe los cambios en la tabla histórica; partitioned agrega el "
+            "catálogo a una tabla particionada por mes de extracción"
+        ),
+    )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help=(
+            "Modo partitioned: si la tabla existe sin particionar, la "
+            "renombra a <tabla>_legacy y copia sus filas a la tabla "
+            "particionada antes de cargar"
+        ),
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=settings.DB_PARTITION_RETENTION_DAYS,
+        help=(
+            "Modo partitioned: quita las particiones con datos más antiguos "
+            "que estos días (por defecto 0: las conserva todas)"
+        ),
+    )
+    parser.add_argument(
+        "--detach-partitions",
+        action="store_true",
+        help=(
+            "Con --retention-days, separa las particiones viejas (quedan "
+            "como tablas sueltas) en vez de borrarlas"
+        ),
+    )
+    parser.add_argument(
+        "--load-method",
+        choices=["insert", "copy", "parallel"],
+        default="copy",
+        help=(
+            "Carga de los modos snapshot y upsert: COPY FROM STDIN, INSERT "
+            "multi-fila o COPY repartido entre varias conexiones (parallel)"
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
 
-def main():
     logger.info("Guardando datos scrapeados a SQL")
 
     # Obtener el dataframe
@@ -21,15 +196,56 @@ def main():
         logger.error("No se pudo leer el archivo de datos")
         return
 
-    config = PostgresConfig(
-        host="localhost",
-        port=5432,
-        user="postgres",
-        password="root",
-        database="test_biomont",
-    )
-    db = PostgresManager(config)
-    db.save_dataframe(data.drop(columns=["url"]), "webscrapping_sagafalabella2")
+    db = PostgresManager(default_postgres_config())
+
+    # snapshot y upsert no crean particiones: tras migrar la tabla solo se
+    # puede cargar con el modo partitioned
+    if args.mode in ("snapshot", "upsert") and db.is_partitioned(
+        SQL_TABLE_NAME
+    ):
+        raise ValueError(
+            f"La tabla {SQL_TABLE_NAME} está particionada; cárguela con "
+            "--mode partitioned."
+        )
+
+    if args.mode == "cdc":
+        save_history(db, data.drop(columns=["url"]))
+    elif args.mode == "upsert":
+        db.save_dataframe(
+            add_extraction_date(data.drop(columns=["url"])),
+            SQL_TABLE_NAME,
+            if_exists="upsert",
+            method=args.load_method,
+            conflict_columns=UPSERT_KEY,
+            dtype={"fecha_extraccion": Date()},
+        )
+    elif args.mode == "partitioned":
+        if args.migrate:
+            db.migrate_to_partitioned(
+                SQL_TABLE_NAME,
+                partition_column="fecha_extraccion",
+                partition_expression=EXTRACTION_DATE_SQL,
+                index_columns=PARTITION_INDEX_COLUMNS,
+            )
+        db.save_partitioned(
+            add_extraction_date(data.drop(columns=["url"])),
+            SQL_TABLE_NAME,
+            partition_column="fecha_extraccion",
+            index_columns=PARTITION_INDEX_COLUMNS,
+            dtype={"fecha_extraccion": Date()},
+        )
+        if args.retention_days > 0:
+            db.drop_old_partitions(
+                SQL_TABLE_NAME,
+                args.retention_days,
+                detach_only=args.detach_partitions,
+            )
+    else:
+        db.save_dataframe(
+            data.drop(columns=["url"]),
+            SQL_TABLE_NAME,
+            method=args.load_method,
+        )
 
     logger.info("Datos scrapeados a SQL guardados de manera exitosa")
 
@@ -1,25 +1,56 @@
+import argparse
+import asyncio
 import sys
 from collections import defaultdict
-from typing import DefaultDict, TypedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    DefaultDict,
+    Iterable,
+    Iterator,
+    Optional,
+    TypedDict,
+)
 
 from core.logging import get_logger
-from scraper.scrapers.sagafalabella.client import fetch_products_page
+from core.settings import settings
+from scraper.scrapers.sagafalabella import async_client
+from scraper.scrapers.sagafalabella.client import fetch_listing_page
 from scraper.scrapers.sagafalabella.constants import (
     CATEGORY_LOOKUP,
 )
-from scraper.scrapers.sagafalabella.parser import get_product_data
+from scraper.scrapers.sagafalabella.parser import (
+    get_products_data,
+    products_to_record_batch,
+)
 from scraper.scrapers.sagafalabella.schemas import (
+    SCRAPED_PRODUCT_SCHEMA,
     CategoryMetadata,
+    ListingPage,
     ScrapedProduct,
 )
+from scraper.utils.async_http import AsyncHttpClient
+from scraper.utils.prefetch import aiter_ordered_results, iter_ordered_results
+from scraper.utils.rate_limit import get_rate_limiter
 
 logger = get_logger(__name__)
 
 
+# Páginas descargadas por adelantado por cada worker (ver iter_scraped_pages())
+PREFETCH_PAGES_PER_WORKER = 2
+
+
 class ProductDict(TypedDict):
     skuId: str
 
 
+# Páginas de una categoría: (id de categoría, páginas con productos)
+type CategoryPages = tuple[str, list[list[ProductDict]]]
+
+
 def get_new_products(
     products: list[ProductDict],
     skus_stored: set[str],
@@ -35,9 +66,94 @@ def get_new_products(
     return new_products
 
 
-def scrape() -> list[ScrapedProduct]:
-    all_scraped_data: list[ScrapedProduct] = []
+def fetch_page(
+    page: int, cat_id: str, category_name: str
+) -> Optional[ListingPage]:
+    logger.info(f"Scrapeando pagina {page} de {category_name}")
+    return fetch_listing_page(page, cat_id, category_name)
+
+
+def fetch_category_page(
+    cat_id: str, page: int, category_name: str
+) -> CategoryPages:
+    """
+    Descarga una página cuya existencia conocemos por la metadata de
+    paginación. Retorna la categoría con la página, o sin páginas si la
+    página no tiene productos.
+    """
+    listing = fetch_page(page, cat_id, category_name)
+
+    if listing is None:
+        logger.warning(
+            f"No se pudo obtener la pagina {page} de {category_name}"
+        )
+        return cat_id, []
+
+    products: list[ProductDict] = listing["results"]
+    return cat_id, [products] if products else []
+
+
+def iter_probed_pages(
+    cat_id: str, category_name: str, start_page: int
+) -> Iterator[list[ProductDict]]:
+    """
+    Descarga páginas en serie hasta encontrar una vacía. Se usa cuando la API
+    no informa el total de páginas.
+    """
+    page = start_page
+
+    while True:
+        listing = fetch_page(page, cat_id, category_name)
+        if not listing or not listing["results"]:
+            return
 
+        yield listing["results"]
+        page += 1
+
+
+def already_fetched(
+    cat_id: str, pages: list[list[ProductDict]]
+) -> CategoryPages:
+    return cat_id, pages
+
+
+def iter_page_calls(
+    executor: ThreadPoolExecutor, window: int
+) -> Iterator[Callable[[], CategoryPages]]:
+    """
+    Genera una llamada por página a descargar, en el orden en que se parsean
+    las categorías. Las primeras páginas se piden por adelantado (hasta
+    `window`) porque de ellas sale el total de páginas de cada categoría;
+    sin total se sondea en serie hasta una página vacía.
+    """
+    categories = [
+        (cat_id, metadata["category_url"])
+        for cat_id, metadata in iter_ordered_categories()
+    ]
+    first_pages = iter_ordered_results(
+        executor,
+        (partial(fetch_page, 1, cat_id, name) for cat_id, name in categories),
+        window,
+    )
+
+    for (cat_id, name), first_page in zip(categories, first_pages):
+        if not first_page or not first_page["results"]:
+            continue
+
+        yield partial(already_fetched, cat_id, [first_page["results"]])
+
+        total_pages = first_page["total_pages"]
+        if total_pages is None:
+            for products in iter_probed_pages(cat_id, name, 2):
+                yield partial(already_fetched, cat_id, [products])
+        else:
+            for page in range(2, total_pages + 1):
+                yield partial(fetch_category_page, cat_id, page, name)
+
+
+def group_categories_by_animal() -> DefaultDict[
+    str, list[tuple[str, CategoryMetadata]]
+]:
     categories_by_animal: DefaultDict[
         str, list[tuple[str, CategoryMetadata]]
     ] = defaultdict(list)
@@ -45,76 +161,388 @@ def scrape() -> list[ScrapedProduct]:
     for cat_id, metadata in CATEGORY_LOOKUP.items():
         categories_by_animal[metadata["animal"]].append((cat_id, metadata))
 
-    for animal, categories in categories_by_animal.items():
+    return categories_by_animal
+
+
+def iter_ordered_categories() -> Iterator[tuple[str, CategoryMetadata]]:
+    """Categorías en el orden en que las recorre iter_parsed_pages()."""
+    for categories in group_categories_by_animal().values():
+        yield from categories
+
+
+def parse_category_page(
+    animal: str,
+    category_label: str,
+    page: int,
+    products: list[ProductDict],
+    skus_stored_for_animal: set[str],
+) -> list[ScrapedProduct]:
+    """Deduplica (por animal) y parsea una página de una categoría."""
+    new_products = get_new_products(products, skus_stored_for_animal)
+
+    parsed = get_products_data(animal, new_products, category_label)
+
+    logger.info(
+        f"Total de productos scrapeados de {animal} -> {category_label}: (pagina {page}): {len(parsed)}",
+    )
+    return parsed
+
+
+def log_category_total(animal: str, category_label: str, total: int) -> None:
+    logger.info(
+        f"Finalizado {category_label}: {total} productos nuevos para {animal}."
+    )
+
+
+def iter_category_pages(
+    animal: str,
+    category_label: str,
+    pages: Iterable[list[ProductDict]],
+    skus_stored_for_animal: set[str],
+) -> Iterator[list[ScrapedProduct]]:
+    """
+    Deduplica (por animal) y parsea las páginas de una categoría en orden,
+    entregando los productos nuevos de cada página apenas se parsea.
+    """
+    total = 0
+
+    for page, products in enumerate(pages, start=1):
+        parsed = parse_category_page(
+            animal, category_label, page, products, skus_stored_for_animal
+        )
+        total += len(parsed)
+        yield parsed
+
+    log_category_total(animal, category_label, total)
+
+
+def parse_category_pages(
+    animal: str,
+    category_label: str,
+    pages: Iterable[list[ProductDict]],
+    skus_stored_for_animal: set[str],
+) -> list[ScrapedProduct]:
+    """Igual que iter_category_pages(), pero retorna todo en una lista."""
+    return [
+        product
+        for parsed in iter_category_pages(
+            animal, category_label, pages, skus_stored_for_animal
+        )
+        for product in parsed
+    ]
+
+
+def iter_parsed_pages(
+    pages_for: Callable[[str], Iterable[list[ProductDict]]],
+) -> Iterator[list[ScrapedProduct]]:
+    """
+    Recorre las categorías en el orden de CATEGORY_LOOKUP (agrupadas por
+    animal) y entrega los productos nuevos página a página. `pages_for`
+    retorna las páginas crudas de una categoría.
+    """
+    for animal, categories in group_categories_by_animal().items():
         logger.info(f"=== Iniciando scraping para el animal: {animal} ===")
 
         skus_stored_for_animal: set[str] = set()
 
         for cat_id, metadata in categories:
             category_label = metadata["category_label"]
-            category_name = metadata["category_url"]
-
-            page = 1
-            category_counter = 0
             logger.info(f"Iniciando scraping de {animal} -> {category_label}")
 
+            yield from iter_category_pages(
+                animal,
+                category_label,
+                pages_for(cat_id),
+                skus_stored_for_animal,
+            )
+
+
+def pages_by_category(
+    results: Iterable[CategoryPages],
+) -> Callable[[str], Iterator[list[ProductDict]]]:
+    """
+    Convierte el flujo ordenado de (categoría, páginas) en la función
+    `pages_for` de iter_parsed_pages(). Las categorías sin páginas no
+    aparecen en el flujo, por eso se compara con la categoría siguiente.
+    """
+    results = iter(results)
+    head: list[Optional[CategoryPages]] = [next(results, None)]
+
+    def pages_for(cat_id: str) -> Iterator[list[ProductDict]]:
+        while head[0] is not None and head[0][0] == cat_id:
+            _, pages = head[0]
+            # Soltamos la referencia antes de entregar la página
+            head[0] = None
+            yield from pages
+            head[0] = next(results, None)
+
+    return pages_for
+
+
+def iter_scraped_pages(
+    max_workers: int = 1, window: Optional[int] = None
+) -> Iterator[list[ScrapedProduct]]:
+    """
+    Scrapea todas las categorías de CATEGORY_LOOKUP entregando los productos
+    nuevos de cada página a medida que se parsean.
+
+    Con max_workers > 1 las páginas se descargan en paralelo, a lo sumo
+    `window` por adelantado (por defecto max_workers *
+    PREFETCH_PAGES_PER_WORKER), por lo que la memoria queda acotada por esa
+    cantidad de páginas y no por el catálogo. El parseo y la deduplicación
+    por animal se hacen siempre en orden, por lo que el resultado es el
+    mismo que en serie.
+    """
+    window = window or max_workers * PREFETCH_PAGES_PER_WORKER
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        results = iter_ordered_results(
+            executor, iter_page_calls(executor, window), window
+        )
+        yield from iter_parsed_pages(pages_by_category(results))
+    finally:
+        # Si el consumidor se detiene antes (p. ej. Ctrl+C) no seguimos
+        # descargando las páginas que quedaban en cola
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def scrape(max_workers: int = 1) -> list[ScrapedProduct]:
+    """
+    Scrapea todas las categorías de CATEGORY_LOOKUP y retorna todos los
+    productos en una lista. Ver iter_scraped_pages().
+    """
+    all_scraped_data: list[ScrapedProduct] = [
+        product
+        for parsed in iter_scraped_pages(max_workers=max_workers)
+        for product in parsed
+    ]
+
+    logger.info(f"Scraping completado. Total global: {len(all_scraped_data)}")
+    return all_scraped_data
+
+
+async def fetch_category_page_async(
+    client: AsyncHttpClient, cat_id: str, page: int, category_name: str
+) -> CategoryPages:
+    """Versión asíncrona de fetch_category_page()."""
+    logger.info(f"Scrapeando pagina {page} de {category_name}")
+    listing = await async_client.fetch_listing_page(
+        client, page, cat_id, category_name
+    )
+
+    if listing is None:
+        logger.warning(
+            f"No se pudo obtener la pagina {page} de {category_name}"
+        )
+        return cat_id, []
+
+    products: list[ProductDict] = listing["results"]
+    return cat_id, [products] if products else []
+
+
+async def already_fetched_async(
+    cat_id: str, pages: list[list[ProductDict]]
+) -> CategoryPages:
+    return cat_id, pages
+
+
+async def aiter_page_calls(
+    client: AsyncHttpClient, window: int
+) -> AsyncIterator[Callable[[], Awaitable[CategoryPages]]]:
+    """Versión asíncrona de iter_page_calls()."""
+    categories = [
+        (cat_id, metadata["category_url"])
+        for cat_id, metadata in iter_ordered_categories()
+    ]
+    first_pages = aiter_ordered_results(
+        (
+            partial(fetch_category_first_page_async, client, cat_id, name)
+            for cat_id, name in categories
+        ),
+        window,
+    )
+
+    async for (cat_id, name), first_page in azip(categories, first_pages):
+        if not first_page or not first_page["results"]:
+            continue
+
+        yield partial(already_fetched_async, cat_id, [first_page["results"]])
+
+        total_pages = first_page["total_pages"]
+        if total_pages is None:
+            page = 2
             while True:
-                logger.info(f"Scrapeando pagina {page}")
-                products: list[ProductDict] = fetch_products_page(
-                    page, cat_id, category_name
+                _, pages = await fetch_category_page_async(
+                    client, cat_id, page, name
                 )
-
-                if not products:
+                if not pages:
                     break
-
-                new_products = get_new_products(
-                    products, skus_stored_for_animal
+                yield partial(already_fetched_async, cat_id, pages)
+                page += 1
+        else:
+            for page in range(2, total_pages + 1):
+                yield partial(
+                    fetch_category_page_async, client, cat_id, page, name
                 )
 
-                parsed = [
-                    get_product_data(animal, p, category_label)
-                    for p in new_products
-                ]
 
-                all_scraped_data.extend(parsed)
-                category_counter += len(parsed)
+async def fetch_category_first_page_async(
+    client: AsyncHttpClient, cat_id: str, category_name: str
+) -> Optional[ListingPage]:
+    logger.info(f"Scrapeando pagina 1 de {category_name}")
+    return await async_client.fetch_listing_page(
+        client, 1, cat_id, category_name
+    )
+
+
+async def azip[T, U](
+    items: Iterable[T], async_items: AsyncIterator[U]
+) -> AsyncIterator[tuple[T, U]]:
+    for item in items:
+        try:
+            yield item, await anext(async_items)
+        except StopAsyncIteration:
+            return
+
+
+async def aiter_scraped_pages(
+    client: Optional[AsyncHttpClient] = None,
+    window: Optional[int] = None,
+) -> AsyncIterator[list[ScrapedProduct]]:
+    """
+    Versión asíncrona de iter_scraped_pages(): las páginas se descargan en
+    el mismo event loop, a lo sumo `window` por adelantado (por defecto
+    settings.HTTP_PER_HOST_LIMIT, el máximo de requests en vuelo del
+    cliente), y se parsean en orden a medida que llegan.
+    """
+    window = window or settings.HTTP_PER_HOST_LIMIT
+    if client is None:
+        async with AsyncHttpClient() as new_client:
+            async for parsed in aiter_scraped_pages(new_client, window):
+                yield parsed
+        return
+
+    results = aiter_ordered_results(aiter_page_calls(client, window), window)
+    try:
+        head: Optional[CategoryPages] = await anext(results, None)
+
+        for animal, categories in group_categories_by_animal().items():
+            logger.info(f"=== Iniciando scraping para el animal: {animal} ===")
 
+            skus_stored_for_animal: set[str] = set()
+
+            for cat_id, metadata in categories:
+                category_label = metadata["category_label"]
                 logger.info(
-                    f"Total de productos scrapeados de {animal} -> {category_label}: (pagina {page}): {len(parsed)}",
+                    f"Iniciando scraping de {animal} -> {category_label}"
                 )
 
-                page += 1
-
-            logger.info(
-                f"Finalizado {category_label}: "
-                f"{category_counter} productos nuevos para {animal}."
-            )
+                page = 0
+                total = 0
+                while head is not None and head[0] == cat_id:
+                    _, pages = head
+                    head = None
+                    for products in pages:
+                        page += 1
+                        parsed = parse_category_page(
+                            animal,
+                            category_label,
+                            page,
+                            products,
+                            skus_stored_for_animal,
+                        )
+                        total += len(parsed)
+                        yield parsed
+                    head = await anext(results, None)
+
+                log_category_total(animal, category_label, total)
+    finally:
+        # Cancela las descargas en vuelo si el consumidor se detiene antes
+        await results.aclose()
+
+
+async def scrape_async(
+    client: Optional[AsyncHttpClient] = None,
+) -> list[ScrapedProduct]:
+    """
+    Versión asíncrona de scrape(): descarga todas las categorías en el mismo
+    event loop y produce exactamente las mismas filas que la versión síncrona.
+    """
+    all_scraped_data: list[ScrapedProduct] = [
+        product
+        async for parsed in aiter_scraped_pages(client)
+        for product in parsed
+    ]
 
     logger.info(f"Scraping completado. Total global: {len(all_scraped_data)}")
     return all_scraped_data
 
 
-def main():
-    import pandas as pd
-
-    from core.settings import settings
+def iter_async[T](items: AsyncIterator[T]) -> Iterator[T]:
+    """
+    Recorre un generador asíncrono desde código síncrono, con un event loop
+    propio. Las descargas en vuelo avanzan mientras se espera cada elemento.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(items))
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(items.aclose())
+        loop.close()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Scraper completo de Saga Falabella"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SCRAPER_MAX_WORKERS,
+        help="Categorías a descargar en paralelo (1 = en serie)",
+    )
+    parser.add_argument(
+        "--use-async",
+        action="store_true",
+        help="Usa el cliente asíncrono (aiohttp) en lugar de threads",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
     from services.datalake import DataLakeManager
 
+    args = parse_args(argv)
+
     try:
         logger.info("=== INICIANDO SCRAPER SAGA FALABELLA ===")
 
-        data = scrape()
-        data_dicts = [p.model_dump() for p in data]
+        if args.use_async:
+            pages = iter_async(aiter_scraped_pages())
+        else:
+            pages = iter_scraped_pages(max_workers=args.workers)
 
-        if not data:
-            logger.warning("No se obtuvieron datos del scrapeo.")
-            return
-
-        # Guardar los datos en un parquet
+        # Cada página se pasa como un record batch apenas se parsea y se
+        # escribe al juntar un row group, así la memoria queda acotada por el
+        # tamaño del row group y no del catálogo
         tmp_file = settings.TMP_DIR / "saga_falabella.parquet"
         datalake = DataLakeManager(connection_type="local")
-        df = pd.DataFrame(data_dicts)
-        datalake.write_data(tmp_file, df, fmt="parquet")
+        total = datalake.write_batches(
+            tmp_file,
+            (products_to_record_batch(parsed) for parsed in pages if parsed),
+            SCRAPED_PRODUCT_SCHEMA,
+        )
+
+        get_rate_limiter().log_summary()
+        logger.info(f"Scraping completado. Total global: {total}")
+
+        if not total:
+            logger.warning("No se obtuvieron datos del scrapeo.")
+            return
 
         logger.info(f"Archivo temporal generado en: {tmp_file}")
         logger.info("=== PROCESO FINALIZADO CON ÉXITO ===")
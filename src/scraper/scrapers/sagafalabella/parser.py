@@ -1,31 +1,66 @@
 import json
-from typing import Any
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable
 
 import pendulum
+import pyarrow as pa
 from bs4 import BeautifulSoup
+from pydantic import TypeAdapter
 
 from core.logging import get_logger
+from core.settings import settings
+from scraper.scrapers.sagafalabella import async_client
 from scraper.scrapers.sagafalabella.client import (
+    fetch_api_product_data,
     fetch_html_product_extra_details,
 )
-from scraper.scrapers.sagafalabella.schemas import RawProduct, ScrapedProduct
-from scraper.utils.text import clean_html, get_weight_from_text
+from scraper.scrapers.sagafalabella.schemas import (
+    ApiProductResponse,
+    SCRAPED_PRODUCT_SCHEMA,
+    RawProduct,
+    ScrapedProduct,
+)
+from scraper.utils.async_http import AsyncHttpClient
+from scraper.utils.text import (
+    clean_html,
+    get_weight_from_text,
+    weight_to_grams,
+)
 
 logger = get_logger(__name__)
 
+BREADCRUMB_CLASS = "Breadcrumbs-module_breadcrumb__b47ha"
 
-def get_prices(
-    product: RawProduct,
+# Búsqueda dirigida de los dos fragmentos que necesitamos del HTML
+NEXT_DATA_PATTERN = re.compile(
+    r"<script\b[^>]*\bid=[\"']?__NEXT_DATA__[\"']?[^>]*>(.*?)</script>",
+    flags=re.DOTALL | re.IGNORECASE,
+)
+BREADCRUMB_PATTERN = re.compile(
+    r"<ol\b[^>]*\bclass=[\"'][^\"']*\b"
+    + re.escape(BREADCRUMB_CLASS)
+    + r"\b[^\"']*[\"'][^>]*>.*?</ol>",
+    flags=re.DOTALL | re.IGNORECASE,
+)
+
+
+PriceEntry = tuple[str, bool, list[str]]  # (type, crossed, price)
+
+
+def resolve_prices(
+    entries: Iterable[PriceEntry],
 ) -> tuple[float | None, float | None, float | None]:
+    """
+    Resuelve (precio sin descuento, precio público, precio CMR) a partir de
+    las entradas (tipo, tachado, precio) de un producto.
+    """
     normal_price: float | None = None
     discounted_price: float | None = None
     precio_cmr: float | None = None
 
-    for p in product.prices:
-        _type = p.type
-        crossed = p.crossed
-        list_prices = p.price
-
+    for _type, crossed, list_prices in entries:
         if not list_prices:
             continue
 
@@ -47,45 +82,84 @@ def get_prices(
     return normal_price, discounted_price, precio_cmr
 
 
-def get_product_data(
-    animal: str, product_dict: dict[str, Any], category_name: str
-) -> ScrapedProduct:
+def get_prices(
+    product: RawProduct,
+) -> tuple[float | None, float | None, float | None]:
+    return resolve_prices((p.type, p.crossed, p.price) for p in product.prices)
+
+
+# Validador de páginas completas; construirlo es caro, por eso se reutiliza
+RAW_PRODUCTS_ADAPTER = TypeAdapter(list[RawProduct])
+
+
+def get_products_data(
+    animal: str, product_dicts: list[dict[str, Any]], category_name: str
+) -> list[ScrapedProduct]:
+    """
+    Valida y procesa una página de productos del listado en una sola pasada.
+    Las fechas de extracción se toman una vez por página: el inicio antes de
+    validar y el final después de construir todos los productos.
+    """
     start_date = pendulum.now("America/Lima").to_iso8601_string()
 
-    # Validamos el diccionario de entrada
-    product = RawProduct(**product_dict)
-    normal_price, discounted_price, precio_cmr = get_prices(product)
+    # Validamos la página completa de una vez
+    products = RAW_PRODUCTS_ADAPTER.validate_python(product_dicts)
+    extract_weight = category_name == "Alimentos"
+
+    results: list[ScrapedProduct] = []
+    for product in products:
+        normal_price, discounted_price, precio_cmr = get_prices(product)
+
+        peso = (
+            get_weight_from_text(product.displayName)
+            if extract_weight
+            else None
+        )
+
+        # Construimos el objeto final usando el modelo para asegurar
+        # consistencia
+        results.append(
+            ScrapedProduct(
+                categoria_animal=animal,
+                categoria_producto=None,
+                marca=product.brand,
+                nombre=product.displayName,
+                vendido_por=product.sellerName,
+                descripcion_producto=None,
+                peso_considerado=peso,
+                peso_gramos=weight_to_grams(peso),
+                precio_sin_descuento=normal_price,
+                precio_publico=discounted_price,
+                precio_cmr=precio_cmr,
+                fecha_extraccion_inicio=start_date,
+                fecha_extraccion_final=None,
+                product_id=product.productId,
+                sku=product.skuId,
+                url=product.url,
+            )
+        )
 
-    peso = (
-        get_weight_from_text(product.displayName)
-        if category_name == "Alimentos"
-        else None
-    )
+    end_date = pendulum.now("America/Lima").to_iso8601_string()
+    for result in results:
+        result.fecha_extraccion_final = end_date
 
-    # Construimos el objeto final usando el modelo para asegurar consistencia
-    result = ScrapedProduct(
-        categoria_animal=animal,
-        categoria_producto=None,
-        marca=product.brand,
-        nombre=product.displayName,
-        vendido_por=product.sellerName,
-        descripcion_producto=None,
-        peso_considerado=peso,
-        precio_sin_descuento=normal_price,
-        precio_publico=discounted_price,
-        precio_cmr=precio_cmr,
-        fecha_extraccion_inicio=start_date,
-        fecha_extraccion_final=None,
-        product_id=product.productId,
-        sku=product.skuId,
-        url=product.url,
-    )
+    return results
 
-    result.fecha_extraccion_final = pendulum.now(
-        "America/Lima"
-    ).to_iso8601_string()
 
-    return result
+def get_product_data(
+    animal: str, product_dict: dict[str, Any], category_name: str
+) -> ScrapedProduct:
+    """Procesa un solo producto. Ver get_products_data()."""
+    return get_products_data(animal, [product_dict], category_name)[0]
+
+
+def products_to_record_batch(
+    products: list[ScrapedProduct],
+) -> pa.RecordBatch:
+    """Convierte una página de productos a un record batch de Arrow."""
+    return pa.RecordBatch.from_pylist(
+        [p.model_dump() for p in products], schema=SCRAPED_PRODUCT_SCHEMA
+    )
 
 
 def get_breadcrumb_categories(
@@ -97,13 +171,20 @@ def get_breadcrumb_categories(
     -> Cat: Higiene, Sub: Cepillos
     """
     # Buscamos la lista de breadcrumbs
-    ol = soup.find("ol", class_="Breadcrumbs-module_breadcrumb__b47ha")
+    ol = soup.find("ol", class_=BREADCRUMB_CLASS)
     if not ol:
         return None, None
 
     # Obtenemos todos los textos de los enlaces
     links = [a.get_text(strip=True) for a in ol.find_all("a")]
+    return split_breadcrumb(links)
+
 
+def split_breadcrumb(links: list[str]) -> tuple[str | None, str | None]:
+    """
+    Toma categoría y subcategoría de una lista de breadcrumbs completa
+    (incluye Home y Raíz), venga del HTML o de la API.
+    """
     # Cortamos para ignorar los dos primeros (Home y Raíz)
     # links_to_use contendrá todo lo que viene después
     links_to_use = links[2:]
@@ -123,46 +204,283 @@ def get_breadcrumb_categories(
     return category, sub_category
 
 
-def get_product_detail(
-    sku: str, url: str
+def get_description(product_info: dict[str, Any]) -> str | None:
+    """
+    Obtiene la descripción limpia de los datos de un producto, ya sea el
+    productData de __NEXT_DATA__ o el bloque `data` de la API.
+    """
+    raw_description = product_info.get("longDescription") or product_info.get(
+        "description"
+    )
+    return (
+        clean_html(raw_description)
+        if isinstance(raw_description, str)
+        else None
+    )
+
+
+def extract_description(next_data: str) -> str | None:
+    """
+    Obtiene la descripción limpia desde el JSON de __NEXT_DATA__.
+    """
+    data_json = json.loads(next_data)
+    product_info = (
+        data_json.get("props", {}).get("pageProps", {}).get("productData", {})
+    )
+    return get_description(product_info)
+
+
+def parse_api_product_detail(
+    data: dict[str, Any],
 ) -> tuple[str | None, str | None, str | None]:
-    try:
-        content = fetch_html_product_extra_details(url)
+    """
+    Extrae (categoría, subcategoría, descripción) del JSON de la API de
+    producto. Se asume que el breadcrumb de la API tiene los mismos niveles
+    que el del HTML, cada uno con su texto en `label` (o `name`/
+    `displayName`); como esas claves no se verificaron contra respuestas
+    reales, el nivel API solo se usa con settings.DETAIL_API_ENABLED.
+    """
+    items: Any = data.get("breadcrumb") or data.get("breadCrumb") or []
+    links: list[str] = []
 
-        if content is None:
-            logger.warning(f"No se pudo extraer detalle del sku {sku}")
-            return None, None, None
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        label: Any = (
+            item.get("label") or item.get("name") or item.get("displayName")
+        )
+        if isinstance(label, str) and label.strip():
+            links.append(label.strip())
 
-        soup = BeautifulSoup(content, "html.parser")
+    category, sub_category = split_breadcrumb(links)
+    return category, sub_category, get_description(data)
 
-        # Extraer Categorías (Nueva lógica integrada)
-        category, sub_category = get_breadcrumb_categories(soup)
 
-        # Extraer Descripción (Tu lógica original de JSON)
-        next_data_script = soup.find("script", id="__NEXT_DATA__")
-        description = None
+def find_detail_fragments(content: str) -> tuple[str, str] | None:
+    """
+    Ubica con una búsqueda dirigida el JSON de __NEXT_DATA__ y el <ol> de
+    breadcrumbs, sin construir el árbol de la página completa.
+    Retorna None si alguno no se encuentra con la forma esperada.
+    """
+    next_data = NEXT_DATA_PATTERN.search(content)
+    breadcrumb = BREADCRUMB_PATTERN.search(content)
 
-        if next_data_script and next_data_script.string:
-            data_json = json.loads(next_data_script.string)
-            product_info = (
-                data_json.get("props", {})
-                .get("pageProps", {})
-                .get("productData", {})
-            )
-            raw_description = product_info.get(
-                "longDescription"
-            ) or product_info.get("description")
-            description = (
-                clean_html(raw_description)
-                if isinstance(raw_description, str)
-                else None
+    if not next_data or not breadcrumb:
+        return None
+
+    return next_data.group(1), breadcrumb.group(0)
+
+
+def parse_product_detail_soup(
+    content: str,
+) -> tuple[str | None, str | None, str | None]:
+    """
+    Camino completo: parsea toda la página con BeautifulSoup.
+    """
+    soup = BeautifulSoup(content, "html.parser")
+
+    category, sub_category = get_breadcrumb_categories(soup)
+
+    next_data_script = soup.find("script", id="__NEXT_DATA__")
+    description = None
+    if next_data_script and next_data_script.string:
+        description = extract_description(next_data_script.string)
+
+    return category, sub_category, description
+
+
+def parse_product_detail(
+    sku: str, content: str
+) -> tuple[str | None, str | None, str | None]:
+    """
+    Extrae (categoría, subcategoría, descripción) del HTML de un producto.
+    Es compartido por el camino síncrono y el asíncrono.
+
+    Solo se parsea el fragmento de breadcrumbs; si la página no tiene la
+    estructura esperada se vuelve al parseo completo con BeautifulSoup.
+    """
+    fragments = find_detail_fragments(content)
+
+    if fragments is None:
+        logger.debug(f"Usando parseo completo del HTML para el sku {sku}")
+        category, sub_category, description = parse_product_detail_soup(content)
+    else:
+        next_data, breadcrumb_html = fragments
+        category, sub_category = get_breadcrumb_categories(
+            BeautifulSoup(breadcrumb_html, "html.parser")
+        )
+        description = extract_description(next_data) if next_data else None
+
+    if not description:
+        logger.warning(f"No se pudo extraer descripción del sku {sku}")
+
+    return category, sub_category, description
+
+
+class DetailTierStats:
+    """
+    Contadores del fetcher de detalle por nivel: la API JSON ("api") y el
+    HTML completo ("html"). Es seguro usarlo desde varios threads.
+    """
+
+    TIERS = ("api", "html")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = {tier: 0 for tier in self.TIERS}
+            self.hits = {tier: 0 for tier in self.TIERS}
+            self.bytes = {tier: 0 for tier in self.TIERS}
+
+    def record(self, tier: str, size: int, hit: bool) -> None:
+        with self._lock:
+            self.requests[tier] += 1
+            self.bytes[tier] += size
+            if hit:
+                self.hits[tier] += 1
+
+    def log_summary(self) -> None:
+        for tier in self.TIERS:
+            requests = self.requests[tier]
+            rate = self.hits[tier] / requests if requests else 0.0
+            logger.info(
+                f"Detalle vía {tier}: {self.hits[tier]}/{requests} completos "
+                f"({rate:.0%}), {self.bytes[tier] / 1024 / 1024:.1f} MB"
             )
 
-        if not description:
-            logger.warning(f"No se pudo extraer descripción del sku {sku}")
 
-        # Ahora retornamos 3 valores
-        return category, sub_category, description
+detail_stats = DetailTierStats()
+
+ProductDetail = tuple[str | None, str | None, str | None]
+
+
+def is_complete(detail: ProductDetail) -> bool:
+    """La API basta si trajo categoría y descripción."""
+    category, _, description = detail
+    return category is not None and description is not None
+
+
+def merge_details(
+    primary: ProductDetail, fallback: ProductDetail
+) -> ProductDetail:
+    """Completa los campos vacíos de `primary` con los de `fallback`."""
+    return (
+        primary[0] or fallback[0],
+        primary[1] or fallback[1],
+        primary[2] or fallback[2],
+    )
+
+
+def get_api_detail(product: ApiProductResponse | None) -> ProductDetail:
+    if product is None:
+        detail: ProductDetail = (None, None, None)
+        detail_stats.record("api", 0, hit=False)
+        return detail
+
+    detail = parse_api_product_detail(product["data"])
+    detail_stats.record("api", product["size"], hit=is_complete(detail))
+    return detail
+
+
+def get_html_detail(
+    sku: str, content: str | None, detail: ProductDetail | None = None
+) -> ProductDetail:
+    """
+    Parsea el HTML del producto y registra la estadística del nivel HTML.
+    Si el HTML ya se parseó en otro proceso se pasa el resultado en `detail`.
+    """
+    if content is None:
+        logger.warning(f"No se pudo extraer detalle del sku {sku}")
+        detail_stats.record("html", 0, hit=False)
+        return None, None, None
+
+    if detail is None:
+        detail = parse_product_detail(sku, content)
+    detail_stats.record(
+        "html", len(content.encode("utf-8")), hit=is_complete(detail)
+    )
+    return detail
+
+
+@dataclass
+class FetchedDetail:
+    """Resultado de la etapa de descarga del detalle de un producto."""
+
+    api_detail: ProductDetail
+    html: str | None = None
+    html_requested: bool = False  # False si la API bastó
+
+
+def fetch_product_detail(
+    sku: str, url: str, product_id: str | None = None
+) -> FetchedDetail:
+    """
+    Etapa de I/O del fetcher por niveles: consulta la API JSON si está
+    habilitada y hay product_id, y descarga el HTML solo si faltan campos,
+    sin parsearlo.
+    """
+    api_detail: ProductDetail = (None, None, None)
+    if product_id and settings.DETAIL_API_ENABLED:
+        api_detail = get_api_detail(fetch_api_product_data(product_id))
+        if is_complete(api_detail):
+            return FetchedDetail(api_detail)
+
+    html = fetch_html_product_extra_details(url)
+    return FetchedDetail(api_detail, html, html_requested=True)
+
+
+def complete_product_detail(
+    sku: str, fetched: FetchedDetail, html_detail: ProductDetail | None = None
+) -> ProductDetail:
+    """
+    Etapa de parseo: completa el detalle de la API con el del HTML
+    descargado. `html_detail` es el HTML ya parseado, si se hizo aparte.
+    """
+    if not fetched.html_requested:
+        return fetched.api_detail
+
+    return merge_details(
+        fetched.api_detail, get_html_detail(sku, fetched.html, html_detail)
+    )
+
+
+def get_product_detail(
+    sku: str, url: str, product_id: str | None = None
+) -> ProductDetail:
+    """
+    Fetcher de detalle por niveles: con DETAIL_API_ENABLED y product_id se
+    consulta primero la API JSON (liviana) y solo se descarga el HTML
+    completo si faltan campos; si no, se usa directamente el HTML.
+    """
+    try:
+        fetched = fetch_product_detail(sku, url, product_id)
+        return complete_product_detail(sku, fetched)
+
+    except Exception as e:
+        logger.error(f"Error en sku {sku}: {e}")
+        return None, None, None
+
+
+async def get_product_detail_async(
+    client: AsyncHttpClient, sku: str, url: str, product_id: str | None = None
+) -> ProductDetail:
+    """Versión asíncrona de get_product_detail."""
+    try:
+        api_detail: ProductDetail = (None, None, None)
+        if product_id and settings.DETAIL_API_ENABLED:
+            api_detail = get_api_detail(
+                await async_client.fetch_api_product_data(client, product_id)
+            )
+            if is_complete(api_detail):
+                return api_detail
+
+        content = await async_client.fetch_html_product_extra_details(
+            client, url
+        )
+        return merge_details(api_detail, get_html_detail(sku, content))
 
     except Exception as e:
         logger.error(f"Error en sku {sku}: {e}")
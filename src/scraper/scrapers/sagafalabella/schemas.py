@@ -1,4 +1,4 @@
-from typing import List, Literal, Optional, TypedDict
+from typing import Any, Dict, List, Literal, Optional, TypedDict
 
 import pyarrow as pa
 from pydantic import BaseModel
@@ -40,6 +40,7 @@ class ScrapedProduct(BaseModel):
     descripcion_promocion: Optional[str] = None
     descripcion_producto: Optional[str]
     peso_considerado: Optional[str]
+    peso_gramos: Optional[float] = None
     precio_sin_descuento: Optional[float]
     precio_publico: Optional[float]
     precio_cmr: Optional[float]
@@ -63,6 +64,7 @@ SCRAPED_PRODUCT_SCHEMA = pa.schema(
         ("descripcion_promocion", pa.string()),
         ("descripcion_producto", pa.string()),
         ("peso_considerado", pa.string()),
+        ("peso_gramos", pa.float64()),
         ("precio_sin_descuento", pa.float64()),
         ("precio_publico", pa.float64()),
         ("precio_cmr", pa.float64()),
@@ -79,3 +81,13 @@ class CategoryMetadata(TypedDict):
     animal: str
     category_label: str  # El nombre legible (ej: "Alimentos")
     category_url: str  # El slug para la URL (ej: "Alimento-para-perros")
+
+
+class ListingPage(TypedDict):
+    results: List[Dict[str, Any]]
+    total_pages: Optional[int]  # None si la API no entregó paginación
+
+
+class ApiProductResponse(TypedDict):
+    data: Dict[str, Any]  # bloque `data` de la API de producto
+    size: int  # bytes recibidos
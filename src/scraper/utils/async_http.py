@@ -0,0 +1,160 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Mapping, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from requests.structures import CaseInsensitiveDict
+
+from core.logging import get_logger
+from core.schemas import HttpClientConfig
+from scraper.utils.http import (
+    RETRY_STATUS_CODES,
+    default_http_config,
+    parse_retry_after,
+    retry_delay,
+)
+from scraper.utils.rate_limit import HostRateLimiter, get_rate_limiter
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class HttpResult:
+    """Respuesta ya leída de un request asíncrono."""
+
+    status_code: int
+    text: str
+    # Sin distinguir mayúsculas, como en requests (el servidor puede mandar
+    # "etag" o "Retry-After")
+    headers: CaseInsensitiveDict[str]
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class AsyncHttpClient:
+    """
+    Contraparte asíncrona de HttpClient basada en aiohttp.
+
+    Limita los requests en vuelo con un semáforo por host y reintenta con la
+    misma política (backoff exponencial con jitter, Retry-After) y el mismo
+    rate limiter adaptativo que el cliente síncrono. Debe usarse como context
+    manager dentro del event loop:
+
+        async with AsyncHttpClient() as client:
+            result = await client.get(url)
+    """
+
+    def __init__(
+        self,
+        config: Optional[HttpClientConfig] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+    ):
+        self.config = config or default_http_config()
+        self.rate_limiter: Optional[HostRateLimiter] = None
+        if self.config.rate_limit:
+            self.rate_limiter = rate_limiter or get_rate_limiter()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        connector = aiohttp.TCPConnector(
+            limit=0, limit_per_host=self.config.per_host_limit
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _semaphore_for(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.BoundedSemaphore(
+                self.config.per_host_limit
+            )
+        return self._semaphores[host]
+
+    async def get(
+        self, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> HttpResult:
+        """
+        Realiza un GET con reintentos y retorna la respuesta ya leída.
+        Relanza la última excepción de red si se agotan los reintentos.
+        """
+        if self._session is None:
+            raise RuntimeError("AsyncHttpClient debe usarse con 'async with'.")
+
+        semaphore = self._semaphore_for(url)
+        limiter = self.rate_limiter.for_url(url) if self.rate_limiter else None
+        attempt = 0
+
+        while True:
+            retry_after: Optional[float] = None
+            if limiter:
+                await limiter.acquire_async()
+
+            start = time.perf_counter()
+            try:
+                # El semáforo solo se mantiene durante el request, no durante
+                # la espera entre reintentos
+                async with semaphore:
+                    start = time.perf_counter()
+                    async with self._session.get(
+                        url, headers=headers
+                    ) as response:
+                        result = HttpResult(
+                            status_code=response.status,
+                            text=await response.text(),
+                            headers=CaseInsensitiveDict(response.headers),
+                        )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if limiter:
+                    limiter.record(None, time.perf_counter() - start)
+                if attempt >= self.config.max_retries:
+                    raise
+                logger.debug(f"Reintentando {url} tras error de red: {e!r}")
+            else:
+                retry_after = (
+                    parse_retry_after(result.headers.get("Retry-After"))
+                    if result.status_code in RETRY_STATUS_CODES
+                    else None
+                )
+                if limiter:
+                    limiter.record(
+                        result.status_code,
+                        time.perf_counter() - start,
+                        retry_after,
+                    )
+
+                if (
+                    result.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.config.max_retries
+                ):
+                    return result
+
+                logger.debug(
+                    f"Reintentando {url} tras status {result.status_code}"
+                )
+
+            await asyncio.sleep(
+                retry_delay(self.config, attempt, retry_after, url)
+            )
+            attempt += 1
@@ -0,0 +1,107 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SOURCE_KEY = "__source__"
+
+
+class JsonlCheckpoint:
+    """
+    Checkpoint incremental en formato JSON Lines.
+
+    Cada registro terminado se guarda como una línea {"key": ..., "value": ...}
+    y se escribe a disco cada `flush_every` registros o cada `flush_interval`
+    segundos, por lo que una caída solo pierde el último tramo sin escribir.
+    La primera línea identifica el origen de los datos (`source`); si al
+    cargar no coincide, el checkpoint se descarta.
+
+    Es seguro llamar a add() desde varios threads.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        source: str = "",
+        flush_every: int = 50,
+        flush_interval: float = 30,
+    ):
+        self.path = path
+        self.source = source
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._buffer: list[str] = []
+        self._last_flush = time.monotonic()
+
+    def load(self) -> dict[str, Any]:
+        """Retorna los registros ya guardados, indexados por key."""
+        if not self.path.exists():
+            return {}
+
+        records: dict[str, Any] = {}
+        with self.path.open("r", encoding="utf-8") as f:
+            header = f.readline()
+            try:
+                source = json.loads(header).get(SOURCE_KEY)
+            except (ValueError, AttributeError):
+                source = None
+
+            if source != self.source:
+                logger.warning(
+                    f"Checkpoint {self.path} corresponde a otro origen; "
+                    "se descarta"
+                )
+                records = {}
+            else:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        records[record["key"]] = record["value"]
+                    except (ValueError, KeyError, TypeError):
+                        # Una línea truncada por una caída a mitad de escritura
+                        continue
+
+        if source != self.source:
+            self.remove()
+
+        return records
+
+    def add(self, key: str, value: Any) -> None:
+        line = json.dumps({"key": key, "value": value}, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            due = (
+                len(self._buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+            if due:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        is_new = not self.path.exists()
+        with self.path.open("a", encoding="utf-8") as f:
+            if is_new:
+                f.write(json.dumps({SOURCE_KEY: self.source}) + "\n")
+            f.write("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+
+    def remove(self) -> None:
+        """Elimina el checkpoint (por ejemplo, al terminar con éxito)."""
+        with self._lock:
+            self._buffer.clear()
+            self.path.unlink(missing_ok=True)
@@ -0,0 +1,13 @@
+import pandas as pd
+
+
+def fingerprint_rows(data: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """
+    Hash (uint64) por fila de las columnas indicadas, estable entre
+    ejecuciones. Los nulos (None, NaN) se tratan igual sin importar el dtype
+    con que se leyó la columna (parquet, Postgres) y las columnas faltantes
+    cuentan como nulas.
+    """
+    values = data.reindex(columns=columns).astype(object)
+    values = values.where(values.notna(), None)
+    return pd.util.hash_pandas_object(values, index=False)
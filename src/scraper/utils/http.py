@@ -0,0 +1,199 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.logging import get_logger
+from core.schemas import HttpClientConfig
+from core.settings import settings
+from scraper.utils.rate_limit import HostRateLimiter, get_rate_limiter
+
+logger = get_logger(__name__)
+
+# Códigos que consideramos transitorios y que vale la pena reintentar
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def compute_backoff(attempt: int, factor: float, max_backoff: float) -> float:
+    """
+    Backoff exponencial con jitter completo: un valor aleatorio entre 0 y
+    factor * 2^attempt, acotado por max_backoff.
+    """
+    return random.uniform(0, min(max_backoff, factor * (2**attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Interpreta el header Retry-After (segundos o fecha HTTP).
+    Retorna los segundos a esperar o None si no se puede interpretar.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def retry_delay(
+    config: HttpClientConfig,
+    attempt: int,
+    retry_after: Optional[float],
+    url: str,
+) -> float:
+    """
+    Segundos a esperar antes del siguiente intento: el backoff con jitter,
+    pero nunca menos que el Retry-After del servidor. Retry-After solo se
+    acota con config.retry_after_max (no con backoff_max).
+    """
+    delay = compute_backoff(attempt, config.backoff_factor, config.backoff_max)
+    if retry_after is None:
+        return delay
+
+    if retry_after > config.retry_after_max:
+        logger.warning(
+            f"Retry-After de {retry_after:.0f}s para {url} excede el máximo; "
+            f"se esperan {config.retry_after_max:.0f}s"
+        )
+        return config.retry_after_max
+    return max(delay, retry_after)
+
+
+def default_http_config() -> HttpClientConfig:
+    """Construye la configuración HTTP a partir de core.settings."""
+    return HttpClientConfig(
+        timeout=settings.HTTP_TIMEOUT,
+        pool_size=settings.HTTP_POOL_SIZE,
+        max_retries=settings.HTTP_MAX_RETRIES,
+        backoff_factor=settings.HTTP_BACKOFF_FACTOR,
+        backoff_max=settings.HTTP_BACKOFF_MAX,
+        retry_after_max=settings.HTTP_RETRY_AFTER_MAX,
+        per_host_limit=settings.HTTP_PER_HOST_LIMIT,
+        rate_limit=settings.RATE_LIMIT_ENABLED,
+    )
+
+
+class HttpClient:
+    """
+    Cliente HTTP compartido basado en requests.Session.
+
+    Mantiene un pool de conexiones keep-alive (evita un handshake TCP+TLS por
+    request) y reintenta con backoff exponencial y jitter ante 429, 5xx,
+    timeouts y errores de conexión. Si config.rate_limit está activo, cada
+    intento pasa por el rate limiter adaptativo del host. Es seguro
+    compartirlo entre threads.
+    """
+
+    def __init__(
+        self,
+        config: Optional[HttpClientConfig] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+    ):
+        self.config = config or default_http_config()
+        self.rate_limiter: Optional[HostRateLimiter] = None
+        if self.config.rate_limit:
+            self.rate_limiter = rate_limiter or get_rate_limiter()
+
+        # Los reintentos se manejan en get() para poder aplicar jitter y
+        # respetar Retry-After, por eso el adapter no reintenta por su cuenta
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_size,
+            pool_maxsize=self.config.pool_size,
+            max_retries=0,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Realiza un GET con reintentos.
+
+        Retorna la última respuesta obtenida (que puede tener un status de
+        error si se agotaron los reintentos) o relanza la última excepción
+        de red.
+        """
+        kwargs.setdefault("timeout", self.config.timeout)
+        limiter = self.rate_limiter.for_url(url) if self.rate_limiter else None
+        attempt = 0
+
+        while True:
+            retry_after: Optional[float] = None
+            if limiter:
+                limiter.acquire()
+
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if limiter:
+                    limiter.record(None, time.perf_counter() - start)
+                if attempt >= self.config.max_retries:
+                    raise
+                logger.debug(f"Reintentando {url} tras error de red: {e}")
+            else:
+                retry_after = (
+                    parse_retry_after(response.headers.get("Retry-After"))
+                    if response.status_code in RETRY_STATUS_CODES
+                    else None
+                )
+                if limiter:
+                    limiter.record(
+                        response.status_code,
+                        time.perf_counter() - start,
+                        retry_after,
+                    )
+
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.config.max_retries
+                ):
+                    return response
+
+                logger.debug(
+                    f"Reintentando {url} tras status {response.status_code}"
+                )
+                response.close()
+
+            time.sleep(retry_delay(self.config, attempt, retry_after, url))
+            attempt += 1
+
+    def close(self) -> None:
+        """Cierra las conexiones del pool."""
+        self.session.close()
+
+
+_default_client: Optional[HttpClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Retorna el cliente HTTP compartido del proceso (se crea bajo demanda)."""
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def set_http_client(client: Optional[HttpClient]) -> None:
+    """Reemplaza el cliente compartido (por ejemplo, para ajustar el pool)."""
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is not None and _default_client is not client:
+            _default_client.close()
+        _default_client = client
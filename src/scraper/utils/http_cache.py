@@ -0,0 +1,229 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Mapping, Optional
+
+from requests.structures import CaseInsensitiveDict
+
+from core.logging import get_logger
+from core.settings import settings
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    size: int
+
+
+class HttpCache:
+    """
+    Cache HTTP persistente en SQLite, con TTL, validadores y desalojo LRU.
+
+    - Una entrada con menos de `ttl` segundos se sirve sin hacer request.
+    - Una entrada vencida se revalida con un GET condicional
+      (If-None-Match / If-Modified-Since); un 304 reutiliza el body guardado.
+    - Si el total supera `max_bytes` se eliminan las entradas usadas hace
+      más tiempo.
+
+    Es seguro compartirla entre threads del mismo proceso.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float,
+        max_bytes: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access "
+            "ON responses (last_access)"
+        )
+        self._conn.commit()
+        self._total_bytes: int = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @classmethod
+    def from_settings(cls) -> "HttpCache":
+        return cls(
+            path=settings.HTTP_CACHE_PATH,
+            ttl=settings.HTTP_CACHE_TTL,
+            max_bytes=settings.HTTP_CACHE_MAX_MB * 1024 * 1024,
+        )
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Retorna la entrada guardada para la URL (vigente o no)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, body, etag, last_modified, stored_at, size "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE url = ?",
+                (self._clock(), url),
+            )
+            self._conn.commit()
+            return CacheEntry(*row)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self._clock() - entry.stored_at < self.ttl
+
+    def use_fresh(self, entry: CacheEntry) -> str:
+        """Registra un hit sin request y retorna el body guardado."""
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += entry.size
+        return entry.body
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> dict[str, str]:
+        """Headers para revalidar una entrada vencida."""
+        headers: dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def handle_response(
+        self,
+        url: str,
+        entry: Optional[CacheEntry],
+        status_code: int,
+        body: str,
+        headers: Mapping[str, str],
+    ) -> Optional[str]:
+        """
+        Procesa la respuesta de un GET (condicional o no) y retorna el body
+        a usar: el guardado si fue 304, el nuevo si fue 200, o None.
+        """
+        if status_code == 304 and entry is not None:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE responses SET stored_at = ? WHERE url = ?",
+                    (self._clock(), url),
+                )
+                self._conn.commit()
+                self.revalidated += 1
+                self.bytes_saved += entry.size
+            return entry.body
+
+        if status_code != 200:
+            return None
+
+        # Los nombres de header no distinguen mayúsculas ("Etag", "etag")
+        headers = CaseInsensitiveDict(headers)
+        self.store(url, body, headers.get("ETag"), headers.get("Last-Modified"))
+        with self._lock:
+            self.misses += 1
+        return body
+
+    def store(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        size = len(body.encode("utf-8"))
+        now = self._clock()
+
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, body, etag, last_modified, stored_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now, size),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # Se llama con el lock tomado
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT url, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        to_delete: list[tuple[str]] = []
+
+        for url, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            to_delete.append((url,))
+            self._total_bytes -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", to_delete)
+
+    def log_summary(self) -> None:
+        total = self.hits + self.revalidated + self.misses
+        logger.info(
+            f"Cache HTTP: {self.hits} hits, {self.revalidated} revalidados "
+            f"(304), {self.misses} misses de {total} requests; "
+            f"{self.bytes_saved / 1024 / 1024:.1f} MB ahorrados"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[HttpCache] = None
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """
+    Retorna la cache HTTP por defecto del proceso, o None si no se activó.
+    Los jobs la activan con set_http_cache().
+    """
+    return _default_cache
+
+
+def set_http_cache(cache: Optional[HttpCache]) -> None:
+    global _default_cache
+    _default_cache = cache
@@ -0,0 +1,77 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, Future
+from itertools import islice
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+)
+
+
+def iter_ordered_results[T](
+    executor: Executor,
+    calls: Iterable[Callable[[], T]],
+    window: int,
+) -> Iterator[T]:
+    """
+    Ejecuta `calls` en el executor y entrega los resultados en el orden de
+    `calls`, con a lo sumo `window` llamadas en vuelo o terminadas en cola
+    (además del resultado que se está entregando). `calls` se recorre de a
+    una a medida que se libera lugar, por lo que puede ser un generador que
+    dependa de resultados anteriores.
+    """
+    calls = iter(calls)
+    queue: deque[Future[T]] = deque(
+        executor.submit(call) for call in islice(calls, max(1, window))
+    )
+    while queue:
+        future = queue.popleft()
+        for call in islice(calls, 1):
+            queue.append(executor.submit(call))
+        yield future.result()
+
+
+async def aiter_ordered_results[T](
+    calls: Iterable[Callable[[], Awaitable[T]]]
+    | AsyncIterable[Callable[[], Awaitable[T]]],
+    window: int,
+) -> AsyncIterator[T]:
+    """
+    Versión asíncrona de iter_ordered_results(): cada llamada retorna un
+    awaitable que se programa como task del event loop actual. Las tasks
+    pendientes se cancelan si el consumidor se detiene antes.
+    """
+    pending_calls = _as_async_iterator(calls)
+    queue: deque[asyncio.Future[T]] = deque()
+
+    async def submit_next() -> None:
+        call = await anext(pending_calls, None)
+        if call is not None:
+            queue.append(asyncio.ensure_future(call()))
+
+    try:
+        for _ in range(max(1, window)):
+            await submit_next()
+
+        while queue:
+            task = queue.popleft()
+            await submit_next()
+            yield await task
+    finally:
+        for task in queue:
+            task.cancel()
+
+
+async def _as_async_iterator[T](
+    items: Iterable[T] | AsyncIterable[T],
+) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
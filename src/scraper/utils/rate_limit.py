@@ -0,0 +1,210 @@
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from core.logging import get_logger
+from core.schemas import RateLimiterConfig
+from core.settings import settings
+
+logger = get_logger(__name__)
+
+# Status que indican que el servidor nos está frenando
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+
+def default_rate_limiter_config() -> RateLimiterConfig:
+    """Construye la configuración del rate limiter a partir de core.settings."""
+    return RateLimiterConfig(
+        initial_rate=settings.RATE_LIMIT_INITIAL,
+        min_rate=settings.RATE_LIMIT_MIN,
+        max_rate=settings.RATE_LIMIT_MAX,
+        increase_step=settings.RATE_LIMIT_INCREASE_STEP,
+        decrease_factor=settings.RATE_LIMIT_DECREASE_FACTOR,
+        latency_factor=settings.RATE_LIMIT_LATENCY_FACTOR,
+        latency_window=settings.RATE_LIMIT_LATENCY_WINDOW,
+    )
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket para un host cuya tasa se ajusta con AIMD.
+
+    - Incremento aditivo: cada respuesta rápida suma increase_step / rate,
+      es decir, la tasa sube ~increase_step req/s por segundo.
+    - Decremento multiplicativo: ante 429/503, errores de red o un p95 de
+      latencia mayor a latency_factor veces el mejor p95 observado.
+    - Retry-After bloquea el host hasta la fecha indicada.
+
+    Los métodos solo toman el lock un instante, por lo que sirve tanto para
+    threads (acquire) como para el event loop (acquire_async).
+    """
+
+    def __init__(
+        self,
+        config: Optional[RateLimiterConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config = config or default_rate_limiter_config()
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.rate = self.config.initial_rate
+        self._tokens = 1.0
+        self._last_refill = clock()
+        self._blocked_until = 0.0
+        self._last_decrease = float("-inf")
+
+        self._latencies: deque[float] = deque(
+            maxlen=self.config.latency_window
+        )
+        self._baseline_p95: Optional[float] = None
+
+        self.requests = 0
+        self.throttled = 0
+        self._first_request: Optional[float] = None
+        self._last_request: Optional[float] = None
+
+    def reserve(self) -> float:
+        """
+        Reserva un token y retorna los segundos que hay que esperar antes de
+        hacer el request (0 si se puede hacer de inmediato).
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                1.0, self._tokens + (now - self._last_refill) * self.rate
+            )
+            self._last_refill = now
+
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+            wait = max(wait, self._blocked_until - now)
+
+            self.requests += 1
+            if self._first_request is None:
+                self._first_request = now + wait
+            self._last_request = now + wait
+            return wait
+
+    def acquire(self) -> None:
+        """Bloquea el thread actual hasta que haya un token disponible."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Espera (sin bloquear el event loop) hasta que haya un token."""
+        import asyncio
+
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(
+        self,
+        status_code: Optional[int],
+        latency: float,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """
+        Registra el resultado de un request. status_code None indica un error
+        de red o timeout.
+        """
+        with self._lock:
+            now = self._clock()
+
+            if retry_after is not None:
+                self._blocked_until = max(
+                    self._blocked_until, now + retry_after
+                )
+
+            if status_code is None or status_code in THROTTLE_STATUS_CODES:
+                self.throttled += 1
+                self._decrease(now)
+                return
+
+            self._latencies.append(latency)
+            if len(self._latencies) == self._latencies.maxlen:
+                p95 = statistics.quantiles(self._latencies, n=20)[-1]
+                if self._baseline_p95 is None or p95 < self._baseline_p95:
+                    self._baseline_p95 = p95
+                elif p95 > self._baseline_p95 * self.config.latency_factor:
+                    self._decrease(now)
+                    return
+
+            self.rate = min(
+                self.config.max_rate,
+                self.rate + self.config.increase_step / self.rate,
+            )
+
+    def _decrease(self, now: float) -> None:
+        # Una ráfaga de 429 de requests que ya estaban en vuelo cuenta como
+        # una sola señal de congestión
+        if now - self._last_decrease < 1.0:
+            return
+
+        self._last_decrease = now
+        self.rate = max(
+            self.config.min_rate, self.rate * self.config.decrease_factor
+        )
+        # Las latencias previas ya no representan la nueva tasa
+        self._latencies.clear()
+
+    @property
+    def effective_rate(self) -> float:
+        """Requests por segundo efectivamente emitidos desde el primero."""
+        if (
+            self._first_request is None
+            or self._last_request is None
+            or self._last_request <= self._first_request
+        ):
+            return 0.0
+        return (self.requests - 1) / (self._last_request - self._first_request)
+
+
+class HostRateLimiter:
+    """Registro de AdaptiveRateLimiter, uno por host."""
+
+    def __init__(self, config: Optional[RateLimiterConfig] = None):
+        self.config = config or default_rate_limiter_config()
+        self._limiters: dict[str, AdaptiveRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> AdaptiveRateLimiter:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = AdaptiveRateLimiter(self.config)
+            return self._limiters[host]
+
+    def log_summary(self) -> None:
+        """Reporta la tasa en la que se estabilizó cada host."""
+        with self._lock:
+            limiters = list(self._limiters.items())
+
+        for host, limiter in limiters:
+            logger.info(
+                f"Rate limiter {host}: tasa final {limiter.rate:.2f} req/s, "
+                f"efectiva {limiter.effective_rate:.2f} req/s, "
+                f"{limiter.requests} requests, {limiter.throttled} frenados"
+            )
+
+
+_default_limiter: Optional[HostRateLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """
+    Retorna el rate limiter compartido del proceso, usado por defecto por los
+    clientes HTTP síncrono y asíncrono.
+    """
+    global _default_limiter
+
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = HostRateLimiter()
+        return _default_limiter
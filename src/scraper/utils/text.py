@@ -1,32 +1,55 @@
+import hashlib
 import html
 import re
+import threading
+from collections import OrderedDict
 
+import pandas as pd
 from bs4 import BeautifulSoup
 
+SPACES_PATTERN = re.compile(r"[ \t]+")
+NEWLINES_PATTERN = re.compile(r"\n{2,}")
 
-def clean_html(texto: str) -> str | None:
+# Tags cuyo contenido no es texto legible
+DISCARDED_TAGS = ["script", "style", "noscript"]
+
+# Descripciones limpias recordadas, indexadas por hash del contenido (muchas
+# variantes de un mismo producto comparten la misma descripción larga)
+CLEAN_HTML_CACHE_SIZE = 4096
+_clean_html_cache: OrderedDict[bytes, str | None] = OrderedDict()
+_clean_html_lock = threading.Lock()
+
+
+def extract_text(texto: str) -> str:
     """
-    Limpia HTML (normal o escapado) y devuelve solo texto legible.
+    Desescapa el HTML y retorna su texto con un salto de línea entre
+    elementos. Si no hay tags ni entidades no hace falta parsearlo.
     """
-
     # Desescapar HTML (&lt;div&gt; -> <div>)
     texto = html.unescape(texto)
 
+    # Sin "<" ni "&" BeautifulSoup entregaría el mismo texto
+    if "<" not in texto and "&" not in texto:
+        return texto.strip()
+
     # Parsear HTML
     soup = BeautifulSoup(texto, "html.parser")
 
     # Eliminar tags basura
-    for tag in soup(["script", "style", "noscript"]):
+    for tag in soup(DISCARDED_TAGS):
         tag.decompose()
 
     # Obtener texto con saltos lógicos
-    texto_limpio = soup.get_text(separator="\n", strip=True)
+    return soup.get_text(separator="\n", strip=True)
+
 
+def normalize_text(texto_limpio: str) -> str | None:
+    """Deja el texto en una sola línea con espacios simples."""
     # Normalizar espacios
-    texto_limpio = re.sub(r"[ \t]+", " ", texto_limpio)
+    texto_limpio = SPACES_PATTERN.sub(" ", texto_limpio)
 
     # Limpiar saltos de línea múltiples
-    texto_limpio = re.sub(r"\n{2,}", "\n", texto_limpio)
+    texto_limpio = NEWLINES_PATTERN.sub("\n", texto_limpio)
 
     # Quitar líneas vacías
     texto_limpio = " ".join(
@@ -36,13 +59,41 @@ def clean_html(texto: str) -> str | None:
     return texto_limpio or None
 
 
+def clean_html(texto: str) -> str | None:
+    """
+    Limpia HTML (normal o escapado) y devuelve solo texto legible.
+    Los resultados se recuerdan por hash del contenido (LRU acotada).
+    """
+    key = hashlib.blake2b(texto.encode("utf-8"), digest_size=16).digest()
+
+    with _clean_html_lock:
+        if key in _clean_html_cache:
+            _clean_html_cache.move_to_end(key)
+            return _clean_html_cache[key]
+
+    result = normalize_text(extract_text(texto))
+
+    with _clean_html_lock:
+        _clean_html_cache[key] = result
+        if len(_clean_html_cache) > CLEAN_HTML_CACHE_SIZE:
+            _clean_html_cache.popitem(last=False)
+
+    return result
+
+
+WEIGHT_PATTERN = re.compile(
+    r"(\d+(?:[\.,]\d+)?)\s*(kg|g|gr)", flags=re.IGNORECASE
+)
+
+# Factor a gramos de cada unidad normalizada
+GRAMS_PER_UNIT = {"kg": 1000.0, "g": 1.0}
+
+
 def get_weight_from_text(name: str) -> str | None:
     """
     Extrae valores como '7kg', '7 Kg', '7gr', '7 g' y devuelve '7 kg', '7 gr', etc.
     """
-    patron = re.compile(r"(\d+(?:[\.,]\d+)?)\s*(kg|g|gr)", flags=re.IGNORECASE)
-
-    m = patron.search(name)
+    m = WEIGHT_PATTERN.search(name)
     if not m:
         return None
 
@@ -54,3 +105,32 @@ def get_weight_from_text(name: str) -> str | None:
         unidad = "g"
 
     return f"{valor} {unidad}"
+
+
+def weight_to_grams(peso: str | None) -> float | None:
+    """Convierte un peso normalizado ('7.5 kg', '500 g') a gramos."""
+    if peso is None:
+        return None
+
+    valor, unidad = peso.split(" ")
+    return float(valor) * GRAMS_PER_UNIT[unidad]
+
+
+def get_weight_columns(names: pd.Series) -> pd.DataFrame:
+    """
+    Versión por columna de get_weight_from_text(): extrae el peso de todos
+    los nombres en una pasada y retorna dos columnas, `peso_considerado`
+    ('7.5 kg', o None) y `peso_gramos` (7500.0, o NaN).
+    """
+    parts = names.str.extract(WEIGHT_PATTERN)
+    valor = parts[0].str.replace(",", ".", regex=False)
+    unidad = parts[1].str.lower().replace("gr", "g")
+
+    peso = (valor + " " + unidad).astype(object)
+    return pd.DataFrame(
+        {
+            "peso_considerado": peso.where(peso.notna(), None),
+            "peso_gramos": pd.to_numeric(valor) * unidad.map(GRAMS_PER_UNIT),
+        },
+        index=names.index,
+    )
@@ -1,19 +1,25 @@
+import contextlib
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 
 import pandas as pd
 import pyarrow as pa
+import pyarrow.dataset as ds
 import pyarrow.fs as fs
 import pyarrow.parquet as pq
 from typing_extensions import Literal
 
 from core.logging import get_logger
 from core.schemas import HDFSConfig
+from core.settings import settings
 
 logger = get_logger(__name__)
 
 type Storage = Literal["local", "hdfs"]
+type ExistingDataBehavior = Literal[
+    "delete_matching", "overwrite_or_ignore", "error"
+]
 
 
 class DataLakeManager:
@@ -91,6 +97,143 @@ class DataLakeManager:
 
         logger.info(f"Archivo guardado exitosamente en: {path}")
 
+    def write_batches(
+        self,
+        path: Union[str, Path],
+        batches: Iterable[pa.RecordBatch],
+        schema: pa.Schema,
+        max_rows_per_group: Optional[int] = None,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Escribe un Parquet a partir de un iterable de record batches, sin
+        tener todo el dataset en memoria. Retorna la cantidad de filas.
+
+        Los batches se juntan en row groups de `max_rows_per_group` filas
+        (por defecto settings.DATASET_MAX_ROWS_PER_GROUP; el último puede
+        ser menor), así batches chicos no generan un row group cada uno y en
+        memoria queda a lo sumo un row group.
+
+        Se escribe primero a `<path>.partial` y se mueve al final, por lo que
+        una interrupción no deja un Parquet truncado en `path`. Si no hubo
+        filas no se crea ningún archivo.
+        """
+        path_as_str = str(path)
+        partial_path = f"{path_as_str}.partial"
+        group_size = max_rows_per_group or settings.DATASET_MAX_ROWS_PER_GROUP
+        rows = 0
+
+        try:
+            with self.filesystem.open_output_stream(partial_path) as stream:
+                with pq.ParquetWriter(stream, schema, **kwargs) as writer:
+                    pending: List[pa.RecordBatch] = []
+                    pending_rows = 0
+                    for batch in batches:
+                        pending.append(batch)
+                        pending_rows += batch.num_rows
+                        rows += batch.num_rows
+                        if pending_rows < group_size:
+                            continue
+
+                        # Se escriben los row groups completos y el resto
+                        # queda pendiente para el siguiente
+                        table = pa.Table.from_batches(pending, schema=schema)
+                        full = pending_rows - pending_rows % group_size
+                        writer.write_table(
+                            table.slice(0, full), row_group_size=group_size
+                        )
+                        pending = table.slice(full).to_batches()
+                        pending_rows -= full
+
+                    if pending_rows:
+                        writer.write_table(
+                            pa.Table.from_batches(pending, schema=schema),
+                            row_group_size=group_size,
+                        )
+        except BaseException:
+            # El .partial puede no existir (ej. falló al abrirlo); ese error
+            # no debe ocultar el original
+            with contextlib.suppress(OSError):
+                self.filesystem.delete_file(partial_path)
+            raise
+
+        if rows == 0:
+            self.filesystem.delete_file(partial_path)
+            return 0
+
+        self.filesystem.move(partial_path, path_as_str)
+        logger.info(f"Archivo guardado exitosamente en: {path} ({rows} filas)")
+        return rows
+
+    def write_dataset(
+        self,
+        base_dir: Union[str, Path],
+        data: Union[pd.DataFrame, pa.Table, Iterable[pa.RecordBatch]],
+        partition_cols: Sequence[str],
+        schema: Optional[pa.Schema] = None,
+        max_rows_per_file: Optional[int] = None,
+        max_rows_per_group: Optional[int] = None,
+        existing_data_behavior: ExistingDataBehavior = "delete_matching",
+    ) -> List[str]:
+        """
+        Escribe un dataset Parquet particionado al estilo Hive
+        (`base_dir/col=valor/.../part-N.parquet`) con pyarrow.dataset, en el
+        sistema de archivos local o HDFS. Retorna las rutas escritas.
+
+        :param data: DataFrame, tabla de Arrow o iterable de record batches
+            (en ese caso `schema` es obligatorio).
+        :param partition_cols: Columnas de partición, en orden de carpetas
+            (ej. ['fecha_extraccion', 'categoria_animal']).
+        :param max_rows_per_file: Filas máximas por archivo (por defecto
+            settings.DATASET_MAX_ROWS_PER_FILE).
+        :param max_rows_per_group: Filas máximas por row group (por defecto
+            settings.DATASET_MAX_ROWS_PER_GROUP).
+        :param existing_data_behavior: 'delete_matching' reemplaza las
+            particiones que se escriben (re-ejecutar un día no duplica) y
+            deja las demás; 'overwrite_or_ignore' y 'error' como en pyarrow.
+        """
+        if isinstance(data, pd.DataFrame):
+            data = pa.Table.from_pandas(data, preserve_index=False)
+        if isinstance(data, pa.Table):
+            schema = schema or data.schema
+        elif schema is None:
+            raise ValueError(
+                "Se requiere 'schema' para escribir record batches."
+            )
+
+        max_rows_per_file = (
+            max_rows_per_file or settings.DATASET_MAX_ROWS_PER_FILE
+        )
+        max_rows_per_group = min(
+            max_rows_per_group or settings.DATASET_MAX_ROWS_PER_GROUP,
+            max_rows_per_file,
+        )
+        written: List[str] = []
+
+        ds.write_dataset(
+            data,
+            str(base_dir),
+            schema=schema,
+            format="parquet",
+            partitioning=ds.partitioning(
+                pa.schema([schema.field(c) for c in partition_cols]),
+                flavor="hive",
+            ),
+            filesystem=self.filesystem,
+            max_rows_per_file=max_rows_per_file,
+            max_rows_per_group=max_rows_per_group,
+            # Junta batches chicos en vez de escribir un row group por batch
+            min_rows_per_group=max_rows_per_group,
+            existing_data_behavior=existing_data_behavior,
+            file_visitor=lambda file: written.append(file.path),
+        )
+
+        logger.info(
+            f"Dataset guardado exitosamente en: {base_dir} "
+            f"({len(written)} archivos)"
+        )
+        return written
+
     def read_data(
         self, path: Union[str, Path], fmt: str = "json"
     ) -> Union[Dict[str, Any], List[Any], pd.DataFrame]:
@@ -1,14 +1,378 @@
-from typing import Any, Dict, List, Literal, Optional
+import csv
+import io
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import pandas as pd
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+import pyarrow as pa
+from pandas.io.sql import get_schema
+from sqlalchemy import bindparam, create_engine, inspect, text
+from sqlalchemy.engine import Connection, Engine, Row
 
 from core.logging import get_logger
 from core.schemas import PostgresConfig
+from core.settings import settings
 
 logger = get_logger(__name__)
 
+type LoadMethod = Literal["insert", "copy", "parallel"]
+type PartitionInterval = Literal["day", "month"]
+
+COPY_CHUNKSIZE = 50000
+# Filas por bloque al leer con cursor del lado del servidor
+QUERY_CHUNKSIZE = 10000
+
+
+def default_postgres_config() -> PostgresConfig:
+    """Construye la configuración de Postgres a partir de core.settings."""
+    return PostgresConfig(
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        database=settings.DB_NAME,
+    )
+
+
+# Engines compartidos por todo el proceso (ver get_engine())
+_ENGINES: Dict[tuple[Any, ...], Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(
+    connection_string: str,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+) -> Engine:
+    """
+    Devuelve el engine del proceso para esa conexión y tamaño de pool,
+    creándolo la primera vez, para que varios PostgresManager (de distintos
+    jobs o hilos) compartan las conexiones ya abiertas del pool.
+
+    Tamaño, overflow, reciclado y pre-ping salen de core.settings
+    (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_PRE_PING).
+    """
+    key = (
+        connection_string,
+        pool_size or settings.DB_POOL_SIZE,
+        settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+        settings.DB_POOL_RECYCLE,
+        settings.DB_POOL_PRE_PING,
+    )
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            _, pool_size, max_overflow, pool_recycle, pool_pre_ping = key
+            # echo=False evita que se impriman todos los logs de SQL
+            engine = create_engine(
+                connection_string,
+                echo=False,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+            )
+            _ENGINES[key] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """Cierra las conexiones de todos los engines y vacía el registro."""
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+
+def iter_csv_chunks(
+    data: Union[pd.DataFrame, pa.Table], chunksize: int = COPY_CHUNKSIZE
+) -> Iterator[bytes]:
+    """
+    Genera el contenido CSV (sin encabezado) de a `chunksize` filas, para no
+    tener todo el texto en memoria a la vez.
+
+    Todo valor va entre comillas y los nulos como campo vacío sin comillas,
+    que es el NULL de COPY en formato CSV: así ningún texto (ni "" ni "\\N")
+    se confunde con NULL.
+    """
+    if isinstance(data, pa.Table):
+        chunks: Iterable[pd.DataFrame] = (
+            batch.to_pandas() for batch in data.to_batches(chunksize)
+        )
+    else:
+        chunks = (
+            data.iloc[start : start + chunksize]
+            for start in range(0, len(data), chunksize)
+        )
+
+    for chunk in chunks:
+        buffer = io.StringIO()
+        writer = csv.writer(
+            buffer, quoting=csv.QUOTE_NOTNULL, lineterminator="\n"
+        )
+        values = chunk.astype(object)
+        writer.writerows(
+            values.where(values.notna(), None).itertuples(
+                index=False, name=None
+            )
+        )
+        yield buffer.getvalue().encode("utf-8")
+
+
+class IterStream(io.RawIOBase):
+    """Archivo de solo lectura sobre un iterable de bytes (para COPY)."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        view = memoryview(b).cast("B")
+        written = 0
+
+        while written < len(view):
+            if self._offset == len(self._buffer):
+                try:
+                    self._buffer = next(self._chunks)
+                    self._offset = 0
+                except StopIteration:
+                    break
+                continue
+
+            size = min(len(view) - written, len(self._buffer) - self._offset)
+            view[written : written + size] = self._buffer[
+                self._offset : self._offset + size
+            ]
+            self._offset += size
+            written += size
+
+        return written
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def qualified_name(table_name: str, schema: Optional[str]) -> str:
+    if schema:
+        return f"{quote_identifier(schema)}.{quote_identifier(table_name)}"
+    return quote_identifier(table_name)
+
+
+def index_name(table_name: str, columns: List[str], suffix: str = "key") -> str:
+    # Postgres trunca los identificadores a 63 bytes
+    return f"{table_name}_{'_'.join(columns)}_{suffix}"[:63]
+
+
+# Límite superior de una partición por rango, según pg_get_expr()
+PARTITION_UPPER_BOUND_PATTERN = re.compile(r"TO \('(\d{4}-\d{2}-\d{2})")
+
+
+def partition_bounds(
+    day: date, interval: PartitionInterval = "month"
+) -> tuple[date, date]:
+    """Rango [inicio, fin) de la partición diaria o mensual de `day`."""
+    if interval == "day":
+        return day, day + timedelta(days=1)
+    start = day.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def partition_ranges(
+    days: Iterable[date], interval: PartitionInterval = "month"
+) -> List[tuple[date, date]]:
+    """
+    Rangos de las particiones que cubren `days`, más la del período
+    siguiente a cada una (para que la próxima carga ya la encuentre creada).
+    """
+    bounds = set()
+    for day in days:
+        start, end = partition_bounds(day, interval)
+        bounds.add((start, end))
+        bounds.add(partition_bounds(end, interval))
+    return sorted(bounds)
+
+
+def partition_name(
+    table_name: str, start: date, interval: PartitionInterval = "month"
+) -> str:
+    """Nombre de la partición que empieza en `start` (ej. tabla_p202401)."""
+    suffix = f"{start:%Y%m%d}" if interval == "day" else f"{start:%Y%m}"
+    return f"{table_name}_p{suffix}"
+
+
+def partition_upper_bound(bound_expression: str) -> Optional[date]:
+    """
+    Fecha de fin de una partición a partir de su definición (ej. "FOR
+    VALUES FROM ('2024-01-01') TO ('2024-02-01')"); None si no es un rango
+    de fechas (ej. la partición DEFAULT).
+    """
+    match = PARTITION_UPPER_BOUND_PATTERN.search(bound_expression)
+    return date.fromisoformat(match.group(1)) if match else None
+
+
+def column_names(data: Union[pd.DataFrame, pa.Table]) -> List[str]:
+    if isinstance(data, pa.Table):
+        return list(data.column_names)
+    return [str(c) for c in data.columns]
+
+
+def empty_frame(data: Union[pd.DataFrame, pa.Table]) -> pd.DataFrame:
+    """DataFrame sin filas con las columnas y tipos de `data` (para DDL)."""
+    if isinstance(data, pa.Table):
+        return data.schema.empty_table().to_pandas()
+    return data.head(0)
+
+
+def copy_into(
+    connection: Connection,
+    data: Union[pd.DataFrame, pa.Table],
+    qualified: str,
+    chunksize: int = COPY_CHUNKSIZE,
+) -> None:
+    """Envía `data` con COPY FROM STDIN a una tabla existente."""
+    columns = ", ".join(map(quote_identifier, column_names(data)))
+    copy_sql = f"COPY {qualified} ({columns}) FROM STDIN WITH (FORMAT csv)"
+
+    cursor = connection.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+    try:
+        cursor.copy_expert(
+            copy_sql, IterStream(iter_csv_chunks(data, chunksize))
+        )
+    finally:
+        cursor.close()
+
+
+def staging_table_name(table_name: str) -> str:
+    """Nombre único para una tabla de staging de `table_name`."""
+    return f"{table_name}_staging_{uuid.uuid4().hex[:8]}"
+
+
+def split_row_ranges(rows: int, parts: int) -> List[tuple[int, int]]:
+    """
+    Divide `rows` filas en hasta `parts` rangos contiguos [inicio, fin) de
+    tamaño parecido (los primeros llevan una fila más si no es exacto).
+    """
+    parts = max(1, min(parts, rows))
+    size, extra = divmod(rows, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def slice_rows(
+    data: Union[pd.DataFrame, pa.Table], start: int, stop: int
+) -> Union[pd.DataFrame, pa.Table]:
+    """Filas [start, stop) de un DataFrame o tabla de Arrow, sin copiarlas."""
+    if isinstance(data, pa.Table):
+        return data.slice(start, stop - start)
+    return data.iloc[start:stop]
+
+
+def add_missing_columns(
+    connection: Connection,
+    table_name: str,
+    schema: Optional[str],
+    template: str,
+    columns: List[str],
+) -> None:
+    """
+    Agrega a la tabla las columnas de `columns` que no tenga, con el mismo
+    tipo que tienen en la tabla `template` (ya calificada).
+    """
+    existing = {
+        c["name"]
+        for c in inspect(connection).get_columns(table_name, schema=schema)
+    }
+    for column in columns:
+        if column in existing:
+            continue
+
+        column_type = connection.execute(
+            text(
+                "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+                "WHERE attrelid = CAST(:table AS regclass) "
+                "AND attname = :column"
+            ),
+            {"table": template, "column": column},
+        ).scalar_one()
+        connection.execute(
+            text(
+                f"ALTER TABLE {qualified_name(table_name, schema)} "
+                f"ADD COLUMN IF NOT EXISTS {quote_identifier(column)} "
+                f"{column_type}"
+            )
+        )
+        logger.info(f"Columna {column} ({column_type}) agregada a {table_name}")
+
+
+def drop_duplicate_keys(
+    data: Union[pd.DataFrame, pa.Table], columns: List[str]
+) -> Union[pd.DataFrame, pa.Table]:
+    """Deja la última fila de cada clave `columns`, en el orden de `data`."""
+    if isinstance(data, pd.DataFrame):
+        return data.drop_duplicates(subset=columns, keep="last")
+
+    row = "__fila"
+    last_rows = (
+        data.select(columns)
+        .append_column(row, pa.array(range(data.num_rows), pa.int64()))
+        .group_by(columns, use_threads=False)
+        .aggregate([(row, "max")])
+        .column(f"{row}_max")
+        .sort()
+    )
+    return data.take(last_rows)
+
+
+def build_upsert_sql(
+    target: str, staging: str, columns: List[str], conflict_columns: List[str]
+) -> str:
+    """
+    INSERT ... ON CONFLICT desde el staging. DISTINCT ON evita que dos filas
+    del staging con la misma clave hagan fallar el comando; entre ellas gana
+    la última cargada (mayor ctid: COPY escribe las filas en orden).
+    """
+    quoted = ", ".join(map(quote_identifier, columns))
+    keys = ", ".join(map(quote_identifier, conflict_columns))
+    updates = [
+        f"{quote_identifier(c)} = EXCLUDED.{quote_identifier(c)}"
+        for c in columns
+        if c not in conflict_columns
+    ]
+    on_conflict = (
+        f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+    )
+    return (
+        f"INSERT INTO {target} ({quoted}) "
+        f"SELECT DISTINCT ON ({keys}) {quoted} FROM {staging} "
+        f"ORDER BY {keys}, ctid DESC "
+        f"ON CONFLICT ({keys}) {on_conflict}"
+    )
+
 
 class PostgresManager:
     """
@@ -18,29 +382,52 @@ class PostgresManager:
     procesamiento de scraping o HDFS.
     """
 
-    def __init__(self, config: PostgresConfig):
+    def __init__(
+        self,
+        config: PostgresConfig,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        load_workers: Optional[int] = None,
+    ):
         """
-        Inicializa el motor de base de datos.
+        Inicializa el motor de base de datos, reutilizando el engine (y su
+        pool de conexiones) de otros managers con la misma configuración.
 
         Args:
             config (PostgresConfig): Diccionario con las credenciales:
                                      host, port, user, password, database.
+            pool_size (int, optional): Conexiones que el pool mantiene
+                abiertas (por defecto settings.DB_POOL_SIZE).
+            max_overflow (int, optional): Conexiones extra que el pool puede
+                abrir temporalmente (por defecto settings.DB_MAX_OVERFLOW).
+            load_workers (int, optional): Hilos de parallel_load() (por
+                defecto settings.DB_LOAD_WORKERS).
         """
         self.connection_string = (
             f"postgresql://{config.user}:{config.password}@"
             f"{config.host}:{config.port}/{config.database}"
         )
-        # echo=False evita que se impriman todos los logs de SQL en consola
-        self.engine: Engine = create_engine(self.connection_string, echo=False)
+        self.pool_size = pool_size or settings.DB_POOL_SIZE
+        self.max_overflow = (
+            settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow
+        )
+        self.load_workers = load_workers or settings.DB_LOAD_WORKERS
+        # Engine compartido con los demás managers de la misma base
+        self.engine: Engine = get_engine(
+            self.connection_string, self.pool_size, self.max_overflow
+        )
 
     def save_dataframe(
         self,
         df: pd.DataFrame,
         table_name: str,
         if_exists: Literal[
-            "fail", "replace", "append", "delete_rows"
+            "fail", "replace", "append", "delete_rows", "upsert"
         ] = "append",
         schema: Optional[str] = "public",
+        method: LoadMethod = "insert",
+        conflict_columns: Optional[List[str]] = None,
+        dtype: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Guarda un DataFrame de Pandas en una tabla de PostgreSQL.
@@ -48,24 +435,63 @@ class PostgresManager:
         Args:
             df (pd.DataFrame): Datos procesados a guardar.
             table_name (str): Nombre de la tabla de destino.
-            if_exists ("fail", "replace", "append", "delete_rows"):
+            if_exists ("fail", "replace", "append", "delete_rows", "upsert"):
                 Qué hacer si la tabla existe: 'fail', 'replace', 'append'.
+                'upsert' inserta o actualiza según `conflict_columns` (ver
+                upsert_dataframe(); siempre carga con COPY).
+            dtype (dict, optional): Tipos SQL por columna, como en to_sql.
             schema (str, optional): Esquema de la base de datos (ej. 'public').
+            method ("insert", "copy", "parallel"): 'insert' usa INSERT
+                multi-fila; 'copy' usa COPY FROM STDIN (solo PostgreSQL, mucho
+                más rápido para cargas grandes); 'parallel' reparte el COPY
+                entre varias conexiones (ver parallel_load()).
 
         Example:
             >>> db = PostgresManager(config)
             >>> db.save_dataframe(df_processed, 'results_scraping')
         """
-        try:
-            df.to_sql(
-                name=table_name,
-                con=self.engine,
+        if if_exists == "upsert" and not conflict_columns:
+            raise ValueError(
+                "Se requiere 'conflict_columns' para if_exists='upsert'."
+            )
+
+        if method == "parallel":
+            self.parallel_load(
+                df,
+                table_name,
+                if_exists,
+                conflict_columns=conflict_columns,
                 schema=schema,
-                if_exists=if_exists,
-                index=False,
-                method="multi",
-                chunksize=10000,
+                dtype=dtype,
             )
+            return
+
+        if if_exists == "upsert":
+            self.upsert_dataframe(
+                df, table_name, conflict_columns, schema, dtype=dtype
+            )
+            return
+
+        if method == "copy":
+            self.copy_dataframe(df, table_name, if_exists, schema, dtype=dtype)
+            return
+
+        try:
+            with self.engine.begin() as connection:
+                if if_exists in ("append", "delete_rows"):
+                    self._add_new_columns(
+                        connection, empty_frame(df), table_name, schema, dtype
+                    )
+                df.to_sql(
+                    name=table_name,
+                    con=connection,
+                    schema=schema,
+                    if_exists=if_exists,
+                    index=False,
+                    method="multi",
+                    chunksize=10000,
+                    dtype=dtype,
+                )
             logger.info(
                 f"Datos insertados correctamente en tabla: {table_name}"
             )
@@ -73,11 +499,856 @@ class PostgresManager:
             logger.error(f"Error al guardar en Postgres: {e}")
             raise
 
+    def copy_dataframe(
+        self,
+        data: Union[pd.DataFrame, pa.Table],
+        table_name: str,
+        if_exists: Literal[
+            "fail", "replace", "append", "delete_rows"
+        ] = "append",
+        schema: Optional[str] = "public",
+        chunksize: int = COPY_CHUNKSIZE,
+        dtype: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Carga un DataFrame o tabla de Arrow con COPY FROM STDIN (CSV).
+
+        La tabla se crea (o reemplaza/vacía según `if_exists`) con los tipos
+        que usaría to_sql, o se le agregan las columnas nuevas de `data`, y
+        luego las filas se envían en streaming de a `chunksize`, todo en la
+        misma transacción.
+        """
+        empty = empty_frame(data)
+        try:
+            with self.engine.begin() as connection:
+                if if_exists in ("append", "delete_rows"):
+                    self._add_new_columns(
+                        connection, empty, table_name, schema, dtype
+                    )
+                # Solo el DDL (y el reemplazo o vaciado) pasa por pandas
+                empty.to_sql(
+                    name=table_name,
+                    con=connection,
+                    schema=schema,
+                    if_exists=if_exists,
+                    index=False,
+                    dtype=dtype,
+                )
+                copy_into(
+                    connection,
+                    data,
+                    qualified_name(table_name, schema),
+                    chunksize,
+                )
+
+            logger.info(
+                f"{len(data)} filas cargadas con COPY en tabla: {table_name}"
+            )
+        except Exception as e:
+            logger.error(f"Error al cargar con COPY en Postgres: {e}")
+            raise
+
+    def upsert_dataframe(
+        self,
+        data: Union[pd.DataFrame, pa.Table],
+        table_name: str,
+        conflict_columns: List[str],
+        schema: Optional[str] = "public",
+        chunksize: int = COPY_CHUNKSIZE,
+        dtype: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Inserta o actualiza filas según `conflict_columns` (ej. sku y
+        fecha), para poder re-ejecutar una carga sin duplicar filas.
+
+        En una sola transacción:
+        1. Crea la tabla destino si no existe y le agrega las columnas que
+           falten.
+        2. Crea el índice único sobre `conflict_columns` si no existe (falla
+           si la tabla ya tiene duplicados para esas columnas).
+        3. Carga los datos con COPY en una tabla de staging UNLOGGED.
+        4. Hace INSERT ... ON CONFLICT DO UPDATE desde el staging y lo borra.
+
+        `dtype` fija el tipo SQL de columnas que pandas no puede inferir
+        (ej. {"fecha": sqlalchemy.Date()}), igual que en to_sql.
+
+        Retorna la cantidad de filas insertadas o actualizadas.
+        """
+        staging_name = staging_table_name(table_name)
+        empty = empty_frame(data)
+
+        try:
+            with self.engine.begin() as connection:
+                self._create_staging(
+                    connection, empty, staging_name, schema, dtype
+                )
+                copy_into(
+                    connection,
+                    data,
+                    qualified_name(staging_name, schema),
+                    chunksize,
+                )
+                rowcount = self._merge_staging(
+                    connection,
+                    empty,
+                    staging_name,
+                    table_name,
+                    schema,
+                    conflict_columns,
+                    dtype,
+                )
+
+            logger.info(
+                f"Upsert en tabla {table_name}: {rowcount} filas "
+                f"insertadas o actualizadas de {len(data)}"
+            )
+            return rowcount
+        except Exception as e:
+            logger.error(f"Error en el upsert a Postgres: {e}")
+            raise
+
+    def parallel_load(
+        self,
+        data: Union[pd.DataFrame, pa.Table],
+        table_name: str,
+        if_exists: Literal["append", "replace", "upsert"] = "append",
+        conflict_columns: Optional[List[str]] = None,
+        schema: Optional[str] = "public",
+        workers: Optional[int] = None,
+        chunksize: int = COPY_CHUNKSIZE,
+        dtype: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Carga con COPY repartiendo las filas entre varias conexiones, para
+        cargas grandes (backfills) que con una sola conexión quedan limitadas
+        por un único proceso del servidor.
+
+        1. Crea una tabla de staging UNLOGGED (visible para todas las
+           conexiones, por eso no es TEMP).
+        2. Divide las filas en `workers` rangos y los carga en paralelo, cada
+           uno con su conexión del pool y su propia transacción.
+        3. En una sola transacción pasa el staging a la tabla destino:
+           - 'append': INSERT ... SELECT.
+           - 'upsert': INSERT ... ON CONFLICT sobre `conflict_columns`; si
+             hay claves repetidas gana la última fila de `data`.
+           - 'replace': TRUNCATE + INSERT ... SELECT, de modo que los
+             lectores ven la tabla anterior o la nueva completa y la tabla
+             conserva sus índices, restricciones, permisos y vistas.
+
+        Si algo falla la tabla destino no se modifica y el staging se borra.
+        Los hilos se limitan a las conexiones que admite el pool
+        (pool_size + max_overflow).
+        """
+        if if_exists not in ("append", "replace", "upsert"):
+            raise ValueError(
+                f"parallel_load no admite if_exists='{if_exists}'; "
+                "use 'append', 'replace' o 'upsert'."
+            )
+        if if_exists == "upsert" and not conflict_columns:
+            raise ValueError(
+                "Se requiere 'conflict_columns' para if_exists='upsert'."
+            )
+
+        if if_exists == "upsert":
+            # Los rangos se cargan a la vez, así que el orden de las filas en
+            # el staging no es el de `data`: la última de cada clave se elige
+            # antes de repartirlas
+            data = drop_duplicate_keys(data, conflict_columns)
+
+        workers = min(
+            workers or self.load_workers, self.pool_size + self.max_overflow
+        )
+        ranges = split_row_ranges(len(data), workers)
+        staging_name = staging_table_name(table_name)
+        staging = qualified_name(staging_name, schema)
+        empty = empty_frame(data)
+
+        def load_range(row_range: tuple[int, int]) -> None:
+            with self.engine.begin() as connection:
+                copy_into(
+                    connection, slice_rows(data, *row_range), staging, chunksize
+                )
+
+        try:
+            with self.engine.begin() as connection:
+                self._create_staging(
+                    connection, empty, staging_name, schema, dtype
+                )
+
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                # list() propaga la primera excepción de los hilos
+                list(executor.map(load_range, ranges))
+
+            with self.engine.begin() as connection:
+                self._merge_staging(
+                    connection,
+                    empty,
+                    staging_name,
+                    table_name,
+                    schema,
+                    conflict_columns if if_exists == "upsert" else None,
+                    dtype,
+                    replace=if_exists == "replace",
+                )
+
+            logger.info(
+                f"{len(data)} filas cargadas en paralelo ({len(ranges)} "
+                f"conexiones) en tabla: {table_name}"
+            )
+        except Exception as e:
+            logger.error(f"Error en la carga paralela a Postgres: {e}")
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+            except Exception as cleanup_error:
+                logger.error(
+                    f"No se pudo borrar el staging {staging}: {cleanup_error}"
+                )
+            raise
+
+    def _add_new_columns(
+        self,
+        connection: Connection,
+        empty: pd.DataFrame,
+        table_name: str,
+        schema: Optional[str],
+        dtype: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Si la tabla ya existe, le agrega las columnas de `empty` que no tenga
+        (ej. una columna nueva del scraper), con los tipos que usaría to_sql.
+        """
+        inspector = inspect(connection)
+        if not inspector.has_table(table_name, schema=schema):
+            return
+
+        existing = {
+            c["name"] for c in inspector.get_columns(table_name, schema=schema)
+        }
+        missing = [c for c in column_names(empty) if c not in existing]
+        if not missing:
+            return
+
+        template_name = staging_table_name(table_name)
+        empty[missing].to_sql(
+            name=template_name,
+            con=connection,
+            schema=schema,
+            if_exists="fail",
+            index=False,
+            dtype=dtype,
+        )
+        add_missing_columns(
+            connection,
+            table_name,
+            schema,
+            qualified_name(template_name, schema),
+            missing,
+        )
+        connection.execute(
+            text(f"DROP TABLE {qualified_name(template_name, schema)}")
+        )
+
+    def _create_staging(
+        self,
+        connection: Connection,
+        empty: pd.DataFrame,
+        staging_name: str,
+        schema: Optional[str],
+        dtype: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Crea la tabla de staging directamente UNLOGGED (sin escribir WAL ni
+        reescribirla después), con los tipos que usaría to_sql.
+        """
+        ddl = get_schema(
+            empty, staging_name, con=connection, schema=schema, dtype=dtype
+        )
+        connection.execute(
+            text(ddl.replace("CREATE TABLE", "CREATE UNLOGGED TABLE", 1))
+        )
+
+    def _merge_staging(
+        self,
+        connection: Connection,
+        empty: pd.DataFrame,
+        staging_name: str,
+        table_name: str,
+        schema: Optional[str],
+        conflict_columns: Optional[List[str]],
+        dtype: Optional[Dict[str, Any]],
+        replace: bool = False,
+    ) -> int:
+        """
+        Pasa las filas del staging a la tabla destino y borra el staging.
+
+        Crea la tabla destino si no existe y le agrega las columnas que
+        falten. Con `conflict_columns` crea el índice único (falla si la tabla
+        ya tiene duplicados para esas columnas) y hace INSERT ... ON CONFLICT;
+        sin ellas, un INSERT ... SELECT. Con `replace` vacía antes la tabla
+        con TRUNCATE, dentro de la misma transacción. Retorna las filas
+        afectadas.
+        """
+        target = qualified_name(table_name, schema)
+        staging = qualified_name(staging_name, schema)
+        columns = column_names(empty)
+
+        empty.to_sql(
+            name=table_name,
+            con=connection,
+            schema=schema,
+            if_exists="append",
+            index=False,
+            dtype=dtype,
+        )
+        add_missing_columns(connection, table_name, schema, staging, columns)
+
+        if replace:
+            connection.execute(text(f"TRUNCATE TABLE {target}"))
+
+        if conflict_columns:
+            connection.execute(
+                text(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS "
+                    f"{quote_identifier(index_name(table_name, conflict_columns))} "
+                    f"ON {target} "
+                    f"({', '.join(map(quote_identifier, conflict_columns))})"
+                )
+            )
+            sql = build_upsert_sql(target, staging, columns, conflict_columns)
+        else:
+            quoted = ", ".join(map(quote_identifier, columns))
+            sql = (
+                f"INSERT INTO {target} ({quoted}) "
+                f"SELECT {quoted} FROM {staging}"
+            )
+
+        result = connection.execute(text(sql))
+        connection.execute(text(f"DROP TABLE {staging}"))
+        return result.rowcount
+
+    def save_partitioned(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        partition_column: str,
+        index_columns: Sequence[str] = (),
+        interval: PartitionInterval = "month",
+        schema: Optional[str] = "public",
+        chunksize: int = COPY_CHUNKSIZE,
+        dtype: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Agrega filas a una tabla particionada por rango de fechas, creándola
+        y manteniéndola si hace falta, todo en una sola transacción:
+
+        1. Si la tabla no existe la crea con PARTITION BY RANGE
+           (`partition_column`) y los tipos que usaría to_sql; si existe, le
+           agrega las columnas que falten (falla si no está particionada).
+        2. Crea un índice por cada columna de `index_columns` (Postgres lo
+           replica en cada partición).
+        3. Crea la partición (diaria o mensual, según `interval`) de cada
+           fecha presente en los datos y la del período siguiente, para que
+           la próxima carga ya la encuentre creada.
+        4. Carga las filas con COPY; Postgres las enruta a su partición.
+
+        `partition_column` debe ser una fecha sin nulos (ej. fecha_extraccion
+        con dtype={"fecha_extraccion": sqlalchemy.Date()}).
+        """
+        days = pd.to_datetime(data[partition_column])
+        if days.isna().any():
+            raise ValueError(
+                f"La columna de partición '{partition_column}' tiene nulos."
+            )
+
+        bounds = partition_ranges(days.dt.date.unique(), interval)
+
+        staging_name = staging_table_name(table_name)
+        target = qualified_name(table_name, schema)
+        template = qualified_name(staging_name, schema)
+        empty = empty_frame(data)
+
+        try:
+            with self.engine.begin() as connection:
+                self._create_staging(
+                    connection, empty, staging_name, schema, dtype
+                )
+
+                if inspect(connection).has_table(table_name, schema=schema):
+                    relkind = connection.execute(
+                        text(
+                            "SELECT relkind FROM pg_class "
+                            "WHERE oid = CAST(:table AS regclass)"
+                        ),
+                        {"table": target},
+                    ).scalar_one()
+                    if relkind != "p":
+                        raise ValueError(
+                            f"La tabla {table_name} existe y no está "
+                            "particionada; migrela antes con "
+                            "migrate_to_partitioned()."
+                        )
+                    add_missing_columns(
+                        connection,
+                        table_name,
+                        schema,
+                        template,
+                        column_names(empty),
+                    )
+                else:
+                    connection.execute(
+                        text(
+                            f"CREATE TABLE {target} (LIKE {template}) "
+                            f"PARTITION BY RANGE "
+                            f"({quote_identifier(partition_column)})"
+                        )
+                    )
+                    logger.info(f"Tabla particionada {table_name} creada")
+
+                self._create_partitions(
+                    connection,
+                    table_name,
+                    schema,
+                    bounds,
+                    index_columns,
+                    interval,
+                )
+                copy_into(connection, data, target, chunksize)
+                connection.execute(text(f"DROP TABLE {template}"))
+
+            logger.info(
+                f"{len(data)} filas cargadas en la tabla particionada "
+                f"{table_name} ({len(bounds)} particiones verificadas)"
+            )
+        except Exception as e:
+            logger.error(f"Error al cargar la tabla particionada: {e}")
+            raise
+
+    def migrate_to_partitioned(
+        self,
+        table_name: str,
+        partition_column: str,
+        partition_expression: Optional[str] = None,
+        index_columns: Sequence[str] = (),
+        interval: PartitionInterval = "month",
+        schema: Optional[str] = "public",
+    ) -> Optional[str]:
+        """
+        Convierte una tabla existente sin particionar en una tabla
+        particionada por rango, sin sacar los datos de Postgres y en una sola
+        transacción (si algo falla la tabla queda como estaba):
+
+        1. Renombra la tabla a `<tabla>_legacy` y sus índices a
+           `<índice>_legacy`, para poder crearlos de nuevo en la tabla nueva.
+        2. Crea la tabla particionada con las columnas de la anterior (LIKE)
+           más `partition_column` si no la tenía, sus índices y las
+           particiones de todas las fechas presentes.
+        3. Copia las filas con INSERT ... SELECT. Si la tabla anterior no
+           tiene `partition_column`, se calcula con `partition_expression`,
+           una expresión SQL sobre sus columnas (ej. la fecha de Lima de
+           fecha_extraccion_inicio).
+
+        La tabla `<tabla>_legacy` se conserva para verificar la migración y
+        borrarla a mano. Retorna su nombre, o None si `table_name` no existe
+        o ya está particionada (no hay nada que migrar).
+        """
+        target = qualified_name(table_name, schema)
+        legacy_name = f"{table_name}_legacy"[:63]
+        legacy = qualified_name(legacy_name, schema)
+
+        try:
+            with self.engine.begin() as connection:
+                inspector = inspect(connection)
+                if not inspector.has_table(table_name, schema=schema):
+                    return None
+
+                relkind = connection.execute(
+                    text(
+                        "SELECT relkind FROM pg_class "
+                        "WHERE oid = CAST(:table AS regclass)"
+                    ),
+                    {"table": target},
+                ).scalar_one()
+                if relkind == "p":
+                    return None
+
+                columns = [
+                    c["name"]
+                    for c in inspector.get_columns(table_name, schema=schema)
+                ]
+                quoted = ", ".join(map(quote_identifier, columns))
+                partition_key = quote_identifier(partition_column)
+                if partition_column in columns:
+                    expression = partition_key
+                    definition = f"LIKE {legacy}"
+                    insert_columns, select_values = quoted, quoted
+                elif partition_expression is not None:
+                    expression = partition_expression
+                    definition = f"LIKE {legacy}, {partition_key} date"
+                    insert_columns = f"{quoted}, {partition_key}"
+                    select_values = f"{quoted}, {expression}"
+                else:
+                    raise ValueError(
+                        f"La tabla {table_name} no tiene la columna "
+                        f"'{partition_column}'; indique partition_expression."
+                    )
+
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {target} "
+                        f"RENAME TO {quote_identifier(legacy_name)}"
+                    )
+                )
+                # Los índices conservan su nombre al renombrar la tabla; si no
+                # se renombran, CREATE INDEX IF NOT EXISTS sobre la tabla nueva
+                # (ej. el índice único del upsert) no haría nada
+                indexes = (
+                    connection.execute(
+                        text(
+                            "SELECT i.relname FROM pg_index x "
+                            "JOIN pg_class i ON i.oid = x.indexrelid "
+                            "WHERE x.indrelid = CAST(:table AS regclass)"
+                        ),
+                        {"table": legacy},
+                    )
+                    .scalars()
+                    .all()
+                )
+                for index in indexes:
+                    connection.execute(
+                        text(
+                            f"ALTER INDEX {qualified_name(index, schema)} "
+                            "RENAME TO "
+                            f"{quote_identifier(f'{index}_legacy'[:63])}"
+                        )
+                    )
+
+                days = (
+                    connection.execute(
+                        text(f"SELECT DISTINCT {expression} FROM {legacy}")
+                    )
+                    .scalars()
+                    .all()
+                )
+                if None in days:
+                    raise ValueError(
+                        f"La columna de partición '{partition_column}' "
+                        f"quedaría con nulos en {table_name}."
+                    )
+
+                connection.execute(
+                    text(
+                        f"CREATE TABLE {target} ({definition}) "
+                        f"PARTITION BY RANGE ({partition_key})"
+                    )
+                )
+                bounds = partition_ranges(days, interval)
+                self._create_partitions(
+                    connection,
+                    table_name,
+                    schema,
+                    bounds,
+                    index_columns,
+                    interval,
+                )
+
+                rows = connection.execute(
+                    text(
+                        f"INSERT INTO {target} ({insert_columns}) "
+                        f"SELECT {select_values} FROM {legacy}"
+                    )
+                ).rowcount
+
+            logger.info(
+                f"Tabla {table_name} migrada a particionada: {rows} filas "
+                f"en {len(bounds)} particiones; la anterior quedó como "
+                f"{legacy_name}"
+            )
+            return legacy_name
+        except Exception as e:
+            logger.error(f"Error al migrar la tabla a particionada: {e}")
+            raise
+
+    def _create_partitions(
+        self,
+        connection: Connection,
+        table_name: str,
+        schema: Optional[str],
+        bounds: Iterable[tuple[date, date]],
+        index_columns: Sequence[str],
+        interval: PartitionInterval,
+    ) -> None:
+        """
+        Crea en la tabla particionada un índice por cada columna de
+        `index_columns` (Postgres lo replica en cada partición) y las
+        particiones de `bounds` que no existan.
+        """
+        target = qualified_name(table_name, schema)
+
+        for column in index_columns:
+            connection.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS "
+                    f"{quote_identifier(index_name(table_name, [column], 'idx'))} "
+                    f"ON {target} ({quote_identifier(column)})"
+                )
+            )
+
+        for start, end in bounds:
+            partition = qualified_name(
+                partition_name(table_name, start, interval), schema
+            )
+            connection.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition} "
+                    f"PARTITION OF {target} "
+                    f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                )
+            )
+
+    def drop_old_partitions(
+        self,
+        table_name: str,
+        retention_days: int,
+        schema: Optional[str] = "public",
+        detach_only: bool = False,
+        today: Optional[date] = None,
+    ) -> List[str]:
+        """
+        Quita de la tabla particionada las particiones cuyos datos son todos
+        anteriores a `today - retention_days`, en una sola transacción.
+
+        Con `detach_only` las particiones solo se separan (DETACH) y quedan
+        como tablas sueltas, por ejemplo para archivarlas; si no, se borran.
+        Retorna los nombres de las particiones quitadas.
+        """
+        cutoff = (today or date.today()) - timedelta(days=retention_days)
+        target = qualified_name(table_name, schema)
+        removed = []
+
+        try:
+            with self.engine.begin() as connection:
+                partitions = connection.execute(
+                    text(
+                        "SELECT n.nspname, c.relname, "
+                        "pg_get_expr(c.relpartbound, c.oid) "
+                        "FROM pg_inherits i "
+                        "JOIN pg_class c ON c.oid = i.inhrelid "
+                        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                        "WHERE i.inhparent = CAST(:table AS regclass)"
+                    ),
+                    {"table": target},
+                ).all()
+
+                for partition_schema, name, bound in partitions:
+                    upper = partition_upper_bound(bound)
+                    if upper is None or upper > cutoff:
+                        continue
+
+                    partition = qualified_name(name, partition_schema)
+                    connection.execute(
+                        text(
+                            f"ALTER TABLE {target} DETACH PARTITION {partition}"
+                        )
+                    )
+                    if not detach_only:
+                        connection.execute(text(f"DROP TABLE {partition}"))
+                    removed.append(name)
+
+            logger.info(
+                f"Retención de {table_name} ({retention_days} días): "
+                f"{len(removed)} particiones "
+                f"{'separadas' if detach_only else 'borradas'}"
+            )
+            return removed
+        except Exception as e:
+            logger.error(f"Error al aplicar la retención de particiones: {e}")
+            raise
+
     def execute_query(self, query: str) -> List[Dict[str, Any]]:
         """
         Ejecuta una consulta SQL personalizada y devuelve los resultados.
+
+        Carga todas las filas en memoria; para resultados grandes usar
+        iter_query(), iter_dataframes() o iter_record_batches().
         """
         with self.engine.connect() as connection:
             # Usamos .mappings() para obtener diccionarios de forma oficial
             result = connection.execute(text(query)).mappings()
             return [dict(row) for row in result]
+
+    def iter_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunksize: int = QUERY_CHUNKSIZE,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Ejecuta una consulta con un cursor del lado del servidor y genera los
+        resultados en bloques de hasta `chunksize` diccionarios, de modo que
+        la memoria usada no depende del total de filas.
+
+        La conexión queda abierta hasta que se consume o se cierra el
+        generador.
+
+        Example:
+            >>> for rows in db.iter_query("SELECT * FROM precios"):
+            ...     procesar(rows)
+        """
+        for columns, rows in self._iter_partitions(query, params, chunksize):
+            yield [dict(zip(columns, row)) for row in rows]
+
+    def iter_dataframes(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunksize: int = QUERY_CHUNKSIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Como iter_query(), pero genera cada bloque como DataFrame.
+        """
+        for columns, rows in self._iter_partitions(query, params, chunksize):
+            yield pd.DataFrame.from_records(rows, columns=columns)
+
+    def iter_record_batches(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunksize: int = QUERY_CHUNKSIZE,
+        schema: Optional[pa.Schema] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Como iter_query(), pero genera cada bloque como RecordBatch de Arrow,
+        armado columna por columna sin pasar por pandas.
+
+        Sin `schema` los tipos se infieren en cada bloque (una columna toda
+        NULL en un bloque queda como tipo null); para escribir los bloques
+        en un mismo archivo conviene pasar el esquema esperado.
+        """
+        for columns, rows in self._iter_partitions(query, params, chunksize):
+            values = list(zip(*rows))
+            if schema is None:
+                yield pa.RecordBatch.from_arrays(
+                    [pa.array(v) for v in values], names=columns
+                )
+            else:
+                yield pa.RecordBatch.from_arrays(
+                    [
+                        pa.array(values[columns.index(field.name)], field.type)
+                        for field in schema
+                    ],
+                    schema=schema,
+                )
+
+    def _iter_partitions(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]],
+        chunksize: int,
+    ) -> Iterator[tuple[List[str], Sequence[Row[Any]]]]:
+        """
+        Genera (columnas, filas) de a `chunksize` filas. `stream_results`
+        hace que psycopg2 use un cursor con nombre (del lado del servidor),
+        que trae las filas de a `max_row_buffer` en vez de todas juntas.
+        """
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, max_row_buffer=chunksize
+            ).execute(text(query), params or {})
+            columns = list(result.keys())
+            for rows in result.partitions(chunksize):
+                yield columns, rows
+
+    def table_exists(
+        self, table_name: str, schema: Optional[str] = "public"
+    ) -> bool:
+        """Indica si la tabla existe en la base de datos."""
+        return inspect(self.engine).has_table(table_name, schema=schema)
+
+    def is_partitioned(
+        self, table_name: str, schema: Optional[str] = "public"
+    ) -> bool:
+        """Indica si la tabla existe y está particionada."""
+        if not self.table_exists(table_name, schema=schema):
+            return False
+
+        with self.engine.connect() as connection:
+            relkind = connection.execute(
+                text(
+                    "SELECT relkind FROM pg_class "
+                    "WHERE oid = CAST(:table AS regclass)"
+                ),
+                {"table": qualified_name(table_name, schema)},
+            ).scalar_one()
+        return relkind == "p"
+
+    def read_dataframe(
+        self, query: str, params: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """Ejecuta una consulta y devuelve el resultado como DataFrame."""
+        with self.engine.connect() as connection:
+            return pd.read_sql(text(query), connection, params=params)
+
+    def save_history_changes(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        key: str,
+        closed_keys: Sequence[Any],
+        valid_to: Any,
+        schema: Optional[str] = "public",
+    ) -> None:
+        """
+        Aplica cambios a una tabla histórica (SCD tipo 2) en una sola
+        transacción: cierra la versión vigente (`valido_hasta IS NULL`) de
+        cada clave en `closed_keys` con `valid_to` y agrega las filas de `df`
+        como nuevas versiones vigentes. Si `df` trae columnas que la tabla no
+        tiene (ej. una columna nueva del scraper), se agregan antes.
+
+        Args:
+            df (pd.DataFrame): Versiones nuevas, con valido_desde/valido_hasta.
+            table_name (str): Tabla histórica de destino.
+            key (str): Columna que identifica la entidad (ej. 'sku').
+            closed_keys (Sequence): Claves cuya versión vigente se cierra
+                (modificadas o eliminadas).
+            valid_to: Fecha de cierre de las versiones reemplazadas.
+            schema (str, optional): Esquema de la base de datos.
+        """
+        close = text(
+            f"UPDATE {qualified_name(table_name, schema)} "
+            "SET valido_hasta = :valid_to "
+            f"WHERE {quote_identifier(key)} IN :keys AND valido_hasta IS NULL"
+        ).bindparams(bindparam("keys", expanding=True))
+
+        try:
+            with self.engine.begin() as connection:
+                keys = list(closed_keys)
+                for start in range(0, len(keys), 10000):
+                    connection.execute(
+                        close,
+                        {
+                            "valid_to": valid_to,
+                            "keys": keys[start : start + 10000],
+                        },
+                    )
+
+                if not df.empty:
+                    self._add_new_columns(
+                        connection, empty_frame(df), table_name, schema, None
+                    )
+                    df.to_sql(
+                        name=table_name,
+                        con=connection,
+                        schema=schema,
+                        if_exists="append",
+                        index=False,
+                        method="multi",
+                        chunksize=10000,
+                    )
+            logger.info(
+                f"Historial actualizado en tabla {table_name}: "
+                f"{len(keys)} versiones cerradas, {len(df)} nuevas"
+            )
+        except Exception as e:
+            logger.error(f"Error al guardar el historial en Postgres: {e}")
+            raise
@@ -1,6 +1,10 @@
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import pytest
 
 from services.datalake import DataLakeManager
@@ -92,3 +96,149 @@ def test_write_parquet_without_dataframe(
         local_manager.write_data(
             tmp_path / "test.parquet", {"not": "a_dataframe"}, fmt="parquet"
         )
+
+
+@pytest.mark.integration
+def test_write_batches_streams_to_parquet(
+    local_manager: DataLakeManager, tmp_path: Path
+) -> None:
+    file_path = tmp_path / "stream.parquet"
+    schema = pa.schema([("id", pa.int64()), ("name", pa.string())])
+    batches = (
+        pa.RecordBatch.from_pylist(
+            [{"id": i, "name": f"test{i}"}], schema=schema
+        )
+        for i in range(3)
+    )
+
+    rows = local_manager.write_batches(file_path, batches, schema)
+
+    assert rows == 3
+    result = local_manager.read_data(file_path, fmt="parquet")
+    assert isinstance(result, pd.DataFrame)
+    assert result["id"].tolist() == [0, 1, 2]
+
+
+@pytest.mark.integration
+def test_write_batches_groups_small_batches(
+    local_manager: DataLakeManager, tmp_path: Path
+) -> None:
+    file_path = tmp_path / "grouped.parquet"
+    schema = pa.schema([("id", pa.int64())])
+    batches = (
+        pa.RecordBatch.from_pylist([{"id": i}, {"id": i + 1}], schema=schema)
+        for i in range(0, 10, 2)
+    )
+
+    rows = local_manager.write_batches(
+        file_path, batches, schema, max_rows_per_group=3
+    )
+
+    assert rows == 10
+    metadata = pq.ParquetFile(file_path).metadata
+    assert [
+        metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)
+    ] == [3, 3, 3, 1]
+    result = local_manager.read_data(file_path, fmt="parquet")
+    assert isinstance(result, pd.DataFrame)
+    assert result["id"].tolist() == list(range(10))
+
+
+@pytest.mark.integration
+def test_write_batches_without_rows_creates_nothing(
+    local_manager: DataLakeManager, tmp_path: Path
+) -> None:
+    file_path = tmp_path / "empty.parquet"
+    schema = pa.schema([("id", pa.int64())])
+
+    assert local_manager.write_batches(file_path, iter([]), schema) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.integration
+def test_write_dataset_hive_partitions(
+    local_manager: DataLakeManager, tmp_path: Path
+) -> None:
+    dataset_dir = tmp_path / "dataset"
+    df = pd.DataFrame(
+        {
+            "sku": [str(i) for i in range(6)],
+            "categoria_animal": ["perro", "gato"] * 3,
+            "fecha_extraccion": ["2024-01-01"] * 4 + ["2024-01-02"] * 2,
+        }
+    )
+
+    written = local_manager.write_dataset(
+        dataset_dir,
+        df,
+        ["fecha_extraccion", "categoria_animal"],
+        max_rows_per_file=1,
+    )
+
+    # Un archivo por fila (max_rows_per_file=1) en su carpeta de partición
+    assert len(written) == 6
+    assert (
+        dataset_dir / "fecha_extraccion=2024-01-02" / "categoria_animal=gato"
+    ).is_dir()
+
+    table = ds.dataset(dataset_dir, format="parquet", partitioning="hive")
+    perro = table.to_table(filter=ds.field("categoria_animal") == "perro")
+    assert sorted(perro.column("sku").to_pylist()) == ["0", "2", "4"]
+
+
+@pytest.mark.integration
+def test_write_dataset_replaces_written_partitions(
+    local_manager: DataLakeManager, tmp_path: Path
+) -> None:
+    dataset_dir = tmp_path / "dataset"
+    day_1 = pd.DataFrame({"sku": ["1", "2"], "fecha": ["2024-01-01"] * 2})
+    day_2 = pd.DataFrame({"sku": ["3"], "fecha": ["2024-01-02"]})
+
+    local_manager.write_dataset(dataset_dir, day_1, ["fecha"])
+    local_manager.write_dataset(dataset_dir, day_2, ["fecha"])
+    # Re-ejecutar el día 1 reemplaza su partición sin tocar el día 2
+    local_manager.write_dataset(dataset_dir, day_1.head(1), ["fecha"])
+
+    result = local_manager.read_data(dataset_dir, fmt="parquet")
+    assert isinstance(result, pd.DataFrame)
+    assert sorted(result["sku"]) == ["1", "3"]
+
+
+@pytest.mark.integration
+def test_write_dataset_from_batches_requires_schema(
+    local_manager: DataLakeManager, tmp_path: Path
+) -> None:
+    schema = pa.schema([("sku", pa.string()), ("fecha", pa.string())])
+    batches = [
+        pa.RecordBatch.from_pylist(
+            [{"sku": str(i), "fecha": "2024-01-01"}], schema=schema
+        )
+        for i in range(3)
+    ]
+
+    with pytest.raises(ValueError, match="schema"):
+        local_manager.write_dataset(tmp_path, iter(batches), ["fecha"])
+
+    written = local_manager.write_dataset(
+        tmp_path / "dataset", iter(batches), ["fecha"], schema=schema
+    )
+
+    # Los batches chicos se juntan en un solo archivo y row group
+    assert len(written) == 1
+    assert pq.ParquetFile(written[0]).num_row_groups == 1
+
+
+@pytest.mark.integration
+def test_write_batches_keeps_original_error_without_partial(
+    local_manager: DataLakeManager, tmp_path: Path
+) -> None:
+    schema = pa.schema([("id", pa.int64())])
+    local_manager.filesystem = MagicMock()
+    local_manager.filesystem.open_output_stream.side_effect = PermissionError(
+        "sin permisos"
+    )
+    local_manager.filesystem.delete_file.side_effect = FileNotFoundError()
+
+    # Si el .partial nunca se creó, se relanza el error original
+    with pytest.raises(PermissionError, match="sin permisos"):
+        local_manager.write_batches(tmp_path / "out.parquet", [], schema)
@@ -1,6 +1,7 @@
 from typing import Any
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 from sqlalchemy import create_engine, text
 
@@ -98,3 +99,78 @@ def test_execute_query_with_data(memory_db_manager: PostgresManager) -> None:
 
     # Validamos que sea una lista de diccionarios (comportamiento esperado)
     assert isinstance(results[0], dict)
+
+
+@pytest.fixture
+def prices_db_manager(memory_db_manager: PostgresManager) -> PostgresManager:
+    """Manager con una tabla `precios` de 5 filas (precio NULL en la 2)."""
+    with memory_db_manager.engine.connect() as conn:
+        conn.execute(text("CREATE TABLE precios (sku TEXT, precio REAL)"))
+        conn.execute(
+            text("INSERT INTO precios (sku, precio) VALUES (:sku, :precio)"),
+            [
+                {"sku": str(i), "precio": None if i == 2 else i * 1.5}
+                for i in range(5)
+            ],
+        )
+        conn.commit()
+    return memory_db_manager
+
+
+@pytest.mark.integration
+def test_iter_query_yields_chunks(prices_db_manager: PostgresManager) -> None:
+    chunks = list(
+        prices_db_manager.iter_query(
+            "SELECT sku, precio FROM precios ORDER BY sku", chunksize=2
+        )
+    )
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert chunks[0][1] == {"sku": "1", "precio": 1.5}
+    assert chunks[1][0] == {"sku": "2", "precio": None}
+
+
+@pytest.mark.integration
+def test_iter_dataframes_with_params(
+    prices_db_manager: PostgresManager,
+) -> None:
+    frames = list(
+        prices_db_manager.iter_dataframes(
+            "SELECT sku, precio FROM precios WHERE sku >= :desde ORDER BY sku",
+            params={"desde": "2"},
+            chunksize=2,
+        )
+    )
+
+    data = pd.concat(frames, ignore_index=True)
+    assert [len(f) for f in frames] == [2, 1]
+    assert data["sku"].tolist() == ["2", "3", "4"]
+    assert list(data.columns) == ["sku", "precio"]
+
+
+@pytest.mark.integration
+def test_iter_record_batches_with_schema(
+    prices_db_manager: PostgresManager,
+) -> None:
+    schema = pa.schema([("precio", pa.float64()), ("sku", pa.string())])
+
+    batches = list(
+        prices_db_manager.iter_record_batches(
+            "SELECT sku, precio FROM precios ORDER BY sku",
+            chunksize=3,
+            schema=schema,
+        )
+    )
+
+    table = pa.Table.from_batches(batches)
+    assert [b.num_rows for b in batches] == [3, 2]
+    assert table.schema == schema
+    assert table.column("precio").to_pylist() == [0.0, 1.5, None, 4.5, 6.0]
+
+
+@pytest.mark.integration
+def test_iter_query_empty_result(prices_db_manager: PostgresManager) -> None:
+    assert (
+        list(prices_db_manager.iter_query("SELECT * FROM precios WHERE 0"))
+        == []
+    )
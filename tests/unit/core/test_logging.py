@@ -0,0 +1,49 @@
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+import core.logging
+from core.logging import disable_file_logging, get_logger
+from core.settings import settings
+
+
+@pytest.fixture
+def file_logging(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    # get_logger no crea archivos bajo pytest; se simula una ejecución normal
+    monkeypatch.delitem(sys.modules, "pytest")
+    monkeypatch.setattr(settings, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(core.logging, "_file_logging", True)
+    return tmp_path
+
+
+def remove_logger(name: str) -> None:
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_disable_file_logging_keeps_workers_off_log_dir(
+    file_logging: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # pytest la vuelve a definir en cada fase, por eso se quita aquí
+    monkeypatch.delenv("PYTEST_CURRENT_TEST")
+    try:
+        parent = get_logger("test_logging.parent")
+        assert any(isinstance(h, logging.FileHandler) for h in parent.handlers)
+        log_files = list(file_logging.iterdir())
+
+        disable_file_logging()
+        worker = get_logger("test_logging.worker")
+
+        # Los loggers heredados pierden el archivo y los nuevos no lo abren
+        assert not any(
+            isinstance(h, logging.FileHandler) for h in parent.handlers
+        )
+        assert [type(h) for h in worker.handlers] == [logging.StreamHandler]
+        assert list(file_logging.iterdir()) == log_files
+    finally:
+        remove_logger("test_logging.parent")
+        remove_logger("test_logging.worker")
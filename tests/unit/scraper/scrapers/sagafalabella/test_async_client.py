@@ -0,0 +1,44 @@
+import asyncio
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.schemas import HttpClientConfig
+from scraper.scrapers.sagafalabella.async_client import (
+    fetch_html_product_extra_details,
+)
+from scraper.utils.async_http import AsyncHttpClient
+from scraper.utils.http_cache import HttpCache
+
+
+def test_fetch_html_product_extra_details_revalidates_cache(
+    tmp_path: Path,
+) -> None:
+    cache = HttpCache(tmp_path / "cache.sqlite", ttl=0, max_bytes=10**6)
+    seen: list[str | None] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        # Nombre de header no canónico, como mandan algunos servidores
+        return web.Response(text="<html>v1</html>", headers={"Etag": '"v1"'})
+
+    async def run() -> list[str | None]:
+        app = web.Application()
+        app.router.add_get("/producto", handler)
+        async with TestServer(app) as server:
+            url = str(server.make_url("/producto"))
+            async with AsyncHttpClient(
+                HttpClientConfig(rate_limit=False)
+            ) as client:
+                return [
+                    await fetch_html_product_extra_details(client, url, cache)
+                    for _ in range(2)
+                ]
+
+    assert asyncio.run(run()) == ["<html>v1</html>", "<html>v1</html>"]
+    # Con ttl=0 el segundo GET es condicional y el 304 se sirve del cache
+    assert seen == [None, '"v1"']
+    assert cache.revalidated == 1
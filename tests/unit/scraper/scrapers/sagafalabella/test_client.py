@@ -1,15 +1,22 @@
+from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock, patch
 
+import pytest
 import requests
 
+from core.schemas import HttpClientConfig
 from scraper.scrapers.sagafalabella.client import (
     fetch_api_product_extra_details,
     fetch_html_product_extra_details,
+    fetch_listing_page,
     fetch_products_page,
 )
+from scraper.utils.http import HttpClient
+from scraper.utils.http_cache import HttpCache
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_fetch_products_page_success(mock_get: MagicMock) -> None:
     # Configuramos el mock para devolver un JSON válido
     mock_response = MagicMock()
@@ -29,20 +36,59 @@ def test_fetch_products_page_success(mock_get: MagicMock) -> None:
     mock_get.assert_called_once()
 
 
-@patch("requests.get")
-def test_fetch_products_page_server_error(mock_get: MagicMock) -> None:
-    # Simulamos un error 500
+@pytest.mark.parametrize(
+    "pagination, expected",
+    [
+        ({"count": 100, "perPage": 48}, 3),
+        ({"count": "96", "perPage": "48"}, 2),
+        ({"count": 10}, None),
+        ({"count": 10, "perPage": 0}, None),
+        (None, None),
+    ],
+)
+@patch("requests.Session.get")
+def test_fetch_listing_page_total_pages(
+    mock_get: MagicMock,
+    pagination: dict[str, Any] | None,
+    expected: int | None,
+) -> None:
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "data": {"results": [{"productId": "1"}], "pagination": pagination}
+    }
+    mock_get.return_value = mock_response
+
+    listing = fetch_listing_page(1, "cat123", "alimentos")
+
+    assert listing is not None
+    assert listing["results"] == [{"productId": "1"}]
+    assert listing["total_pages"] == expected
+
+
+@patch("scraper.utils.http.time.sleep")
+@patch("requests.Session.get")
+def test_fetch_products_page_server_error(
+    mock_get: MagicMock, mock_sleep: MagicMock
+) -> None:
+    # Simulamos un error 500 persistente
     mock_response = MagicMock()
     mock_response.status_code = 500
+    mock_response.headers = {}
     mock_get.return_value = mock_response
 
-    results = fetch_products_page(1, "id", "name")
+    client = HttpClient(HttpClientConfig(max_retries=2, rate_limit=False))
+    results = fetch_products_page(1, "id", "name", client=client)
     assert results is None
 
+    # Un intento inicial mas dos reintentos con espera entre ellos
+    assert mock_get.call_count == 3
+    assert mock_sleep.call_count == 2
+
 
 # Este test valida una funcion que por ahora no se utiliza
 # debido a que saga cambió el retorno de la API de producto.
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_fetch_api_product_extra_details_exception(mock_get: MagicMock) -> None:
     # Simulamos una excepción de red (ej: Timeout)
     mock_get.side_effect = requests.RequestException("Timeout")
@@ -51,7 +97,7 @@ def test_fetch_api_product_extra_details_exception(mock_get: MagicMock) -> None:
     assert description is None
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_fetch_html_product_extra_details_success(mock_get: MagicMock) -> None:
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -62,3 +108,32 @@ def test_fetch_html_product_extra_details_success(mock_get: MagicMock) -> None:
 
     assert html_content == "<html><body>Test</body></html>"
     assert isinstance(html_content, str)
+
+
+@patch("requests.Session.get")
+def test_fetch_html_product_extra_details_uses_cache(
+    mock_get: MagicMock, tmp_path: Path
+) -> None:
+    cache = HttpCache(tmp_path / "cache.sqlite", ttl=0, max_bytes=10**6)
+
+    first = MagicMock()
+    first.status_code = 200
+    first.text = "<html>v1</html>"
+    first.headers = {"ETag": '"v1"'}
+    not_modified = MagicMock()
+    not_modified.status_code = 304
+    not_modified.text = ""
+    not_modified.headers = {}
+    mock_get.side_effect = [first, not_modified]
+
+    assert (
+        fetch_html_product_extra_details("http://fake-url.com", cache=cache)
+        == "<html>v1</html>"
+    )
+    # Con ttl=0 la entrada vence de inmediato y se revalida con un GET
+    # condicional; el 304 devuelve el body guardado
+    assert (
+        fetch_html_product_extra_details("http://fake-url.com", cache=cache)
+        == "<html>v1</html>"
+    )
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
@@ -0,0 +1,138 @@
+from typing import Any
+
+import pyarrow as pa
+import pytest
+from pydantic import ValidationError
+
+from scraper.scrapers.sagafalabella.columnar import build_listing_table
+from scraper.scrapers.sagafalabella.parser import get_product_data
+from scraper.scrapers.sagafalabella.schemas import SCRAPED_PRODUCT_SCHEMA
+
+DATE_COLUMNS = ["fecha_extraccion_inicio", "fecha_extraccion_final"]
+
+PRODUCTS: list[dict[str, Any]] = [
+    {
+        "displayName": "Alimento Adulto 7,5 Kg",
+        "skuId": "1",
+        "productId": "p1",
+        "brand": "Marca",
+        "sellerName": "Falabella",
+        "url": "http://fake/1",
+        "prices": [
+            {"type": "normalPrice", "crossed": True, "price": ["100.00"]},
+            {"type": "internetPrice", "crossed": False, "price": ["80.00"]},
+            {"type": "cmrPrice", "crossed": False, "price": ["70.00"]},
+        ],
+    },
+    {
+        # Sin marca, vendedor ni crossed; precio no numérico
+        "displayName": "Snack 500gr",
+        "skuId": "2",
+        "productId": "p2",
+        "url": "http://fake/2",
+        "prices": [
+            {"type": "internetPrice", "price": ["1,299.90"]},
+            {"type": "normalPrice", "price": ["50"]},
+        ],
+    },
+    {
+        "displayName": "Juguete sin peso",
+        "skuId": "3",
+        "productId": "p3",
+        "url": "http://fake/3",
+        "prices": [],
+    },
+    {
+        "displayName": "Arena 10 kg",
+        "skuId": "4",
+        "productId": "p4",
+        "url": "http://fake/4",
+        "prices": [{"type": "eventPrice", "crossed": False, "price": []}],
+    },
+]
+
+EDGE_CASE_PRODUCTS: list[dict[str, Any]] = [
+    {
+        # Marca y vendedor nulos explícitos, claves extra y precios raros
+        "displayName": "Alimento Cachorro 1.5kg",
+        "skuId": "5",
+        "productId": "p5",
+        "brand": None,
+        "sellerName": None,
+        "url": "http://fake/5",
+        "badges": ["nuevo"],
+        "prices": [
+            {"type": "normalPrice", "crossed": True, "price": ["abc"]},
+            {"type": "cmrPrice", "price": ["60", "55"]},
+            {"type": "eventPrice", "crossed": True, "price": ["40"]},
+        ],
+    },
+    {
+        # Sin `prices`
+        "displayName": "Snack",
+        "skuId": "6",
+        "productId": "p6",
+        "url": "http://fake/6",
+    },
+]
+
+# Productos que RawProduct rechaza: ambos caminos deben fallar igual
+INVALID_PRODUCTS: dict[str, dict[str, Any]] = {
+    "tipo de precio desconocido": {
+        **PRODUCTS[0],
+        "prices": [{"type": "outletPrice", "price": ["10"]}],
+    },
+    "sku numérico": {**PRODUCTS[0], "skuId": 1},
+    "nombre nulo": {**PRODUCTS[0], "displayName": None},
+    "prices nulo": {**PRODUCTS[0], "prices": None},
+    "sin url": {k: v for k, v in PRODUCTS[0].items() if k != "url"},
+}
+
+
+@pytest.mark.parametrize("category_name", ["Alimentos", "Camas"])
+@pytest.mark.parametrize(
+    "products", [PRODUCTS, EDGE_CASE_PRODUCTS], ids=["comunes", "bordes"]
+)
+def test_build_listing_table_matches_per_product_path(
+    category_name: str, products: list[dict[str, Any]]
+) -> None:
+    expected = pa.Table.from_pylist(
+        [
+            get_product_data("perro", p, category_name).model_dump()
+            for p in products
+        ],
+        schema=SCRAPED_PRODUCT_SCHEMA,
+    ).drop_columns(DATE_COLUMNS)
+
+    table = build_listing_table("perro", products, category_name)
+
+    assert table.schema == SCRAPED_PRODUCT_SCHEMA
+    assert table.drop_columns(DATE_COLUMNS).equals(expected)
+
+
+@pytest.mark.parametrize(
+    "product", INVALID_PRODUCTS.values(), ids=INVALID_PRODUCTS.keys()
+)
+def test_build_listing_table_rejects_what_raw_product_rejects(
+    product: dict[str, Any],
+) -> None:
+    with pytest.raises(ValidationError):
+        get_product_data("perro", product, "Alimentos")
+    with pytest.raises(ValidationError):
+        build_listing_table("perro", [PRODUCTS[1], product], "Alimentos")
+
+
+def test_build_listing_table_stamps_one_date() -> None:
+    table = build_listing_table(
+        "gato", PRODUCTS, "Alimentos", extraction_date="2024-01-01T00:00:00"
+    )
+
+    for column in DATE_COLUMNS:
+        assert set(table.column(column).to_pylist()) == {"2024-01-01T00:00:00"}
+
+
+def test_build_listing_table_empty_page() -> None:
+    table = build_listing_table("gato", [], "Alimentos")
+
+    assert table.num_rows == 0
+    assert table.schema == SCRAPED_PRODUCT_SCHEMA
@@ -0,0 +1,13 @@
+import pandas as pd
+
+from scraper.scrapers.sagafalabella.dates import add_extraction_date
+
+
+def test_add_extraction_date_uses_lima_date() -> None:
+    data = pd.DataFrame(
+        {"fecha_extraccion_inicio": ["2024-01-01T23:30:00-05:00"]}
+    )
+
+    result = add_extraction_date(data)
+
+    assert str(result["fecha_extraccion"].iloc[0]) == "2024-01-01"
@@ -0,0 +1,235 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from scraper.scrapers.sagafalabella.jobs.get_extra_details_product import (
+    load_previous_snapshot,
+    update_product_data,
+    update_product_data_async,
+)
+from scraper.scrapers.sagafalabella.parser import FetchedDetail
+from scraper.utils.checkpoint import JsonlCheckpoint
+
+MODULE = "scraper.scrapers.sagafalabella.jobs.get_extra_details_product"
+
+
+def sample_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "categoria_animal": ["perro", "perro", "gato", "gato"],
+            "sku": ["1", "2", "1", "3"],
+            "product_id": ["p1", "p2", "p1", "p3"],
+            "url": ["u1", "u2", "u1", "u3"],
+            "categoria_producto": [None] * 4,
+            "sub_categoria_producto": [None] * 4,
+            "descripcion_producto": [None] * 4,
+        }
+    )
+
+
+def fake_detail(sku: str, url: str, product_id: str | None) -> tuple[Any, ...]:
+    if sku == "3":
+        return None, None, None
+    return f"cat-{sku}", f"sub-{sku}", f"desc de {product_id}"
+
+
+EXPECTED = pd.DataFrame(
+    {
+        "categoria_animal": ["perro-gato", "perro", "gato"],
+        "sku": ["1", "2", "3"],
+        "product_id": ["p1", "p2", "p3"],
+        "url": ["u1", "u2", "u3"],
+        "categoria_producto": ["cat-1", "cat-2", None],
+        "sub_categoria_producto": ["sub-1", "sub-2", None],
+        "descripcion_producto": ["desc de p1", "desc de p2", None],
+    }
+)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_update_product_data(max_workers: int) -> None:
+    with patch(f"{MODULE}.get_product_detail", side_effect=fake_detail):
+        result = update_product_data(sample_data(), max_workers=max_workers)
+
+    pd.testing.assert_frame_equal(result, EXPECTED)
+
+
+def test_update_product_data_async_matches_sync() -> None:
+    async def fake_detail_async(
+        client: Any, sku: str, url: str, product_id: str | None
+    ) -> tuple[Any, ...]:
+        return fake_detail(sku, url, product_id)
+
+    with patch(
+        f"{MODULE}.get_product_detail_async", side_effect=fake_detail_async
+    ):
+        result = asyncio.run(
+            update_product_data_async(sample_data(), client=MagicMock())
+        )
+
+    pd.testing.assert_frame_equal(result, EXPECTED)
+
+
+def test_update_product_data_resumes_from_checkpoint(tmp_path: Path) -> None:
+    path = tmp_path / "ckpt.jsonl"
+    previous = JsonlCheckpoint(path, source="in")
+    previous.add("1", ["cat-1", "sub-1", "desc de p1"])
+    previous.flush()
+
+    checkpoint = JsonlCheckpoint(path, source="in")
+    with patch(
+        f"{MODULE}.get_product_detail", side_effect=fake_detail
+    ) as mock_detail:
+        result = update_product_data(
+            sample_data(), max_workers=2, checkpoint=checkpoint
+        )
+
+    pd.testing.assert_frame_equal(result, EXPECTED)
+    fetched = sorted(call.args[0] for call in mock_detail.call_args_list)
+    assert fetched == ["2", "3"]
+    # Los SKU nuevos quedaron guardados para una próxima ejecución, salvo el
+    # fallido (3), que se vuelve a pedir
+    assert set(JsonlCheckpoint(path, source="in").load()) == {"1", "2"}
+
+
+def test_update_product_data_retries_failed_skus_on_resume(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "ckpt.jsonl"
+    # Primera ejecución: el SKU 3 falla (ej. throttling) y se interrumpe
+    with patch(f"{MODULE}.get_product_detail", side_effect=fake_detail):
+        update_product_data(
+            sample_data(), checkpoint=JsonlCheckpoint(path, source="in")
+        )
+    # Un checkpoint de una versión anterior pudo guardar el fallo igual
+    legacy = JsonlCheckpoint(path, source="in")
+    legacy.add("3", [None, None, None])
+    legacy.flush()
+
+    def recovered(sku: str, url: str, product_id: str | None) -> Any:
+        return f"cat-{sku}", f"sub-{sku}", f"desc de {product_id}"
+
+    with patch(
+        f"{MODULE}.get_product_detail", side_effect=recovered
+    ) as mock_detail:
+        result = update_product_data(
+            sample_data(), checkpoint=JsonlCheckpoint(path, source="in")
+        )
+
+    assert [call.args[0] for call in mock_detail.call_args_list] == ["3"]
+    assert result["categoria_producto"].tolist() == ["cat-1", "cat-2", "cat-3"]
+
+
+def product_html(sku: str) -> str:
+    next_data = json.dumps(
+        {
+            "props": {
+                "pageProps": {
+                    "productData": {"longDescription": f"<p>desc {sku}</p>"}
+                }
+            }
+        }
+    )
+    return (
+        '<ol class="Breadcrumbs-module_breadcrumb__b47ha">'
+        "<li><a>Home</a></li><li><a>Mascotas</a></li>"
+        f"<li><a>cat-{sku}</a></li><li><a>sub-{sku}</a></li></ol>"
+        f'<script id="__NEXT_DATA__">{next_data}</script>'
+    )
+
+
+def fake_fetched(sku: str, url: str, product_id: str | None) -> FetchedDetail:
+    if sku == "1":
+        # La API bastó
+        return FetchedDetail(("cat-1", "sub-1", "desc 1"))
+    if sku == "3":
+        return FetchedDetail((None, None, None), None, html_requested=True)
+    return FetchedDetail((None, None, None), product_html(sku), True)
+
+
+@pytest.mark.parametrize("queue_size", [1, 8])
+def test_update_product_data_with_parse_pool(
+    tmp_path: Path, queue_size: int
+) -> None:
+    checkpoint = JsonlCheckpoint(tmp_path / "ckpt.jsonl", source="in")
+
+    with patch(f"{MODULE}.fetch_product_detail", side_effect=fake_fetched):
+        result = update_product_data(
+            sample_data(),
+            max_workers=2,
+            checkpoint=checkpoint,
+            parse_workers=2,
+            queue_size=queue_size,
+        )
+
+    assert result["categoria_producto"].tolist() == ["cat-1", "cat-2", None]
+    assert result["sub_categoria_producto"].tolist() == ["sub-1", "sub-2", None]
+    assert result["descripcion_producto"].tolist() == ["desc 1", "desc 2", None]
+    assert set(checkpoint.load()) == {"1", "2"}
+
+
+def test_update_product_data_reuses_unchanged_skus() -> None:
+    data = sample_data().assign(
+        nombre="Producto", marca="Marca", precio_publico=10.0
+    )
+    previous = EXPECTED.assign(
+        nombre="Producto",
+        marca="Marca",
+        precio_publico=[10.0, 99.0, 10.0],  # el sku 2 cambió de precio
+        categoria_producto=["vieja-1", "vieja-2", None],
+        # El sku 3 quedó sin detalle y se vuelve a pedir
+        descripcion_producto=["previa", "previa", None],
+    )
+
+    with patch(
+        f"{MODULE}.get_product_detail", side_effect=fake_detail
+    ) as mock_detail:
+        result = update_product_data(data, previous=previous)
+
+    fetched = sorted(call.args[0] for call in mock_detail.call_args_list)
+    assert fetched == ["2", "3"]
+    assert result["categoria_producto"].tolist() == ["vieja-1", "cat-2", None]
+    assert result["descripcion_producto"].tolist() == [
+        "previa",
+        "desc de p2",
+        None,
+    ]
+
+
+def test_load_previous_snapshot_filters_postgres_chunks() -> None:
+    data = sample_data().assign(nombre="Producto", precio_publico=10.0)
+    chunks = [
+        pd.DataFrame(
+            {
+                "sku": ["1", "2"],
+                "nombre": "Producto",
+                "precio_publico": [10.0, 99.0],  # el sku 2 cambió de precio
+                "categoria_producto": ["c1", "c2"],
+            }
+        ),
+        # El sku 9 ya no está en el listado
+        pd.DataFrame(
+            {
+                "sku": ["3", "9"],
+                "nombre": "Producto",
+                "precio_publico": 10.0,
+                "categoria_producto": ["c3", "c9"],
+            }
+        ),
+    ]
+
+    with (
+        patch("services.postgres.default_postgres_config"),
+        patch("services.postgres.PostgresManager") as mock_manager,
+    ):
+        mock_manager.return_value.iter_dataframes.return_value = iter(chunks)
+        previous = load_previous_snapshot("postgres", data)
+
+    assert previous is not None
+    assert previous["sku"].tolist() == ["1", "3"]
+    assert previous["categoria_producto"].tolist() == ["c1", "c3"]
@@ -1,9 +1,19 @@
 from typing import Any
 from unittest.mock import MagicMock, patch
 
+import pytest
+from pydantic import ValidationError
+
+from core.settings import settings
 from scraper.scrapers.sagafalabella.parser import (
+    detail_stats,
+    find_detail_fragments,
     get_prices,
+    get_product_data,
     get_product_detail,
+    get_products_data,
+    parse_product_detail,
+    parse_product_detail_soup,
 )
 from scraper.scrapers.sagafalabella.schemas import RawProduct
 
@@ -35,10 +45,8 @@ def test_get_prices_with_all_types() -> None:
     assert cmr == 70.0
 
 
-@patch("scraper.scrapers.sagafalabella.parser.fetch_html_product_extra_details")
-def test_get_product_detail_success(mock_fetch: MagicMock) -> None:
-    # Simulamos el HTML con la estructura de breadcrumbs requerida
-    mock_html: str = """
+# Simulamos el HTML con la estructura de breadcrumbs requerida
+MOCK_PRODUCT_HTML: str = """
     <html>
         <body>
             <ol class="Breadcrumbs-module_breadcrumb__b47ha">
@@ -61,7 +69,41 @@ def test_get_product_detail_success(mock_fetch: MagicMock) -> None:
         </body>
     </html>
     """
-    mock_fetch.return_value = mock_html
+
+
+def test_get_products_data_matches_per_product() -> None:
+    products: list[dict[str, Any]] = [
+        {
+            "displayName": f"Alimento {i} kg",
+            "skuId": str(i),
+            "productId": f"p{i}",
+            "url": f"http://fake/{i}",
+            "prices": [{"type": "internetPrice", "price": [f"{i}0.00"]}],
+        }
+        for i in range(1, 4)
+    ]
+
+    result = get_products_data("perro", products, "Alimentos")
+
+    dates = {"fecha_extraccion_inicio", "fecha_extraccion_final"}
+    assert [p.model_dump(exclude=dates) for p in result] == [
+        get_product_data("perro", p, "Alimentos").model_dump(exclude=dates)
+        for p in products
+    ]
+    # Una sola marca de tiempo de inicio y de fin para toda la página
+    assert len({p.fecha_extraccion_inicio for p in result}) == 1
+    assert len({p.fecha_extraccion_final for p in result}) == 1
+    assert result[0].fecha_extraccion_inicio <= result[0].fecha_extraccion_final
+
+
+def test_get_products_data_rejects_invalid_product() -> None:
+    with pytest.raises(ValidationError):
+        get_products_data("perro", [{"skuId": "1"}], "Alimentos")
+
+
+@patch("scraper.scrapers.sagafalabella.parser.fetch_html_product_extra_details")
+def test_get_product_detail_success(mock_fetch: MagicMock) -> None:
+    mock_fetch.return_value = MOCK_PRODUCT_HTML
 
     # Ahora desempaquetamos 3 valores
     category, sub_category, description = get_product_detail(
@@ -89,3 +131,103 @@ def test_get_product_detail_fail_gracefully() -> None:
         assert category is None
         assert sub_category is None
         assert description is None
+
+
+def test_fast_path_matches_full_parse() -> None:
+    assert find_detail_fragments(MOCK_PRODUCT_HTML) is not None
+    assert parse_product_detail(
+        "sku_test", MOCK_PRODUCT_HTML
+    ) == parse_product_detail_soup(MOCK_PRODUCT_HTML)
+
+
+def test_parse_product_detail_falls_back_without_breadcrumb() -> None:
+    html = MOCK_PRODUCT_HTML.replace(
+        "Breadcrumbs-module_breadcrumb__b47ha", "otra-clase"
+    )
+    assert find_detail_fragments(html) is None
+
+    category, sub_category, description = parse_product_detail("sku", html)
+
+    assert (category, sub_category) == (None, None)
+    assert description == "Una descripción de prueba"
+
+
+API_BREADCRUMB = [
+    {"label": "Home"},
+    {"label": "Mascotas - Perros"},
+    {"label": "Higiene y cuidados para perros"},
+    {"label": "Antiparasitarios"},
+]
+
+
+@pytest.fixture
+def detail_api_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "DETAIL_API_ENABLED", True)
+
+
+@patch("scraper.scrapers.sagafalabella.parser.fetch_html_product_extra_details")
+@patch("scraper.scrapers.sagafalabella.parser.fetch_api_product_data")
+def test_get_product_detail_skips_api_by_default(
+    mock_api: MagicMock, mock_html: MagicMock
+) -> None:
+    mock_html.return_value = MOCK_PRODUCT_HTML
+
+    detail = get_product_detail("sku_test", "url_test", "prod_test")
+
+    assert detail[2] == "Una descripción de prueba"
+    mock_api.assert_not_called()
+    mock_html.assert_called_once_with("url_test")
+
+
+@pytest.mark.usefixtures("detail_api_enabled")
+@patch("scraper.scrapers.sagafalabella.parser.fetch_html_product_extra_details")
+@patch("scraper.scrapers.sagafalabella.parser.fetch_api_product_data")
+def test_get_product_detail_prefers_api(
+    mock_api: MagicMock, mock_html: MagicMock
+) -> None:
+    mock_api.return_value = {
+        "data": {
+            "breadcrumb": API_BREADCRUMB,
+            "description": "<p>Desde la API</p>",
+        },
+        "size": 100,
+    }
+    detail_stats.reset()
+
+    detail = get_product_detail("sku_test", "url_test", "prod_test")
+
+    assert detail == (
+        "Higiene y cuidados para perros",
+        "Antiparasitarios",
+        "Desde la API",
+    )
+    mock_api.assert_called_once_with("prod_test")
+    mock_html.assert_not_called()
+    assert detail_stats.hits["api"] == 1
+    assert detail_stats.bytes["api"] == 100
+
+
+@pytest.mark.usefixtures("detail_api_enabled")
+@patch("scraper.scrapers.sagafalabella.parser.fetch_html_product_extra_details")
+@patch("scraper.scrapers.sagafalabella.parser.fetch_api_product_data")
+def test_get_product_detail_falls_back_to_html(
+    mock_api: MagicMock, mock_html: MagicMock
+) -> None:
+    # La API no trae descripción: se completa desde el HTML
+    mock_api.return_value = {
+        "data": {"breadcrumb": API_BREADCRUMB[:3]},
+        "size": 50,
+    }
+    mock_html.return_value = MOCK_PRODUCT_HTML
+    detail_stats.reset()
+
+    detail = get_product_detail("sku_test", "url_test", "prod_test")
+
+    assert detail == (
+        "Higiene y cuidados para perros",
+        "Antiparasitarios",
+        "Una descripción de prueba",
+    )
+    mock_html.assert_called_once_with("url_test")
+    assert detail_stats.requests == {"api": 1, "html": 1}
+    assert detail_stats.hits == {"api": 0, "html": 1}
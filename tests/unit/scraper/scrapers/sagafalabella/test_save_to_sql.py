@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from core.schemas import PostgresConfig
+from scraper.scrapers.sagafalabella.jobs.save_to_sql import (
+    diff_snapshots,
+    main,
+    parse_args,
+    save_history,
+)
+from services.postgres import PostgresManager
+
+
+def snapshot(prices: dict[str, float], date: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "sku": list(prices),
+            "nombre": [f"Producto {sku}" for sku in prices],
+            "precio_publico": list(prices.values()),
+            "fecha_extraccion_inicio": [date] * len(prices),
+            "fecha_extraccion_final": [date] * len(prices),
+        }
+    )
+
+
+def test_diff_snapshots_ignores_extraction_dates() -> None:
+    previous = snapshot({"1": 10.0, "2": 20.0, "3": 30.0}, "2024-01-01")
+    current = snapshot({"1": 10.0, "2": 25.0, "4": 40.0}, "2024-01-02")
+
+    diff = diff_snapshots(current, previous)
+
+    assert diff.inserted["sku"].tolist() == ["4"]
+    assert diff.changed["sku"].tolist() == ["2"]
+    assert diff.removed == ["3"]
+
+
+@pytest.fixture
+def memory_db_manager() -> PostgresManager:
+    config = PostgresConfig(
+        host="localhost", port=5432, user="u", password="p", database="d"
+    )
+    manager = PostgresManager(config)
+    manager.engine = create_engine("sqlite:///:memory:")
+    return manager
+
+
+def test_save_history_writes_only_changes(
+    memory_db_manager: PostgresManager,
+) -> None:
+    day_1 = snapshot({"1": 10.0, "2": 20.0, "3": 30.0}, "2024-01-01T08:00:00")
+    day_2 = snapshot({"1": 10.0, "2": 25.0, "4": 40.0}, "2024-01-02T08:00:00")
+
+    save_history(memory_db_manager, day_1, table_name="hist", schema=None)
+    save_history(memory_db_manager, day_2, table_name="hist", schema=None)
+
+    rows = memory_db_manager.execute_query(
+        "SELECT sku, precio_publico, valido_hasta IS NULL AS vigente "
+        "FROM hist ORDER BY sku, valido_desde"
+    )
+    # 3 versiones del día 1 + 2 del día 2 (sku 2 modificado y sku 4 nuevo)
+    assert [(r["sku"], r["precio_publico"], r["vigente"]) for r in rows] == [
+        ("1", 10.0, 1),
+        ("2", 20.0, 0),
+        ("2", 25.0, 1),
+        ("3", 30.0, 0),
+        ("4", 40.0, 1),
+    ]
+
+    # Sin cambios no se escribe nada
+    diff = save_history(
+        memory_db_manager, day_2, table_name="hist", schema=None
+    )
+    assert diff.inserted.empty and diff.changed.empty and not diff.removed
+    assert len(memory_db_manager.execute_query("SELECT * FROM hist")) == 5
+
+
+def test_parse_args_partition_retention_is_opt_in() -> None:
+    args = parse_args(["--mode", "partitioned"])
+
+    assert args.retention_days == 0
+    assert not args.migrate
+    assert not args.detach_partitions
+
+
+@pytest.mark.parametrize("mode", ["snapshot", "upsert"])
+@patch(
+    "scraper.scrapers.sagafalabella.jobs.save_to_sql.default_postgres_config"
+)
+@patch("scraper.scrapers.sagafalabella.jobs.save_to_sql.PostgresManager")
+@patch("scraper.scrapers.sagafalabella.jobs.save_to_sql.DataLakeManager")
+def test_main_rejects_partitioned_table_outside_partitioned_mode(
+    mock_datalake: MagicMock,
+    mock_manager: MagicMock,
+    mock_config: MagicMock,
+    mode: str,
+) -> None:
+    data = snapshot({"1": 10.0}, "2024-01-01T08:00:00").assign(url="u")
+    mock_datalake.return_value.read_data.return_value = data
+    db = mock_manager.return_value
+    db.is_partitioned.return_value = True
+
+    with pytest.raises(ValueError, match="--mode partitioned"):
+        main(["--mode", mode])
+
+    db.save_dataframe.assert_not_called()
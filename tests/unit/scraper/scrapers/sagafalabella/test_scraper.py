@@ -0,0 +1,289 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pyarrow.parquet as pq
+import pytest
+
+from core.settings import settings
+from scraper.scrapers.sagafalabella.jobs.scraper import (
+    aiter_scraped_pages,
+    iter_scraped_pages,
+    main,
+    scrape,
+    scrape_async,
+)
+from scraper.scrapers.sagafalabella.schemas import (
+    CategoryMetadata,
+    ListingPage,
+    SCRAPED_PRODUCT_SCHEMA,
+    ScrapedProduct,
+)
+
+FAKE_LOOKUP: dict[str, CategoryMetadata] = {
+    "CAT_P1": {
+        "animal": "perro",
+        "category_label": "Alimentos",
+        "category_url": "Alimento-para-perros",
+    },
+    "CAT_P2": {
+        "animal": "perro",
+        "category_label": "Camas",
+        "category_url": "Camas",
+    },
+    "CAT_G1": {
+        "animal": "gato",
+        "category_label": "Alimentos",
+        "category_url": "Alimento-para-gatos",
+    },
+}
+
+
+def _product(sku: str) -> dict[str, Any]:
+    return {
+        "displayName": f"Producto {sku} 3kg",
+        "skuId": sku,
+        "productId": f"p{sku}",
+        "url": f"http://fake/{sku}",
+        "prices": [{"type": "internetPrice", "price": ["10.00"]}],
+    }
+
+
+# Páginas por categoría; el sku 2 se repite entre categorías del mismo animal
+# y el sku 1 aparece también en gato
+FAKE_PAGES: dict[str, list[list[dict[str, Any]]]] = {
+    "CAT_P1": [[_product("1"), _product("2")], [_product("3")]],
+    "CAT_P2": [[_product("2"), _product("4")]],
+    "CAT_G1": [[_product("1")], [_product("5")], [_product("6")]],
+}
+
+
+def make_fake_fetch(with_pagination: bool):
+    requested: list[tuple[str, int]] = []
+
+    def fake_fetch_listing_page(
+        page: int, category_id: str, category_name: str
+    ) -> ListingPage:
+        requested.append((category_id, page))
+        pages = FAKE_PAGES[category_id]
+        results = pages[page - 1] if page <= len(pages) else []
+        total_pages = len(pages) if with_pagination else None
+        return {"results": results, "total_pages": total_pages}
+
+    return fake_fetch_listing_page, requested
+
+
+@pytest.mark.parametrize("with_pagination", [True, False])
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_scrape_dedupes_per_animal_in_order(
+    max_workers: int, with_pagination: bool
+) -> None:
+    fake_fetch, requested = make_fake_fetch(with_pagination)
+
+    with (
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.CATEGORY_LOOKUP",
+            FAKE_LOOKUP,
+        ),
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.fetch_listing_page",
+            side_effect=fake_fetch,
+        ),
+    ):
+        result = scrape(max_workers=max_workers)
+
+    # Con metadata no se pide la página vacía extra de cada categoría
+    total_pages = sum(len(pages) for pages in FAKE_PAGES.values())
+    extra_requests = 0 if with_pagination else len(FAKE_PAGES)
+    assert len(requested) == total_pages + extra_requests
+
+    assert [(p.categoria_animal, p.sku) for p in result] == [
+        ("perro", "1"),
+        ("perro", "2"),
+        ("perro", "3"),
+        ("perro", "4"),
+        ("gato", "1"),
+        ("gato", "5"),
+        ("gato", "6"),
+    ]
+    # El peso solo se extrae para la categoría Alimentos
+    assert result[0].peso_considerado == "3 kg"
+    assert result[3].peso_considerado is None
+
+
+@pytest.mark.parametrize("with_pagination", [True, False])
+def test_scrape_async_matches_sync(with_pagination: bool) -> None:
+    fake_fetch, _ = make_fake_fetch(with_pagination)
+
+    async def fake_fetch_async(
+        client: Any, page: int, category_id: str, category_name: str
+    ) -> ListingPage:
+        return fake_fetch(page, category_id, category_name)
+
+    with (
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.CATEGORY_LOOKUP",
+            FAKE_LOOKUP,
+        ),
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.fetch_listing_page",
+            side_effect=fake_fetch,
+        ),
+        patch(
+            "scraper.scrapers.sagafalabella.async_client.fetch_listing_page",
+            side_effect=fake_fetch_async,
+        ),
+    ):
+        expected = scrape(max_workers=1)
+        result = asyncio.run(scrape_async(client=MagicMock()))
+
+    def key(p: ScrapedProduct) -> tuple[str, ...]:
+        return (p.categoria_animal, p.sku, str(p.peso_considerado))
+
+    assert [key(p) for p in result] == [key(p) for p in expected]
+
+
+def test_main_streams_pages_to_parquet(tmp_path: Path) -> None:
+    fake_fetch, _ = make_fake_fetch(with_pagination=True)
+
+    with (
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.CATEGORY_LOOKUP",
+            FAKE_LOOKUP,
+        ),
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.fetch_listing_page",
+            side_effect=fake_fetch,
+        ),
+        patch.object(settings, "TMP_DIR", tmp_path),
+        patch.object(settings, "DATASET_MAX_ROWS_PER_GROUP", 4),
+    ):
+        expected = scrape(max_workers=1)
+        main(["--workers", "2"])
+
+    parquet = pq.ParquetFile(tmp_path / "saga_falabella.parquet")
+    assert parquet.schema_arrow == SCRAPED_PRODUCT_SCHEMA
+    # Las páginas se juntan en row groups de 4 filas (el último, el resto)
+    sizes = [
+        parquet.metadata.row_group(i).num_rows
+        for i in range(parquet.metadata.num_row_groups)
+    ]
+    assert sizes[:-1] == [4] * (len(sizes) - 1)
+    assert 0 < sizes[-1] <= 4
+    assert sum(sizes) == len(expected)
+
+    table = parquet.read()
+    assert table.column("sku").to_pylist() == [p.sku for p in expected]
+    assert table.column("peso_considerado").to_pylist() == [
+        p.peso_considerado for p in expected
+    ]
+    assert not (tmp_path / "saga_falabella.parquet.partial").exists()
+
+
+MANY_PAGES: dict[str, list[list[dict[str, Any]]]] = {
+    cat_id: [[_product(f"{cat_id}-{page}")] for page in range(30)]
+    for cat_id in FAKE_LOOKUP
+}
+
+
+def make_many_pages_fetch():
+    requested: list[tuple[str, int]] = []
+
+    def fake_fetch_listing_page(
+        page: int, category_id: str, category_name: str
+    ) -> ListingPage:
+        requested.append((category_id, page))
+        pages = MANY_PAGES[category_id]
+        return {"results": pages[page - 1], "total_pages": len(pages)}
+
+    return fake_fetch_listing_page, requested
+
+
+def test_iter_scraped_pages_bounds_pages_in_flight() -> None:
+    fake_fetch, requested = make_many_pages_fetch()
+    window = 3
+
+    with (
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.CATEGORY_LOOKUP",
+            FAKE_LOOKUP,
+        ),
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.fetch_listing_page",
+            side_effect=fake_fetch,
+        ),
+    ):
+        pages = iter_scraped_pages(max_workers=2, window=window)
+        next(pages)
+        # Primeras páginas por adelantado + ventana de páginas + la entregada
+        assert len(requested) <= 2 * window + 2
+        rest = list(pages)
+
+    assert len(rest) == 3 * 30 - 1
+    assert len(requested) == 3 * 30
+
+
+def test_aiter_scraped_pages_bounds_pages_in_flight() -> None:
+    fake_fetch, requested = make_many_pages_fetch()
+    window = 3
+
+    async def fake_fetch_async(
+        client: Any, page: int, category_id: str, category_name: str
+    ) -> ListingPage:
+        return fake_fetch(page, category_id, category_name)
+
+    async def run() -> int:
+        pages = aiter_scraped_pages(client=MagicMock(), window=window)
+        await anext(pages)
+        in_flight = len(requested)
+        await pages.aclose()
+        return in_flight
+
+    with (
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.CATEGORY_LOOKUP",
+            FAKE_LOOKUP,
+        ),
+        patch(
+            "scraper.scrapers.sagafalabella.async_client.fetch_listing_page",
+            side_effect=fake_fetch_async,
+        ),
+    ):
+        in_flight = asyncio.run(run())
+
+    assert in_flight <= 2 * window + 2
+
+
+def test_main_async_streams_pages_to_parquet(tmp_path: Path) -> None:
+    fake_fetch, _ = make_fake_fetch(with_pagination=True)
+
+    async def fake_fetch_async(
+        client: Any, page: int, category_id: str, category_name: str
+    ) -> ListingPage:
+        return fake_fetch(page, category_id, category_name)
+
+    with (
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.CATEGORY_LOOKUP",
+            FAKE_LOOKUP,
+        ),
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.fetch_listing_page",
+            side_effect=fake_fetch,
+        ),
+        patch(
+            "scraper.scrapers.sagafalabella.async_client.fetch_listing_page",
+            side_effect=fake_fetch_async,
+        ),
+        patch(
+            "scraper.scrapers.sagafalabella.jobs.scraper.AsyncHttpClient",
+            MagicMock(),
+        ),
+        patch.object(settings, "TMP_DIR", tmp_path),
+    ):
+        expected = scrape(max_workers=1)
+        main(["--use-async"])
+
+    table = pq.read_table(tmp_path / "saga_falabella.parquet")
+    assert table.column("sku").to_pylist() == [p.sku for p in expected]
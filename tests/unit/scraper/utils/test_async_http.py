@@ -0,0 +1,91 @@
+import asyncio
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.schemas import HttpClientConfig
+from scraper.utils.async_http import AsyncHttpClient
+
+
+def test_get_limits_in_flight_requests_per_host() -> None:
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request: web.Request) -> web.Response:
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return web.json_response({"ok": True})
+
+    async def run() -> list[int]:
+        app = web.Application()
+        app.router.add_get("/", handler)
+        async with TestServer(app) as server:
+            config = HttpClientConfig(per_host_limit=3, rate_limit=False)
+            async with AsyncHttpClient(config) as client:
+                results = await asyncio.gather(
+                    *(client.get(str(server.make_url("/"))) for _ in range(12))
+                )
+        return [r.status_code for r in results]
+
+    assert asyncio.run(run()) == [200] * 12
+    assert state["max_in_flight"] == 3
+
+
+def test_get_retries_transient_status() -> None:
+    calls = {"n": 0}
+
+    async def handler(request: web.Request) -> web.Response:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return web.Response(status=503)
+        return web.Response(text="listo")
+
+    async def run() -> tuple[int, str]:
+        app = web.Application()
+        app.router.add_get("/", handler)
+        async with TestServer(app) as server:
+            config = HttpClientConfig(rate_limit=False)
+            async with AsyncHttpClient(config) as client:
+                result = await client.get(str(server.make_url("/")))
+        return result.status_code, result.text
+
+    async def no_sleep(delay: float) -> None:
+        return None
+
+    with patch("scraper.utils.async_http.asyncio.sleep", side_effect=no_sleep):
+        assert asyncio.run(run()) == (200, "listo")
+    assert calls["n"] == 2
+
+
+def test_get_reads_headers_case_insensitively() -> None:
+    calls = {"n": 0}
+    delays: list[float] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return web.Response(status=429, headers={"retry-after": "7"})
+        return web.Response(text="listo", headers={"etag": '"v1"'})
+
+    async def run() -> tuple[int, str | None]:
+        app = web.Application()
+        app.router.add_get("/", handler)
+        async with TestServer(app) as server:
+            config = HttpClientConfig(backoff_max=1, rate_limit=False)
+            async with AsyncHttpClient(config) as client:
+                result = await client.get(str(server.make_url("/")))
+        return result.status_code, result.headers.get("ETag")
+
+    async def fake_sleep(delay: float) -> None:
+        # aiohttp también duerme 0 internamente; solo interesan las esperas
+        if delay:
+            delays.append(delay)
+
+    with patch(
+        "scraper.utils.async_http.asyncio.sleep", side_effect=fake_sleep
+    ):
+        assert asyncio.run(run()) == (200, '"v1"')
+    # Se respetó el retry-after en minúsculas, aunque supere a backoff_max
+    assert delays == [7]
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from scraper.utils.checkpoint import JsonlCheckpoint
+
+
+def test_records_survive_reload(tmp_path: Path) -> None:
+    path = tmp_path / "ckpt.jsonl"
+    checkpoint = JsonlCheckpoint(path, source="a", flush_every=2)
+    checkpoint.add("1", ["cat", "sub", "desc"])
+    assert not path.exists()
+
+    checkpoint.add("2", [None, None, None])
+    assert path.exists()
+
+    reloaded = JsonlCheckpoint(path, source="a")
+    assert reloaded.load() == {
+        "1": ["cat", "sub", "desc"],
+        "2": [None, None, None],
+    }
+
+
+def test_checkpoint_from_other_source_is_discarded(tmp_path: Path) -> None:
+    path = tmp_path / "ckpt.jsonl"
+    checkpoint = JsonlCheckpoint(path, source="a")
+    checkpoint.add("1", "x")
+    checkpoint.flush()
+
+    assert JsonlCheckpoint(path, source="b").load() == {}
+    assert not path.exists()
+
+
+def test_truncated_line_is_skipped(tmp_path: Path) -> None:
+    path = tmp_path / "ckpt.jsonl"
+    checkpoint = JsonlCheckpoint(path, source="a")
+    checkpoint.add("1", "x")
+    checkpoint.flush()
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"key": "2", "val')
+
+    assert JsonlCheckpoint(path, source="a").load() == {"1": "x"}
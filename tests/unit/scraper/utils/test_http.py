@@ -0,0 +1,115 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from core.schemas import HttpClientConfig
+from scraper.utils.http import (
+    HttpClient,
+    compute_backoff,
+    parse_retry_after,
+    retry_delay,
+)
+
+
+def _response(status_code: int, headers: dict[str, str] | None = None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 2, 5, 10])
+def test_compute_backoff_is_bounded(attempt: int) -> None:
+    delay = compute_backoff(attempt, factor=0.5, max_backoff=4)
+    assert 0 <= delay <= min(4, 0.5 * 2**attempt)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("3", 3.0), ("0.5", 0.5), ("-1", 0.0), (None, None), ("basura", None)],
+)
+def test_parse_retry_after(value: str | None, expected: float | None) -> None:
+    assert parse_retry_after(value) == expected
+
+
+@patch("scraper.utils.http.time.sleep")
+@patch("requests.Session.get")
+def test_get_retries_transient_status_then_succeeds(
+    mock_get: MagicMock, mock_sleep: MagicMock
+) -> None:
+    mock_get.side_effect = [
+        _response(503),
+        _response(429, {"Retry-After": "2"}),
+        _response(200),
+    ]
+
+    client = HttpClient(HttpClientConfig(max_retries=3, rate_limit=False))
+    response = client.get("http://fake-url.com")
+
+    assert response.status_code == 200
+    assert mock_get.call_count == 3
+    # La segunda espera respeta el Retry-After del 429
+    assert mock_sleep.call_args_list[1].args == (2.0,)
+
+
+@pytest.mark.parametrize(
+    "retry_after, expected", [(45.0, 45.0), (600.0, 120.0), (0.0, None)]
+)
+def test_retry_delay_honours_retry_after(
+    retry_after: float, expected: float | None
+) -> None:
+    config = HttpClientConfig(
+        backoff_factor=0.5, backoff_max=30, retry_after_max=120
+    )
+
+    delay = retry_delay(config, 0, retry_after, "http://fake-url.com")
+
+    # Retry-After supera a backoff_max y solo lo acota retry_after_max; si
+    # es menor que el backoff, manda el backoff
+    if expected is None:
+        assert 0 <= delay <= 0.5
+    else:
+        assert delay == expected
+
+
+@patch("scraper.utils.http.time.sleep")
+@patch("requests.Session.get")
+def test_get_waits_retry_after_beyond_backoff_max(
+    mock_get: MagicMock, mock_sleep: MagicMock
+) -> None:
+    mock_get.side_effect = [
+        _response(429, {"Retry-After": "60"}),
+        _response(200),
+    ]
+
+    client = HttpClient(
+        HttpClientConfig(backoff_max=30, retry_after_max=300, rate_limit=False)
+    )
+
+    assert client.get("http://fake-url.com").status_code == 200
+    mock_sleep.assert_called_once_with(60.0)
+
+
+@patch("scraper.utils.http.time.sleep")
+@patch("requests.Session.get")
+def test_get_reraises_network_error_after_retries(
+    mock_get: MagicMock, mock_sleep: MagicMock
+) -> None:
+    mock_get.side_effect = requests.Timeout("Timeout")
+
+    client = HttpClient(HttpClientConfig(max_retries=1))
+    with pytest.raises(requests.Timeout):
+        client.get("http://fake-url.com")
+
+    assert mock_get.call_count == 2
+
+
+@patch("requests.Session.get")
+def test_get_does_not_retry_client_errors(mock_get: MagicMock) -> None:
+    mock_get.return_value = _response(404)
+
+    response = HttpClient().get("http://fake-url.com")
+
+    assert response.status_code == 404
+    mock_get.assert_called_once()
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+from scraper.utils.http_cache import HttpCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path: Path, clock: FakeClock) -> HttpCache:
+    return HttpCache(
+        tmp_path / "cache.sqlite", ttl=60, max_bytes=1000, clock=clock
+    )
+
+
+def test_fresh_entry_is_served_without_request(
+    cache: HttpCache, clock: FakeClock
+) -> None:
+    cache.handle_response("u", None, 200, "<html>1</html>", {"ETag": '"v1"'})
+
+    entry = cache.lookup("u")
+    assert entry is not None
+    assert cache.is_fresh(entry)
+    assert cache.use_fresh(entry) == "<html>1</html>"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_stale_entry_is_revalidated_with_304(
+    cache: HttpCache, clock: FakeClock
+) -> None:
+    cache.handle_response(
+        "u",
+        None,
+        200,
+        "<html>1</html>",
+        {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+    )
+    clock.now += 120
+
+    entry = cache.lookup("u")
+    assert entry is not None
+    assert not cache.is_fresh(entry)
+    assert HttpCache.conditional_headers(entry) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+
+    body = cache.handle_response("u", entry, 304, "", {})
+    assert body == "<html>1</html>"
+    assert cache.revalidated == 1
+    assert cache.bytes_saved == len("<html>1</html>")
+
+    # El 304 renueva la vigencia
+    refreshed = cache.lookup("u")
+    assert refreshed is not None and cache.is_fresh(refreshed)
+
+
+def test_error_status_is_not_cached(cache: HttpCache) -> None:
+    assert cache.handle_response("u", None, 500, "error", {}) is None
+    assert cache.lookup("u") is None
+
+
+def test_lru_eviction_keeps_total_under_limit(
+    cache: HttpCache, clock: FakeClock
+) -> None:
+    for url in ["a", "b", "c"]:
+        clock.now += 1
+        cache.store(url, "x" * 400, None, None)
+        if url == "b":
+            # Usamos "a" para que "b" pase a ser la menos reciente
+            clock.now += 1
+            cache.lookup("a")
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None
+    assert cache.lookup("c") is not None
+
+
+def test_entries_persist_across_instances(
+    tmp_path: Path, clock: FakeClock
+) -> None:
+    path = tmp_path / "cache.sqlite"
+    first = HttpCache(path, ttl=60, max_bytes=1000, clock=clock)
+    first.store("u", "body", None, None)
+    first.close()
+
+    second = HttpCache(path, ttl=60, max_bytes=1000, clock=clock)
+    entry = second.lookup("u")
+    assert entry is not None and entry.body == "body"
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+import pytest
+
+from scraper.utils.prefetch import aiter_ordered_results, iter_ordered_results
+
+
+class Tracker:
+    """Cuenta las llamadas iniciadas cuyo resultado aún no se consumió."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started = 0
+        self.consumed = 0
+        self.max_pending = 0
+
+    def start(self) -> None:
+        with self.lock:
+            self.started += 1
+            self.max_pending = max(
+                self.max_pending, self.started - self.consumed
+            )
+
+
+@pytest.mark.parametrize("window", [1, 3])
+def test_iter_ordered_results_keeps_order_and_window(window: int) -> None:
+    tracker = Tracker()
+
+    def calls() -> Iterator[Callable[[], int]]:
+        for i in range(20):
+
+            def call(i: int = i) -> int:
+                tracker.start()
+                return i
+
+            yield call
+
+    results = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for result in iter_ordered_results(executor, calls(), window):
+            results.append(result)
+            tracker.consumed += 1
+
+    assert results == list(range(20))
+    # La ventana más el resultado que se está entregando
+    assert tracker.max_pending <= window + 1
+
+
+def test_aiter_ordered_results_keeps_order_and_window() -> None:
+    tracker = Tracker()
+
+    async def fetch(i: int) -> int:
+        tracker.start()
+        # Las primeras tardan más: el orden no depende de cuál termina antes
+        await asyncio.sleep(0.01 if i < 3 else 0)
+        return i
+
+    async def run() -> list[int]:
+        results = []
+        calls = (lambda i=i: fetch(i) for i in range(10))
+        async for result in aiter_ordered_results(calls, window=3):
+            results.append(result)
+            tracker.consumed += 1
+        return results
+
+    assert asyncio.run(run()) == list(range(10))
+    assert tracker.max_pending <= 3 + 1
+
+
+def test_aiter_ordered_results_cancels_pending_on_close() -> None:
+    cancelled = []
+
+    async def fetch(i: int) -> int:
+        try:
+            await asyncio.sleep(0 if i == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+        return i
+
+    async def run() -> None:
+        results = aiter_ordered_results(
+            (lambda i=i: fetch(i) for i in range(10)), window=3
+        )
+        assert await anext(results) == 0
+        await results.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert sorted(cancelled) == [1, 2, 3]
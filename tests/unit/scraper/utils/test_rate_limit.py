@@ -0,0 +1,84 @@
+import pytest
+
+from core.schemas import RateLimiterConfig
+from scraper.utils.rate_limit import AdaptiveRateLimiter, HostRateLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def make_limiter(clock: FakeClock, **kwargs: float) -> AdaptiveRateLimiter:
+    config = RateLimiterConfig(
+        initial_rate=10, min_rate=1, max_rate=20, latency_window=20, **kwargs
+    )
+    return AdaptiveRateLimiter(config, clock=clock)
+
+
+def test_reserve_spaces_requests_at_current_rate(clock: FakeClock) -> None:
+    limiter = make_limiter(clock)
+
+    waits = [limiter.reserve() for _ in range(3)]
+
+    assert waits == pytest.approx([0.0, 0.1, 0.2])
+
+
+def test_fast_responses_increase_rate_up_to_max(clock: FakeClock) -> None:
+    limiter = make_limiter(clock)
+
+    for _ in range(1000):
+        limiter.record(200, latency=0.1)
+
+    assert limiter.rate == 20
+
+
+def test_throttle_halves_rate_once_per_burst(clock: FakeClock) -> None:
+    limiter = make_limiter(clock)
+
+    # Tres 429 simultáneos cuentan como una sola señal
+    for _ in range(3):
+        limiter.record(429, latency=0.1)
+    assert limiter.rate == 5
+    assert limiter.throttled == 3
+
+    clock.now = 2.0
+    limiter.record(None, latency=10)
+    assert limiter.rate == 2.5
+
+
+def test_retry_after_blocks_host(clock: FakeClock) -> None:
+    limiter = make_limiter(clock)
+
+    limiter.record(429, latency=0.1, retry_after=5)
+
+    assert limiter.reserve() == pytest.approx(5)
+
+
+def test_rising_p95_latency_decreases_rate(clock: FakeClock) -> None:
+    limiter = make_limiter(clock)
+
+    for _ in range(20):
+        limiter.record(200, latency=0.1)
+    rate_before = limiter.rate
+
+    for _ in range(20):
+        limiter.record(200, latency=1.0)
+
+    assert limiter.rate < rate_before
+
+
+def test_host_rate_limiter_is_per_host() -> None:
+    registry = HostRateLimiter(RateLimiterConfig())
+
+    a = registry.for_url("https://a.com/x")
+    assert registry.for_url("https://a.com/y") is a
+    assert registry.for_url("https://b.com/x") is not a
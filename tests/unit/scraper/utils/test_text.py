@@ -1,8 +1,16 @@
 from typing import Union
+from unittest.mock import patch
 
+import pandas as pd
 import pytest
 
-from scraper.utils.text import clean_html, get_weight_from_text
+from scraper.utils.text import (
+    clean_html,
+    extract_text,
+    get_weight_columns,
+    get_weight_from_text,
+    weight_to_grams,
+)
 
 # --- Tests para clean_html ---
 
@@ -15,10 +23,36 @@ from scraper.utils.text import clean_html, get_weight_from_text
         ("<script>alert('error')</script><p>Contenido</p>", "Contenido"),
         ("   ", None),
         ("<div>Línea 1</div>\n\n<div>Línea 2</div>", "Línea 1 Línea 2"),
+        # Sin tags: no pasa por BeautifulSoup
+        ("  Texto\t\tplano \n\n  en líneas  ", "Texto plano en líneas"),
+        ("Perros &amp; gatos", "Perros & gatos"),
+        ("&amp;lt;b&amp;gt;doble&amp;lt;/b&amp;gt;", "<b>doble</b>"),
+        ("", None),
     ],
 )
 def test_clean_html(input_html: str, expected_output: Union[str, None]):
     assert clean_html(input_html) == expected_output
+    # La segunda llamada sale de la cache con el mismo resultado
+    assert clean_html(input_html) == expected_output
+
+
+def test_extract_text_skips_parser_for_plain_text() -> None:
+    with patch("scraper.utils.text.BeautifulSoup") as mock_soup:
+        assert extract_text("  Texto plano  ") == "Texto plano"
+        mock_soup.assert_not_called()
+
+
+def test_clean_html_memoizes_results() -> None:
+    texto = "<p>Descripción <b>única</b> para la cache</p>"
+
+    with patch(
+        "scraper.utils.text.extract_text", wraps=extract_text
+    ) as mock_extract:
+        first = clean_html(texto)
+        second = clean_html(texto)
+
+    assert first == second == "Descripción única para la cache"
+    mock_extract.assert_called_once_with(texto)
 
 
 # --- Tests para get_weight_from_text ---
@@ -39,3 +73,31 @@ def test_get_weight_from_text(
     input_text: str, expected_weight: Union[str, None]
 ):
     assert get_weight_from_text(input_text) == expected_weight
+
+
+WEIGHT_NAMES = [
+    "Arroz Costeño 5kg",
+    "Harina 500gr",
+    "Detergente 2.5 Kg",
+    "Aceite 900 g",
+    "Pack de 12 latas",
+    "Queso 250,5 gr",
+]
+
+
+def test_get_weight_columns_matches_per_row() -> None:
+    result = get_weight_columns(pd.Series(WEIGHT_NAMES))
+
+    expected = [get_weight_from_text(name) for name in WEIGHT_NAMES]
+    assert result["peso_considerado"].tolist() == expected
+    assert result["peso_gramos"].tolist() == pytest.approx(
+        [5000.0, 500.0, 2500.0, 900.0, float("nan"), 250.5], nan_ok=True
+    )
+    # El valor numérico es el mismo que el del camino por fila
+    assert [
+        weight_to_grams(peso) for peso in expected if peso is not None
+    ] == result["peso_gramos"].dropna().tolist()
+
+
+def test_weight_to_grams_without_weight() -> None:
+    assert weight_to_grams(None) is None
@@ -1,9 +1,32 @@
-from unittest.mock import patch
+from datetime import date
+from typing import Any, Iterator
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
+import pyarrow as pa
+import pytest
 
 from core.schemas import PostgresConfig
-from services.postgres import PostgresManager
+from core.settings import settings
+from services.postgres import (
+    IterStream,
+    PostgresManager,
+    build_upsert_sql,
+    dispose_engines,
+    drop_duplicate_keys,
+    iter_csv_chunks,
+    partition_bounds,
+    partition_upper_bound,
+    split_row_ranges,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_engines() -> Iterator[None]:
+    # Cada test crea su engine (mockeado) en vez de reutilizar el de otro
+    dispose_engines()
+    yield
+    dispose_engines()
 
 
 def test_save_dataframe_calls_to_sql() -> None:
@@ -14,7 +37,11 @@ def test_save_dataframe_calls_to_sql() -> None:
     df = pd.DataFrame({"col1": [1, 2]})
 
     # Mockeamos el engine de sqlalchemy para que no intente conectar
-    with patch("services.postgres.create_engine"):
+    with (
+        patch("services.postgres.create_engine"),
+        patch("services.postgres.inspect") as mock_inspect,
+    ):
+        mock_inspect.return_value.has_table.return_value = False
         manager = PostgresManager(config)
         # Mockeamos el método to_sql de pandas
         with patch.object(pd.DataFrame, "to_sql") as mock_to_sql:
@@ -25,3 +52,514 @@ def test_save_dataframe_calls_to_sql() -> None:
             _, kwargs = mock_to_sql.call_args
             assert kwargs["name"] == "test_table"
             assert kwargs["if_exists"] == "append"
+
+
+def test_managers_share_engine_per_config() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    other = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="otra"
+    )
+
+    with patch("services.postgres.create_engine") as mock_create_engine:
+        mock_create_engine.side_effect = lambda *args, **kwargs: MagicMock()
+        first = PostgresManager(config)
+        second = PostgresManager(config)
+        third = PostgresManager(other)
+        bigger_pool = PostgresManager(config, pool_size=20)
+
+    assert first.engine is second.engine
+    assert third.engine is not first.engine
+    assert bigger_pool.engine is not first.engine
+    assert mock_create_engine.call_count == 3
+
+    kwargs = mock_create_engine.call_args_list[0].kwargs
+    assert kwargs["pool_size"] == settings.DB_POOL_SIZE
+    assert kwargs["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert kwargs["pool_recycle"] == settings.DB_POOL_RECYCLE
+    assert kwargs["pool_pre_ping"] == settings.DB_POOL_PRE_PING
+
+
+def test_iter_csv_chunks_streams_csv_with_nulls() -> None:
+    df = pd.DataFrame(
+        {
+            "sku": ["1", "2", "3"],
+            "nombre": ["a,b", "", None],
+            "precio": [1.5, None, 3.0],
+            "nota": ["\\N", 'di "hola"', None],
+        }
+    )
+
+    chunks = list(iter_csv_chunks(df, chunksize=2))
+
+    # Los nulos van sin comillas; "" y "\N" son textos, no NULL
+    assert len(chunks) == 2
+    assert b"".join(chunks) == (
+        b'"1","a,b","1.5","\\N"\n'
+        b'"2","",,"di ""hola"""\n'
+        b'"3",,"3.0",\n'
+    )
+    # Una tabla de Arrow produce el mismo CSV
+    assert b"".join(
+        iter_csv_chunks(pa.Table.from_pandas(df, preserve_index=False))
+    ) == b"".join(chunks)
+
+
+def test_iter_stream_reads_in_arbitrary_sizes() -> None:
+    stream = IterStream([b"abc", b"", b"defg"])
+
+    assert stream.read(2) == b"ab"
+    assert stream.read(3) == b"cde"
+    assert stream.read() == b"fg"
+    assert stream.read(1) == b""
+
+
+def test_save_dataframe_with_copy_streams_csv() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    df = pd.DataFrame({"sku": ["1", "2"], "precio": [10.0, None]})
+    copied: dict[str, Any] = {}
+
+    def fake_copy_expert(sql: str, file: Any) -> None:
+        copied["sql"] = sql
+        copied["body"] = file.read()
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.inspect") as mock_inspect,
+    ):
+        mock_inspect.return_value.has_table.return_value = False
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        cursor = connection.connection.dbapi_connection.cursor.return_value
+        cursor.copy_expert.side_effect = fake_copy_expert
+
+        with patch.object(pd.DataFrame, "to_sql") as mock_to_sql:
+            manager.save_dataframe(df, "test_table", method="copy")
+
+    # La tabla se crea con un DataFrame vacío; las filas van por COPY
+    assert mock_to_sql.call_args.kwargs["name"] == "test_table"
+    assert copied["sql"] == (
+        'COPY "public"."test_table" ("sku", "precio") '
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    assert copied["body"] == b'"1","10.0"\n"2",\n'
+
+
+@pytest.mark.parametrize("method", ["insert", "copy"])
+def test_save_dataframe_adds_new_columns_to_existing_table(
+    method: str,
+) -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    df = pd.DataFrame({"sku": ["1"], "peso_gramos": [15000.0]})
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.inspect") as mock_inspect,
+        patch("services.postgres.add_missing_columns") as mock_add_columns,
+        patch("services.postgres.copy_into"),
+        patch.object(pd.DataFrame, "to_sql") as mock_to_sql,
+    ):
+        mock_inspect.return_value.has_table.return_value = True
+        mock_inspect.return_value.get_columns.return_value = [{"name": "sku"}]
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        manager.save_dataframe(df, "t", method=method)
+
+    # La plantilla solo lleva la columna nueva y se borra al terminar
+    template = mock_to_sql.call_args_list[0].kwargs["name"]
+    assert template.startswith("t_staging_")
+    _, table_name, _, qualified, missing = mock_add_columns.call_args.args
+    assert (table_name, missing) == ("t", ["peso_gramos"])
+    assert qualified == f'"public"."{template}"'
+    assert f"DROP TABLE {qualified}" in executed_sql(connection)
+
+
+def test_save_history_changes_adds_new_columns() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    df = pd.DataFrame({"sku": ["1"], "peso_gramos": [15000.0]})
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.inspect") as mock_inspect,
+        patch("services.postgres.add_missing_columns") as mock_add_columns,
+        patch.object(pd.DataFrame, "to_sql") as mock_to_sql,
+    ):
+        mock_inspect.return_value.has_table.return_value = True
+        mock_inspect.return_value.get_columns.return_value = [{"name": "sku"}]
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        manager.save_history_changes(
+            df, "Hist", key="sku", closed_keys=["2"], valid_to="2024-01-02"
+        )
+
+    assert str(connection.execute.call_args_list[0].args[0]) == (
+        'UPDATE "public"."Hist" SET valido_hasta = :valid_to '
+        'WHERE "sku" IN (__[POSTCOMPILE_keys]) AND valido_hasta IS NULL'
+    )
+    # La columna nueva se agrega antes de insertar las versiones
+    _, table_name, _, _, missing = mock_add_columns.call_args.args
+    assert (table_name, missing) == ("Hist", ["peso_gramos"])
+    assert mock_to_sql.call_args.kwargs["name"] == "Hist"
+
+
+def test_build_upsert_sql() -> None:
+    sql = build_upsert_sql(
+        '"public"."t"',
+        '"public"."t_staging"',
+        ["sku", "fecha", "precio"],
+        ["sku", "fecha"],
+    )
+
+    assert sql == (
+        'INSERT INTO "public"."t" ("sku", "fecha", "precio") '
+        'SELECT DISTINCT ON ("sku", "fecha") "sku", "fecha", "precio" '
+        'FROM "public"."t_staging" '
+        'ORDER BY "sku", "fecha", ctid DESC '
+        'ON CONFLICT ("sku", "fecha") DO UPDATE SET "precio" = EXCLUDED."precio"'
+    )
+
+
+def test_drop_duplicate_keys_keeps_last_row() -> None:
+    df = pd.DataFrame(
+        {"sku": ["1", "2", "1", "3", "2"], "precio": [1, 2, 3, 4, 5]}
+    )
+
+    result = drop_duplicate_keys(df, ["sku"])
+    table_result = drop_duplicate_keys(pa.Table.from_pandas(df), ["sku"])
+
+    assert result.to_dict("list") == {
+        "sku": ["1", "3", "2"],
+        "precio": [3, 4, 5],
+    }
+    assert table_result.to_pydict() == {
+        "sku": ["1", "3", "2"],
+        "precio": [3, 4, 5],
+    }
+
+
+def test_save_dataframe_upsert_requires_conflict_columns() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    with patch("services.postgres.create_engine"):
+        manager = PostgresManager(config)
+        with pytest.raises(ValueError, match="conflict_columns"):
+            manager.save_dataframe(pd.DataFrame(), "t", if_exists="upsert")
+
+
+def test_split_row_ranges() -> None:
+    assert split_row_ranges(10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert split_row_ranges(2, 4) == [(0, 1), (1, 2)]
+    assert split_row_ranges(0, 4) == [(0, 0)]
+
+
+def executed_sql(connection: Any) -> list[str]:
+    return [str(c.args[0]) for c in connection.execute.call_args_list]
+
+
+def fake_get_schema(
+    frame: pd.DataFrame, name: str, con: Any, schema: str, dtype: Any
+) -> str:
+    columns = ", ".join(f"{c} TEXT" for c in frame.columns)
+    return f"\nCREATE TABLE {schema}.{name} (\n\t{columns}\n)\n\n"
+
+
+def test_save_dataframe_parallel_loads_ranges_into_staging() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    df = pd.DataFrame({"sku": [str(i) for i in range(10)], "precio": 1.0})
+    copied: list[tuple[str, list[str]]] = []
+
+    def fake_copy_into(
+        connection: Any, data: Any, qualified: str, chunksize: int
+    ) -> None:
+        copied.append((qualified, data["sku"].tolist()))
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.copy_into", side_effect=fake_copy_into),
+        patch("services.postgres.add_missing_columns"),
+        patch.object(pd.DataFrame, "to_sql"),
+        patch("services.postgres.get_schema", side_effect=fake_get_schema),
+    ):
+        manager = PostgresManager(config, load_workers=3)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        manager.save_dataframe(df, "t", method="parallel")
+
+    # Un COPY por rango, todos al mismo staging y sin perder filas
+    assert len(copied) == 3
+    assert len({qualified for qualified, _ in copied}) == 1
+    staging = copied[0][0]
+    assert staging.startswith('"public"."t_staging_')
+    assert sorted(sku for _, skus in copied for sku in skus) == sorted(
+        df["sku"]
+    )
+
+    sql = executed_sql(connection)
+    assert sql[0].startswith("\nCREATE UNLOGGED TABLE public.t_staging_")
+    assert (
+        'INSERT INTO "public"."t" ("sku", "precio") '
+        f'SELECT "sku", "precio" FROM {staging}'
+    ) in sql
+    assert sql[-1] == f"DROP TABLE {staging}"
+
+
+def test_parallel_load_replace_truncates_and_reloads() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    df = pd.DataFrame({"sku": ["1", "2"]})
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.copy_into"),
+        patch("services.postgres.add_missing_columns"),
+        patch.object(pd.DataFrame, "to_sql"),
+        patch("services.postgres.get_schema", side_effect=fake_get_schema),
+    ):
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        manager.parallel_load(df, "t", if_exists="replace", workers=2)
+
+    # La tabla se vacía y recarga en la misma transacción, sin DROP
+    sql = executed_sql(connection)
+    assert not any(
+        s.startswith('DROP TABLE IF EXISTS "public"."t"') for s in sql
+    )
+    assert sql[-3] == 'TRUNCATE TABLE "public"."t"'
+    assert sql[-2].startswith(
+        'INSERT INTO "public"."t" ("sku") SELECT "sku" FROM "public"."t_staging_'
+    )
+    assert sql[-1].startswith('DROP TABLE "public"."t_staging_')
+
+
+def test_parallel_load_drops_staging_on_error() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    df = pd.DataFrame({"sku": ["1", "2"]})
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.copy_into", side_effect=RuntimeError("x")),
+        patch.object(pd.DataFrame, "to_sql"),
+        patch("services.postgres.get_schema", side_effect=fake_get_schema),
+    ):
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        with pytest.raises(RuntimeError):
+            manager.parallel_load(df, "t")
+
+    sql = executed_sql(connection)
+    assert sql[-1].startswith('DROP TABLE IF EXISTS "public"."t_staging_')
+
+
+def test_partition_bounds() -> None:
+    assert partition_bounds(date(2024, 12, 15)) == (
+        date(2024, 12, 1),
+        date(2025, 1, 1),
+    )
+    assert partition_bounds(date(2024, 2, 29), "day") == (
+        date(2024, 2, 29),
+        date(2024, 3, 1),
+    )
+
+
+def test_partition_upper_bound() -> None:
+    bound = "FOR VALUES FROM ('2024-01-01') TO ('2024-02-01')"
+
+    assert partition_upper_bound(bound) == date(2024, 2, 1)
+    assert partition_upper_bound("DEFAULT") is None
+
+
+def test_save_partitioned_creates_table_indexes_and_partitions() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    df = pd.DataFrame(
+        {
+            "sku": ["1", "2", "3"],
+            "categoria_animal": "perro",
+            "fecha": [date(2024, 12, 1), date(2024, 12, 31), date(2024, 12, 2)],
+        }
+    )
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.inspect") as mock_inspect,
+        patch("services.postgres.copy_into") as mock_copy_into,
+        patch.object(pd.DataFrame, "to_sql"),
+        patch("services.postgres.get_schema", side_effect=fake_get_schema),
+    ):
+        mock_inspect.return_value.has_table.return_value = False
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        manager.save_partitioned(
+            df, "t", "fecha", index_columns=["sku", "categoria_animal"]
+        )
+
+    sql = executed_sql(connection)
+    assert any(
+        s.startswith('CREATE TABLE "public"."t" (LIKE "public"."t_staging_')
+        and s.endswith('PARTITION BY RANGE ("fecha")')
+        for s in sql
+    )
+    assert (
+        'CREATE INDEX IF NOT EXISTS "t_sku_idx" ON "public"."t" ("sku")' in sql
+    )
+    # Partición del mes cargado y la del mes siguiente
+    assert [s for s in sql if "PARTITION OF" in s] == [
+        'CREATE TABLE IF NOT EXISTS "public"."t_p202412" PARTITION OF '
+        "\"public\".\"t\" FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')",
+        'CREATE TABLE IF NOT EXISTS "public"."t_p202501" PARTITION OF '
+        "\"public\".\"t\" FOR VALUES FROM ('2025-01-01') TO ('2025-02-01')",
+    ]
+    assert mock_copy_into.call_args.args[2] == '"public"."t"'
+
+
+def test_save_partitioned_rejects_null_partition_values() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+    df = pd.DataFrame({"sku": ["1"], "fecha": [None]})
+
+    with patch("services.postgres.create_engine"):
+        manager = PostgresManager(config)
+        with pytest.raises(ValueError, match="nulos"):
+            manager.save_partitioned(df, "t", "fecha")
+
+
+def test_migrate_to_partitioned_backfills_derived_column() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.inspect") as mock_inspect,
+    ):
+        mock_inspect.return_value.has_table.return_value = True
+        mock_inspect.return_value.get_columns.return_value = [
+            {"name": "sku"},
+            {"name": "inicio"},
+        ]
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        connection.execute.return_value.scalar_one.return_value = "r"
+        # Primero los índices de la tabla anterior, luego las fechas
+        connection.execute.return_value.scalars.return_value.all.side_effect = [
+            ["t_sku_key"],
+            [date(2024, 1, 5), date(2024, 3, 1)],
+        ]
+        legacy = manager.migrate_to_partitioned(
+            "t",
+            "fecha",
+            partition_expression="CAST(inicio AS date)",
+            index_columns=["sku"],
+        )
+
+    assert legacy == "t_legacy"
+    sql = executed_sql(connection)
+    assert 'ALTER TABLE "public"."t" RENAME TO "t_legacy"' in sql
+    assert (
+        'ALTER INDEX "public"."t_sku_key" RENAME TO "t_sku_key_legacy"' in sql
+    )
+    assert (
+        'CREATE TABLE "public"."t" (LIKE "public"."t_legacy", "fecha" date) '
+        'PARTITION BY RANGE ("fecha")'
+    ) in sql
+    assert (
+        'CREATE INDEX IF NOT EXISTS "t_sku_idx" ON "public"."t" ("sku")' in sql
+    )
+    # Particiones de los meses con datos y del mes siguiente a cada uno
+    assert [s.split()[5] for s in sql if "PARTITION OF" in s] == [
+        '"public"."t_p202401"',
+        '"public"."t_p202402"',
+        '"public"."t_p202403"',
+        '"public"."t_p202404"',
+    ]
+    assert sql[-1] == (
+        'INSERT INTO "public"."t" ("sku", "inicio", "fecha") '
+        'SELECT "sku", "inicio", CAST(inicio AS date) FROM "public"."t_legacy"'
+    )
+
+
+def test_is_partitioned_checks_relkind() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.inspect") as mock_inspect,
+    ):
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.connect.return_value.__enter__.return_value
+        connection.execute.return_value.scalar_one.return_value = "p"
+
+        mock_inspect.return_value.has_table.return_value = False
+        assert not manager.is_partitioned("t")
+        mock_inspect.return_value.has_table.return_value = True
+        assert manager.is_partitioned("t")
+
+    assert connection.execute.call_args.args[1] == {"table": '"public"."t"'}
+
+
+def test_migrate_to_partitioned_skips_partitioned_tables() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+
+    with (
+        patch("services.postgres.create_engine") as mock_create_engine,
+        patch("services.postgres.inspect") as mock_inspect,
+    ):
+        mock_inspect.return_value.has_table.return_value = True
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        connection.execute.return_value.scalar_one.return_value = "p"
+
+        assert manager.migrate_to_partitioned("t", "fecha") is None
+
+    assert not any("RENAME" in s for s in executed_sql(connection))
+
+
+def test_drop_old_partitions_by_retention() -> None:
+    config = PostgresConfig(
+        host="h", port=5432, user="u", password="p", database="d"
+    )
+
+    with patch("services.postgres.create_engine") as mock_create_engine:
+        manager = PostgresManager(config)
+        connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+        connection.execute.return_value.all.return_value = [
+            (
+                "public",
+                "t_p202401",
+                "FOR VALUES FROM ('2024-01-01') TO ('2024-02-01')",
+            ),
+            (
+                "public",
+                "t_p202402",
+                "FOR VALUES FROM ('2024-02-01') TO ('2024-03-01')",
+            ),
+            ("public", "t_default", "DEFAULT"),
+        ]
+        removed = manager.drop_old_partitions(
+            "t", retention_days=30, today=date(2024, 3, 15)
+        )
+
+    assert removed == ["t_p202401"]
+    sql = executed_sql(connection)
+    assert sql[-2:] == [
+        'ALTER TABLE "public"."t" DETACH PARTITION "public"."t_p202401"',
+        'DROP TABLE "public"."t_p202401"',
+    ]